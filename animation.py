@@ -0,0 +1,83 @@
+# Time-based animation of structure changes.
+#
+# A change is animated by moving every item from where it was in the scene
+# on screen to where the new layout puts it. Items are matched by their
+# primitive key, so a node keeps its boxes, labels and arrows while they
+# glide to the new place; items only in the new scene show up at their
+# place right away and items only in the old one are gone at once.
+#
+# Progress is read from the clock, never counted in frames. A frame that
+# takes long to lay out or draw makes the next one jump ahead, so a busy
+# or very large view shows fewer in-between frames but the animation still
+# ends on time.
+
+import time
+
+from scene import Primitive, Scene
+
+# How long the items take to reach their new places
+ANIMATION_MS = 300
+
+# Time between two nodes of an animated traversal
+TRAVERSAL_STEP_MS = 120
+
+
+def ease(t):
+    """Smoothstep: start and end slowly, for 0 <= t <= 1."""
+    return t * t * (3 - 2 * t)
+
+
+class SceneAnimation:
+    """Move the items of a scene on screen towards the places of the latest layout.
+
+    The target is passed to frame() every time rather than fixed up front,
+    so the view can scroll, zoom or change again while items are moving.
+    """
+
+    def __init__(self, old_scene, duration_ms=ANIMATION_MS):
+        self.start_time = time.perf_counter()
+        self.duration = duration_ms / 1000
+        # key -> coordinates the item had when the animation started
+        self.origins = {item.key: item.coords for item in old_scene.items
+                        if item.key is not None}
+
+    def progress(self, now=None):
+        now = time.perf_counter() if now is None else now
+        return min(1.0, max(0.0, (now - self.start_time) / self.duration))
+
+    def frame(self, target, now=None):
+        """Return (scene to draw now, whether the animation is over) for the target scene."""
+        t = self.progress(now)
+        if t >= 1:
+            return target, True
+        f = ease(t)
+        scene = Scene(target.width, target.height)
+        scene.extent = target.extent
+        scene.nodes = target.nodes
+        origins = self.origins
+        items = scene.items
+        for item in target.items:
+            origin = origins.get(item.key)
+            if origin is not None and origin != item.coords and len(origin) == len(item.coords):
+                coords = tuple(a + (b - a) * f for a, b in zip(origin, item.coords))
+                item = Primitive(item.kind, coords, item.options, item.key)
+            items.append(item)
+        return scene, False
+
+
+class TraversalAnimation:
+    """Reveal the nodes of a traversal one after another, TRAVERSAL_STEP_MS apart."""
+
+    def __init__(self, nodes, step_ms=TRAVERSAL_STEP_MS):
+        self.nodes = nodes
+        self.start_time = time.perf_counter()
+        self.step = step_ms / 1000
+
+    def visible(self, now=None):
+        """Return the nodes reached by now; a late call catches up on the ones it missed."""
+        now = time.perf_counter() if now is None else now
+        count = 1 + int((now - self.start_time) / self.step)
+        return self.nodes[:count]
+
+    def finished(self, now=None):
+        return len(self.visible(now)) >= len(self.nodes)
@@ -0,0 +1,90 @@
+import threading
+import tkinter as tk
+from tkinter import ttk
+
+from file_manager import OperationCancelled
+
+
+class ProgressDialog(tk.Toplevel):
+    """Modal window with a progress bar and a Cancel button."""
+
+    def __init__(self, parent, title, message, on_cancel):
+        super().__init__(parent)
+        self.title(title)
+        self.resizable(False, False)
+        self.transient(parent)
+        self.protocol("WM_DELETE_WINDOW", on_cancel)
+
+        ttk.Label(self, text=message).pack(anchor=tk.W, padx=10, pady=(10, 5))
+
+        self.progress_var = tk.DoubleVar(value=0.0)
+        ttk.Progressbar(self, variable=self.progress_var, maximum=100,
+                        length=300).pack(fill=tk.X, padx=10, pady=5)
+
+        self.cancel_button = ttk.Button(self, text="Cancel", command=on_cancel)
+        self.cancel_button.pack(pady=(5, 10))
+
+        # Block the rest of the UI so the structure cannot change meanwhile
+        self.grab_set()
+
+    def set_progress(self, fraction):
+        self.progress_var.set(fraction * 100)
+
+
+class BackgroundTask:
+    """Run a function in a worker thread while showing a ProgressDialog.
+
+    The function receives two arguments, a progress(fraction) callback and a
+    threading.Event that is set when the user cancels.  It must never touch
+    Tk widgets: the main loop polls the worker with after() and calls
+    on_done(result) or on_error(exception) from the Tk thread.
+    """
+
+    POLL_INTERVAL = 50  # milliseconds
+
+    def __init__(self, parent, title, message, work, on_done, on_error=None):
+        self.parent = parent
+        self.work = work
+        self.on_done = on_done
+        self.on_error = on_error
+
+        self.cancel_event = threading.Event()
+        self._progress = 0.0
+        self._result = None
+        self._error = None
+
+        self.dialog = ProgressDialog(parent, title, message, self.cancel)
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        self.parent.after(self.POLL_INTERVAL, self._poll)
+
+    def cancel(self):
+        self.cancel_event.set()
+        self.dialog.cancel_button.configure(state=tk.DISABLED)
+
+    def _report_progress(self, fraction):
+        # Called from the worker thread; a float assignment is atomic
+        self._progress = fraction
+
+    def _run(self):
+        try:
+            self._result = self.work(self._report_progress, self.cancel_event)
+        except BaseException as e:
+            self._error = e
+
+    def _poll(self):
+        if self.thread.is_alive():
+            self.dialog.set_progress(self._progress)
+            self.parent.after(self.POLL_INTERVAL, self._poll)
+            return
+
+        self.dialog.grab_release()
+        self.dialog.destroy()
+
+        if isinstance(self._error, OperationCancelled):
+            return
+        if self._error is not None:
+            if self.on_error:
+                self.on_error(self._error)
+            return
+        self.on_done(self._result)
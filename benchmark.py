@@ -0,0 +1,129 @@
+# Render benchmark: 'python main.py benchmark' times CanvasRenderer redraws
+# on a real Tk canvas while scrolling a long list, inserting at its front
+# and scrolling a large tree, once without and once with the item pool.
+#
+# Only the printed times say whether pooling pays off. The canvas call
+# counts only show how much work is sent to Tk, not how long Tk takes to
+# draw it, so CanvasRenderer keeps the pool off unless asked for with
+# pool=True until these scenarios have been timed on a display.
+
+import argparse
+import random
+import statistics
+import sys
+import time
+
+from canvas_backend import CanvasRenderer
+from layouts import layout_singly_linked_list, layout_binary_search_tree
+from structures import SinglyLinkedList, BinarySearchTree
+from tree_layout import layout_for
+
+# Size of the canvas the redraws are measured on
+WIDTH = 1000
+HEIGHT = 600
+
+# Layout area drawn beyond each edge of the view, as the frames do
+MARGIN = 200
+
+
+def _view(x, y):
+    return (x - MARGIN, y - MARGIN, x + WIDTH + MARGIN, y + HEIGHT + MARGIN)
+
+
+def list_scroll(nodes, redraws):
+    """Scroll down a long singly linked list, wrapped into rows, one window height per redraw."""
+    structure = SinglyLinkedList()
+    structure.extend(range(nodes))
+    node_list = structure.get_nodes()
+    for i in range(redraws):
+        y = i * HEIGHT
+        yield 0, y, layout_singly_linked_list(structure, WIDTH, HEIGHT, _view(0, y), node_list)
+
+
+def list_insert(nodes, redraws):
+    """Insert at the front of a long singly linked list before every redraw."""
+    structure = SinglyLinkedList()
+    structure.extend(range(nodes))
+    for i in range(redraws):
+        structure.insert_at_beginning(-i)
+        yield 0, 0, layout_singly_linked_list(structure, WIDTH, HEIGHT, _view(0, 0))
+
+
+def tree_scroll(nodes, redraws):
+    """Scroll across the levels of a large random binary search tree."""
+    structure = BinarySearchTree()
+    structure.extend(random.Random(1).sample(range(nodes * 10), nodes))
+    tree = layout_for(structure)
+    scene = layout_binary_search_tree(structure, WIDTH, HEIGHT, _view(0, 0), 1.0, tree)
+    x1, y1, x2, y2 = scene.bbox()
+    for i in range(redraws):
+        x = x1 + (i * WIDTH) % max(WIDTH, x2 - x1)
+        y = y1 + (i // max(1, round((x2 - x1) / WIDTH)) * HEIGHT) % max(HEIGHT, y2 - y1)
+        yield x, y, layout_binary_search_tree(structure, WIDTH, HEIGHT, _view(x, y), 1.0, tree)
+
+
+SCENARIOS = {
+    "list-scroll": list_scroll,
+    "list-insert": list_insert,
+    "tree-scroll": tree_scroll,
+}
+
+
+def run(canvas, scenario, nodes, redraws, pool):
+    """Return the seconds and canvas calls of every redraw of a scenario."""
+    canvas.delete("all")
+    renderer = CanvasRenderer(canvas, pool=pool)
+    times = []
+    calls = []
+    for x, y, scene in SCENARIOS[scenario](nodes, redraws):
+        canvas.configure(scrollregion=(x, y, x + WIDTH, y + HEIGHT))
+        start = time.perf_counter()
+        renderer.render(scene)
+        # Include the time Tk takes to draw the changed items
+        canvas.update_idletasks()
+        times.append(time.perf_counter() - start)
+        calls.append(renderer.calls)
+    return times, calls
+
+
+def format_result(scenario, pool, times, calls):
+    times_ms = sorted(t * 1000 for t in times)
+    p95 = times_ms[min(len(times_ms) - 1, int(len(times_ms) * 0.95))]
+    return (f"{scenario:12} pool={'on ' if pool else 'off'}  "
+            f"mean {statistics.mean(times_ms):7.2f} ms  p95 {p95:7.2f} ms  "
+            f"{statistics.mean(calls):8.1f} canvas calls per redraw")
+
+
+def main(argv):
+    """Entry point of 'python main.py benchmark ...'; returns the exit status."""
+    parser = argparse.ArgumentParser(
+        prog="main.py benchmark",
+        description="Measure canvas redraws of large lists and trees, with and "
+                    "without reusing canvas items. Needs a display.")
+    parser.add_argument("--nodes", type=int, default=100000,
+                        help="nodes in each structure (default: 100000)")
+    parser.add_argument("--redraws", type=int, default=200,
+                        help="redraws measured per scenario (default: 200)")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), action="append",
+                        help="run only this scenario; may be repeated")
+    args = parser.parse_args(argv)
+
+    import tkinter as tk
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"Cannot open a display: {e}", file=sys.stderr)
+        return 1
+    root.title("Render benchmark")
+    canvas = tk.Canvas(root, width=WIDTH, height=HEIGHT, bg="white")
+    canvas.pack()
+    root.update()
+
+    try:
+        for scenario in args.scenario or SCENARIOS:
+            for pool in (False, True):
+                times, calls = run(canvas, scenario, args.nodes, args.redraws, pool)
+                print(format_result(scenario, pool, times, calls))
+    finally:
+        root.destroy()
+    return 0
@@ -0,0 +1,424 @@
+import time
+from collections import Counter
+
+from scene import Primitive
+
+
+# Tag carried by every item a CanvasRenderer owns, so it can move them at once
+SCENE_TAG = "scene"
+
+# Tags that keep connection lines below everything else and labels on top
+LINE_TAG = "scene_line"
+TEXT_TAG = "scene_text"
+
+# Role of the primitive that draws a node itself, the one node_tag() and highlights apply to
+NODE_ROLE = "box"
+
+# Looks of the highlights a viewer can put on nodes; later ones win where they overlap
+HIGHLIGHT_STYLES = {
+    "traversal": {"fill": "lightsalmon"},
+    "search": {"fill": "gold", "width": 3},
+    "selection": {"outline": "red", "width": 3},
+}
+
+# Items step() updates between two looks at the clock
+STEP_CHECK_CALLS = 32
+
+# Most hidden items of one kind a CanvasRenderer keeps for reuse
+POOL_LIMIT = 5000
+
+# Values that undo an option a reused item had and its new primitive leaves out
+_RESET_OPTIONS = {
+    "rectangle": {"fill": "", "outline": "black", "width": 1, "dash": "", "tags": SCENE_TAG},
+    "oval": {"fill": "", "outline": "black", "width": 1, "dash": "", "tags": SCENE_TAG},
+    "line": {"fill": "black", "width": 1, "arrow": "none", "dash": ""},
+    "text": {"fill": "black", "text": "", "font": "TkDefaultFont", "anchor": "center"},
+}
+
+
+def node_of(key):
+    """Return the node id of a primitive key when it draws the node itself, else None."""
+    if isinstance(key, tuple) and len(key) == 2 and key[1] == NODE_ROLE and isinstance(key[0], int):
+        return key[0]
+    return None
+
+
+def node_tag(node_id):
+    """Canvas tag of the item that draws the node with the given id."""
+    return f"node{node_id}"
+
+
+def highlight_overrides(highlights):
+    """Merge {highlight name: node ids} into {node id: options} using HIGHLIGHT_STYLES."""
+    overrides = {}
+    for name, style in HIGHLIGHT_STYLES.items():
+        for node in highlights.get(name, ()):
+            overrides.setdefault(node, {}).update(style)
+    return overrides
+
+
+def _changed_options(kind, old, new):
+    """Return the options that turn an item with the old options into one with the new.
+
+    Options only the old ones set, such as the width a highlight added, go
+    back to their _RESET_OPTIONS value.
+    """
+    resets = _RESET_OPTIONS[kind]
+    changed = {name: value for name, value in new.items() if old.get(name) != value}
+    changed.update((name, resets[name]) for name in old if name not in new and name in resets)
+    return changed
+
+
+def _translation(old_coords, new_coords):
+    """Return (dx, dy) when new_coords are old_coords shifted as a whole, else None."""
+    if len(old_coords) != len(new_coords):
+        return None
+    dx = new_coords[0] - old_coords[0]
+    dy = new_coords[1] - old_coords[1]
+    for i in range(2, len(new_coords), 2):
+        if new_coords[i] - old_coords[i] != dx or new_coords[i + 1] - old_coords[i + 1] != dy:
+            return None
+    return dx, dy
+
+
+class CanvasRenderer:
+    """Keep the canvas in sync with the latest scene without redrawing it.
+
+    Every primitive is matched by its key to the canvas item drawn for it
+    the previous time. Only new primitives are created, only vanished ones
+    are deleted and only items whose coordinates or options changed are
+    touched. When most items shift by the same amount, as after inserting
+    at the front of a list, one canvas.move() replaces thousands of calls.
+
+    Items of vanished primitives are deleted. With pool=True they are
+    instead kept in a pool, one per kind, and handed to new primitives of
+    the same kind with coords() and itemconfigure(), so scrolling through
+    a long structure reuses the same few hundred items; what no new
+    primitive needs is hidden, up to POOL_LIMIT items of each kind. The
+    pool is off by default until 'main.py benchmark' has shown on a real
+    display that it makes redraws faster.
+
+    The item of every node shape carries node_tag(id(node)), so
+    set_highlight() restyles a node with one itemconfigure() on its tag.
+
+    Scenes are in layout coordinates; the canvas shows them multiplied by
+    zoom.
+    """
+
+    # Whether scrolling or zooming needs a new render() (see RasterRenderer)
+    view_dependent = False
+
+    def __init__(self, canvas, pool=False):
+        self.canvas = canvas
+        self.pooling = pool
+        # key -> [item id, kind, coords, options] of what is on the canvas
+        self.items = {}
+        # kind -> [item id, kind, coords, options, state] of items no primitive uses,
+        # state being "spare" while still shown or "hidden"; entries that were
+        # taken again ("used") or deleted are skipped and dropped later
+        self.pool = {kind: [] for kind in _RESET_OPTIONS}
+        self.hidden = dict.fromkeys(_RESET_OPTIONS, 0)
+        # Highlight name -> node ids, and node id -> options the highlights change
+        self.highlights = {}
+        self._overrides = {}
+        self._shapes = {}  # node id -> primitive drawing it in the last scene
+        self.calls = 0  # canvas calls made by the last render()
+        # Size of the last rendered scene and how much resize() stretched it since
+        self.width = None
+        self.height = None
+        self.scale_x = 1.0
+        self.scale_y = 1.0
+        self.zoom = 1.0
+        # Work planned by start() and not yet done by step()
+        self._spares = []
+        self._changes = []
+        self._position = 0
+
+    def clear(self):
+        self.canvas.delete(SCENE_TAG)
+        self.items = {}
+        self.pool = {kind: [] for kind in _RESET_OPTIONS}
+        self.hidden = dict.fromkeys(_RESET_OPTIONS, 0)
+        self._spares = []
+        self._changes = []
+        self._position = 0
+        self._shapes = {}
+
+    def resize(self, width, height):
+        """Stretch the drawn items to a new canvas size until the next render().
+
+        A single canvas.scale() call, so it is cheap enough to run on every
+        <Configure> event of a drag-resize while the relayout waits.
+        """
+        if not self.width or not self.height:
+            return
+        scale_x = width / self.width
+        scale_y = height / self.height
+        if (scale_x, scale_y) != (self.scale_x, self.scale_y):
+            self.canvas.scale(SCENE_TAG, 0, 0, scale_x / self.scale_x, scale_y / self.scale_y)
+            self.scale_x = scale_x
+            self.scale_y = scale_y
+
+    def set_zoom(self, zoom):
+        """Scale everything drawn to a new zoom with a single canvas call."""
+        if zoom != self.zoom:
+            self.canvas.scale(SCENE_TAG, 0, 0, zoom / self.zoom, zoom / self.zoom)
+            self.zoom = zoom
+
+    def _on_canvas(self, coords):
+        if self.zoom == 1.0:
+            return coords
+        return [value * self.zoom for value in coords]
+
+    def render(self, scene):
+        """Bring the canvas in line with scene right away."""
+        self.start(scene)
+        self.step()
+
+    def start(self, scene, focus=None):
+        """Work out the canvas calls that bring the canvas in line with scene.
+
+        step() makes them. When focus, a layout point, is given, the calls
+        for the nodes nearest to it come first, so drawing a large scene in
+        slices fills the view before the margins. Calls still pending from
+        the previous start() are dropped: self.items and self.pool always
+        describe what is on the canvas, so the new scene is compared with
+        whatever part of the previous one was drawn.
+        """
+        canvas = self.canvas
+        items = self.items
+        self.calls = 0
+
+        # Undo resize() so the canvas matches the coordinates kept in self.items
+        if (self.scale_x, self.scale_y) != (1.0, 1.0):
+            canvas.scale(SCENE_TAG, 0, 0, 1 / self.scale_x, 1 / self.scale_y)
+            self.scale_x = self.scale_y = 1.0
+            self.calls += 1
+
+        wanted = {}
+        shapes = {}
+        for index, primitive in enumerate(scene.items):
+            key = primitive.key if primitive.key is not None else (primitive.kind, index)
+            if primitive.kind in ("rectangle", "oval"):
+                node = node_of(key)
+                if node is not None:
+                    shapes[node] = primitive
+                primitive = self._shape(node, primitive)
+            wanted[key] = primitive
+        self._shapes = shapes
+
+        # Items that are no longer in the scene, or are now of another kind, become spares
+        for key in [key for key, entry in items.items()
+                    if key not in wanted or wanted[key].kind != entry[1]]:
+            spare = items.pop(key) + ["spare"]
+            if self.pooling:
+                self.pool[spare[1]].append(spare)
+            self._spares.append(spare)
+
+        # (key, primitive, translation or None); step() works out the options to change
+        changes = []
+        for key, primitive in wanted.items():
+            entry = items.get(key)
+            if entry is None:
+                changes.append((key, primitive, None))
+                continue
+            changed = False
+            if entry[3] != primitive.options:
+                changed = bool(_changed_options(entry[1], entry[3], primitive.options))
+                if not changed:
+                    entry[3] = primitive.options
+            if entry[2] != primitive.coords:
+                changes.append((key, primitive, _translation(entry[2], primitive.coords)))
+            elif changed:
+                changes.append((key, primitive, None))
+
+        # Shift everything with one call when that saves more calls than it costs
+        moved = [change for change in changes if change[2]]
+        if moved:
+            shift, count = Counter(change[2] for change in moved).most_common(1)[0]
+            if count > len(items) - len(moved):
+                canvas.move(SCENE_TAG, shift[0] * self.zoom, shift[1] * self.zoom)
+                self.calls += 1
+                # Record where everything went; items that had to stay are moved back below
+                on_canvas = {id(entry): entry for entry in [
+                    *items.values(), *self._spares,
+                    *(spare for pool in self.pool.values() for spare in pool)]}
+                for entry in on_canvas.values():
+                    entry[2] = tuple(value + shift[i % 2] for i, value in enumerate(entry[2]))
+                moved_keys = {change[0] for change in moved}
+                for key, primitive in wanted.items():
+                    if key in items and key not in moved_keys:
+                        changes.append((key, primitive, None))
+
+        # Nearest nodes first; the items of one node stay in scene order
+        if focus is not None:
+            order = {key: index for index, key in enumerate(wanted)}
+            distance = {}
+            for key, primitive in wanted.items():
+                node = key[0] if isinstance(key, tuple) else key
+                if node not in distance:
+                    distance[node] = ((primitive.coords[0] - focus[0]) ** 2
+                                      + (primitive.coords[1] - focus[1]) ** 2)
+            changes.sort(key=lambda change: (
+                distance[change[0][0] if isinstance(change[0], tuple) else change[0]],
+                order[change[0]]))
+
+        self._changes = changes
+        self._position = 0
+        self.width = scene.width
+        self.height = scene.height
+
+    def _shape(self, node, primitive):
+        """Return a shape primitive with the tags and highlight of its node in its options."""
+        if node is None:
+            options = {**primitive.options, "tags": SCENE_TAG}
+        else:
+            options = {**primitive.options, "tags": (SCENE_TAG, node_tag(node)),
+                       **self._overrides.get(node, {})}
+        return Primitive(primitive.kind, primitive.coords, options, primitive.key)
+
+    def set_highlight(self, name, node_ids):
+        """Show exactly the given nodes in the HIGHLIGHT_STYLES[name] look.
+
+        Nodes on the canvas are restyled right away with one itemconfigure()
+        on their tag each; the others get the look when they are drawn,
+        also by the slices of a render that step() has not finished yet.
+        """
+        old = self.highlights.pop(name, frozenset())
+        new = frozenset(node_ids)
+        if new:
+            self.highlights[name] = new
+        self._overrides = highlight_overrides(self.highlights)
+        affected = old ^ new
+
+        # Pending calls were planned with the old look of these nodes
+        changes = self._changes
+        for index in range(self._position, len(changes) if affected else 0):
+            key, primitive, translation = changes[index]
+            node = node_of(key)
+            if node in affected and node in self._shapes:
+                changes[index] = (key, self._shape(node, self._shapes[node]), translation)
+
+        for node in affected:
+            entry = self.items.get((node, NODE_ROLE))
+            if entry is None or node not in self._shapes:
+                continue
+            options = self._shape(node, self._shapes[node]).options
+            changed = _changed_options(entry[1], entry[3], options)
+            if changed:
+                self.canvas.itemconfigure(node_tag(node), **changed)
+            entry[3] = options
+
+    def _show(self, primitive):
+        """Show primitive with a pooled item of its kind, or a new item; return its entry."""
+        canvas = self.canvas
+        pool = self.pool[primitive.kind]
+        resets = _RESET_OPTIONS[primitive.kind]
+        while pool:
+            spare = pool.pop()
+            item_id, kind, coords, options, state = spare
+            if state not in ("spare", "hidden"):
+                continue
+            spare[4] = "used"
+            if state == "hidden":
+                self.hidden[kind] -= 1
+            stale = [name for name in options if name not in primitive.options]
+            if any(name not in resets for name in stale):
+                # An option that cannot be undone; this item is of no further use
+                canvas.delete(item_id)
+                self.calls += 1
+                continue
+
+            changed = {name: value for name, value in primitive.options.items()
+                       if options.get(name) != value}
+            changed.update((name, resets[name]) for name in stale)
+            if state == "hidden":
+                changed["state"] = "normal"
+            if changed:
+                canvas.itemconfigure(item_id, **changed)
+                self.calls += 1
+            if coords != primitive.coords:
+                canvas.coords(item_id, *self._on_canvas(primitive.coords))
+                self.calls += 1
+            return [item_id, kind, primitive.coords, primitive.options]
+
+        tags = {"line": (SCENE_TAG, LINE_TAG), "text": (SCENE_TAG, TEXT_TAG)}.get(primitive.kind,
+                                                                                SCENE_TAG)
+        create = getattr(canvas, "create_" + primitive.kind)
+        item_id = create(*self._on_canvas(primitive.coords), **{"tags": tags, **primitive.options})
+        self.calls += 1
+        return [item_id, primitive.kind, primitive.coords, primitive.options]
+
+    def step(self, budget=None):
+        """Make the calls planned by start(), for at most budget seconds if given.
+
+        Returns True once nothing is left to do.
+        """
+        canvas = self.canvas
+        items = self.items
+        deadline = None if budget is None else time.perf_counter() + budget
+        done = 0
+        shown = set()  # kinds of the items shown again or anew in this step
+
+        changes = self._changes
+        while self._position < len(changes):
+            key, primitive, _ = changes[self._position]
+            self._position += 1
+            entry = items.get(key)
+            if entry is None:
+                items[key] = self._show(primitive)
+                shown.add(primitive.kind)
+            else:
+                if entry[3] != primitive.options:
+                    # Against what is on the canvas now, which set_highlight() may have restyled
+                    changed = _changed_options(entry[1], entry[3], primitive.options)
+                    if changed:
+                        canvas.itemconfigure(entry[0], **changed)
+                        self.calls += 1
+                entry[3] = primitive.options
+                if entry[2] != primitive.coords:
+                    canvas.coords(entry[0], *self._on_canvas(primitive.coords))
+                    self.calls += 1
+                    entry[2] = primitive.coords
+            done += 1
+            if deadline is not None and done % STEP_CHECK_CALLS == 0 and time.perf_counter() > deadline:
+                break
+
+        # Connections stay behind the boxes and labels they join, and labels in front
+        if "line" in shown:
+            canvas.tag_lower(LINE_TAG)
+            self.calls += 1
+        if "text" in shown:
+            canvas.tag_raise(TEXT_TAG)
+            self.calls += 1
+        if self._position < len(changes):
+            return False
+
+        # Spares no new primitive took are hidden, or deleted once the pool is full
+        while self._spares:
+            spare = self._spares.pop()
+            if spare[4] != "spare":
+                continue
+            kind = spare[1]
+            if self.pooling and self.hidden[kind] < POOL_LIMIT:
+                if spare[3].get("tags", SCENE_TAG) != SCENE_TAG:
+                    # Hidden items must not answer to the tag of the node they showed
+                    canvas.itemconfigure(spare[0], state="hidden", tags=SCENE_TAG)
+                    spare[3] = {**spare[3], "tags": SCENE_TAG}
+                else:
+                    canvas.itemconfigure(spare[0], state="hidden")
+                spare[4] = "hidden"
+                self.hidden[kind] += 1
+            else:
+                canvas.delete(spare[0])
+                spare[4] = "deleted"
+            self.calls += 1
+            done += 1
+            if deadline is not None and done % STEP_CHECK_CALLS == 0 and time.perf_counter() > deadline:
+                return False
+
+        # Forget the pool entries that were taken again or deleted
+        for kind, pool in self.pool.items():
+            if len(pool) > self.hidden[kind]:
+                self.pool[kind] = [spare for spare in pool if spare[4] == "hidden"]
+        return True
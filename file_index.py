@@ -0,0 +1,93 @@
+import json
+import os
+
+from file_manager import FileManager
+
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.expanduser("~"), ".dsv_index.json")
+
+# Number of entries kept in the recently opened list
+MAX_RECENT = 20
+
+
+class MetadataIndex:
+    """Persistent cache of file headers plus the list of recently opened files.
+
+    An entry is reused as long as the file's size and modification time are
+    unchanged, so browsing a directory only opens files that are new or were
+    modified since they were last seen.
+    """
+
+    def __init__(self, index_path=DEFAULT_INDEX_PATH):
+        self.index_path = index_path
+        self.entries = {}
+        self.recent = []
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+            self.entries = data.get("entries", {})
+            self.recent = data.get("recent", [])
+        except (OSError, ValueError):
+            self.entries = {}
+            self.recent = []
+
+    def save(self):
+        """Write the index back to disk if anything changed."""
+        if not self._dirty:
+            return
+        try:
+            with open(self.index_path, 'w', encoding='utf-8') as file:
+                json.dump({"entries": self.entries, "recent": self.recent}, file)
+            self._dirty = False
+        except OSError:
+            pass  # The index is only a cache
+
+    def get(self, file_path):
+        """Return the header of file_path, or None if it cannot be read."""
+        file_path = os.path.abspath(file_path)
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+
+        entry = self.entries.get(file_path)
+        if entry and entry["mtime"] == stat.st_mtime and entry["file_size"] == stat.st_size:
+            return entry["header"]
+
+        try:
+            header = FileManager.peek(file_path)
+        except Exception:
+            header = None
+
+        self.entries[file_path] = {"mtime": stat.st_mtime,
+                                   "file_size": stat.st_size,
+                                   "header": header}
+        self._dirty = True
+        return header
+
+    def scan(self, directory, extension=".dsv"):
+        """Return a sorted list of (path, header) for the files in directory."""
+        try:
+            names = sorted(name for name in os.listdir(directory)
+                           if name.lower().endswith(extension))
+        except OSError:
+            return []
+
+        result = [(os.path.join(directory, name), self.get(os.path.join(directory, name)))
+                  for name in names]
+        self.save()
+        return result
+
+    def add_recent(self, file_path):
+        """Move file_path to the front of the recently opened list."""
+        file_path = os.path.abspath(file_path)
+        if file_path in self.recent:
+            self.recent.remove(file_path)
+        self.recent.insert(0, file_path)
+        del self.recent[MAX_RECENT:]
+        self._dirty = True
+        self.save()
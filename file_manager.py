@@ -1,65 +1,177 @@
+import hashlib
 import json
-import pickle
 import os
-from tkinter import filedialog, messagebox
+import pickle
+import struct
+import time
+from tkinter import filedialog
+
+import structures
+
+
+# Number of values pickled per chunk; also the granularity of progress and cancel
+CHUNK_SIZE = 65536
+
+FILE_TYPES = [("Data Structure Visualizer", "*.dsv"), ("All Files", "*.*")]
+
+# Files start with MAGIC, a 4-byte big-endian header length and a JSON header,
+# followed by the pickled payload chunks
+MAGIC = b"DSV3\n"
+HEADER_LENGTH = struct.Struct(">I")
+EMPTY_CHECKSUM = "0" * 64
+
+
+class OperationCancelled(Exception):
+    """Raised inside a file operation when the user cancels it."""
+
+
+class _HashingReader:
+    """File wrapper that feeds everything read through it into a hash."""
+
+    def __init__(self, file, digest):
+        self.file = file
+        self.digest = digest
+
+    def read(self, size=-1):
+        data = self.file.read(size)
+        self.digest.update(data)
+        return data
+
+    def readline(self, size=-1):
+        data = self.file.readline(size)
+        self.digest.update(data)
+        return data
 
 
 class FileManager:
     """Class for handling file operations (save and load data structures)."""
 
     @staticmethod
-    def save_structure(structure, structure_type):
-        """Save a data structure to a file."""
-        # Ask user for file path
+    def ask_save_path():
+        """Ask the user where to save; return None if cancelled."""
         file_path = filedialog.asksaveasfilename(
             defaultextension=".dsv",
-            filetypes=[("Data Structure Visualizer", "*.dsv"), ("All Files", "*.*")],
+            filetypes=FILE_TYPES,
             title="Save Structure"
         )
+        return file_path or None
 
-        if not file_path:
-            return False  # User cancelled
+    @staticmethod
+    def describe(structure, structure_type):
+        """Return the header fields that describe a structure.
+
+        Must be called on the Tk thread together with snapshot().
+        """
+        first = getattr(structure, "root", None) or getattr(structure, "head", None) \
+            or getattr(structure, "top", None) or getattr(structure, "front", None)
+        return {
+            "type": structure_type,
+            "class": type(structure).__name__,
+            "height": getattr(structure, "height", None),
+            "value_type": type(first.data).__name__ if first else None,
+        }
+
+    @staticmethod
+    def write_structure(file_path, metadata, snapshot, progress=None, cancel_event=None):
+        """Write a structure snapshot to file_path.
+
+        metadata comes from describe() and snapshot from the structure's
+        snapshot(); neither may be shared with the UI, since this runs in a
+        worker thread.  Data goes to a temporary file that only replaces
+        file_path once everything was written, so a cancelled save leaves no
+        partial file.
+        """
+        temp_path = file_path + ".part"
+        total = len(snapshot)
+        header = dict(metadata, count=total, created=time.time(),
+                      checksum=EMPTY_CHECKSUM)
+        digest = hashlib.sha256()
 
         try:
-            # Create a dictionary with structure info
-            data = {
-                "type": structure_type,
-                "data": pickle.dumps(structure)
-            }
+            with open(temp_path, 'wb') as file:
+                # The checksum is only known at the end; reserve its space now
+                header_bytes = json.dumps(header).encode("utf-8")
+                file.write(MAGIC + HEADER_LENGTH.pack(len(header_bytes)) + header_bytes)
+
+                for start in range(0, total, CHUNK_SIZE):
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise OperationCancelled()
+                    chunk = pickle.dumps(snapshot[start:start + CHUNK_SIZE],
+                                         protocol=pickle.HIGHEST_PROTOCOL)
+                    digest.update(chunk)
+                    file.write(chunk)
+                    if progress:
+                        progress(min(start + CHUNK_SIZE, total) / total)
 
-            # Save as JSON file with pickle-serialized data
-            with open(file_path, 'wb') as file:
-                pickle.dump(data, file)
+                header["checksum"] = digest.hexdigest()
+                file.seek(len(MAGIC) + HEADER_LENGTH.size)
+                file.write(json.dumps(header).encode("utf-8"))
 
-            return True
+            os.replace(temp_path, file_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
 
-        except Exception as e:
-            messagebox.showerror("Save Error", f"Error saving file: {str(e)}")
-            return False
+        if progress:
+            progress(1.0)
+        return True
 
     @staticmethod
-    def load_structure():
-        """Load a data structure from a file."""
-        # Ask user for file path
-        file_path = filedialog.askopenfilename(
-            defaultextension=".dsv",
-            filetypes=[("Data Structure Visualizer", "*.dsv"), ("All Files", "*.*")],
-            title="Load Structure"
-        )
+    def _read_header(file):
+        """Read the JSON header of an open file, or return None for older formats."""
+        if file.read(len(MAGIC)) != MAGIC:
+            file.seek(0)
+            return None
+        length, = HEADER_LENGTH.unpack(file.read(HEADER_LENGTH.size))
+        return json.loads(file.read(length).decode("utf-8"))
 
-        if not file_path:
-            return None, None  # User cancelled
+    @staticmethod
+    def peek(file_path):
+        """Return the metadata header of a saved file without decoding its payload.
 
-        try:
-            # Load from pickle file
-            with open(file_path, 'rb') as file:
-                data = pickle.load(file)
+        Older files have no header, and their pickled dictionary may hold the
+        whole structure, so nothing of them is unpickled here: their header
+        only has "legacy" set and the modification time as "created", with
+        the other fields None for unknown.
+        """
+        with open(file_path, 'rb') as file:
+            header = FileManager._read_header(file)
+        if header is None:
+            header = {"type": None, "class": None, "count": None, "height": None,
+                      "value_type": None, "created": os.path.getmtime(file_path),
+                      "checksum": None, "legacy": True}
+        return header
+
+    @staticmethod
+    def read_structure(file_path, progress=None, cancel_event=None):
+        """Read a structure from file_path and return (structure_type, structure)."""
+        with open(file_path, 'rb') as file:
+            header = FileManager._read_header(file)
+
+            if header is None:
+                header = pickle.load(file)
+                # Files written before chunked saving hold the pickled structure
+                if "data" in header:
+                    structure = pickle.loads(header["data"])
+                    # Rebuilt so that it gets the attributes added since, such as tree parent links
+                    return header.get("type"), type(structure).restore(structure.snapshot())
+                reader = file
+            else:
+                digest = hashlib.sha256()
+                reader = _HashingReader(file, digest)
 
-            structure_type = data.get("type")
-            structure = pickle.loads(data.get("data"))
+            total = header["count"]
+            snapshot = []
+            while len(snapshot) < total:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise OperationCancelled()
+                snapshot.extend(pickle.load(reader))
+                if progress:
+                    progress(len(snapshot) / total)
 
-            return structure_type, structure
+        if reader is not file and digest.hexdigest() != header["checksum"]:
+            raise ValueError("The file is corrupted (checksum mismatch)")
 
-        except Exception as e:
-            messagebox.showerror("Load Error", f"Error loading file: {str(e)}")
-            return None, None
\ No newline at end of file
+        structure_class = getattr(structures, header["class"])
+        return header["type"], structure_class.restore(snapshot)
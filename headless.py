@@ -0,0 +1,87 @@
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from file_manager import FileManager
+from layouts import LAYOUTS
+import raster_backend
+import svg_backend
+
+
+DEFAULT_WIDTH = 1000
+DEFAULT_HEIGHT = 600
+
+WRITERS = {
+    ".svg": svg_backend.write_svg,
+    ".png": raster_backend.write_png,
+}
+
+
+def render_structure(structure, output_path, width=DEFAULT_WIDTH, height=DEFAULT_HEIGHT):
+    """Lay out a structure and write it to an .svg or .png file."""
+    extension = os.path.splitext(output_path)[1].lower()
+    if extension not in WRITERS:
+        raise ValueError(f"Unsupported output format '{extension}' (use .svg or .png)")
+
+    scene = LAYOUTS[type(structure).__name__](structure, width, height)
+    WRITERS[extension](scene, output_path)
+    return output_path
+
+
+def render_file(input_path, output_path, width=DEFAULT_WIDTH, height=DEFAULT_HEIGHT):
+    """Render a saved .dsv file without creating any Tk window."""
+    _, structure = FileManager.read_structure(input_path)
+    return render_structure(structure, output_path, width, height)
+
+
+def _render_job(job):
+    input_path, output_path, width, height = job
+    try:
+        render_file(input_path, output_path, width, height)
+        return input_path, None
+    except Exception as e:
+        return input_path, str(e)
+
+
+def _build_jobs(args):
+    if args.out_dir is None:
+        if len(args.paths) != 2:
+            raise SystemExit("render: expected 'INPUT OUTPUT', or inputs with --out-dir")
+        return [(args.paths[0], args.paths[1], args.width, args.height)]
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    jobs = []
+    for input_path in args.paths:
+        name = os.path.splitext(os.path.basename(input_path))[0] + "." + args.format
+        jobs.append((input_path, os.path.join(args.out_dir, name), args.width, args.height))
+    return jobs
+
+
+def main(argv):
+    """Entry point of 'python main.py render ...'; returns the exit status."""
+    parser = argparse.ArgumentParser(
+        prog="main.py render",
+        description="Render saved structures to SVG or PNG without a display.")
+    parser.add_argument("paths", nargs="+",
+                        help="INPUT.dsv OUTPUT.svg|png, or several inputs with --out-dir")
+    parser.add_argument("--out-dir", help="write one image per input into this folder")
+    parser.add_argument("--format", choices=["svg", "png"], default="svg",
+                        help="image format used with --out-dir (default: svg)")
+    parser.add_argument("--width", type=int, default=DEFAULT_WIDTH)
+    parser.add_argument("--height", type=int, default=DEFAULT_HEIGHT)
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="number of worker processes (default: 1)")
+    args = parser.parse_args(argv)
+
+    jobs = _build_jobs(args)
+    if args.jobs > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+            results = list(executor.map(_render_job, jobs, chunksize=8))
+    else:
+        results = [_render_job(job) for job in jobs]
+
+    failures = [(path, error) for path, error in results if error]
+    for path, error in failures:
+        print(f"{path}: {error}", file=sys.stderr)
+    return 1 if failures else 0
@@ -0,0 +1,153 @@
+import csv
+import io
+import json
+import os
+
+from file_manager import OperationCancelled
+
+
+# Number of raw values converted at once
+BATCH_SIZE = 50000
+
+IMPORT_FILE_TYPES = [("CSV Files", "*.csv"), ("JSON Lines", "*.jsonl"),
+                     ("Text Files", "*.txt"), ("All Files", "*.*")]
+
+TRUE_STRINGS = ['true', 'yes', '1', 't', 'y']
+FALSE_STRINGS = ['false', 'no', '0', 'f', 'n']
+
+# Yielded by the readers in place of a line they cannot parse
+_MALFORMED = object()
+
+
+def _to_int(value):
+    """Convert to int without truncating: JSON's 3.0 is 3, but 3.9 is rejected."""
+    if isinstance(value, float) and not value.is_integer():
+        raise ValueError(f"{value!r} is not a whole number")
+    return int(value)
+
+
+def _to_bool(value):
+    """Convert TRUE_STRINGS and FALSE_STRINGS, ignoring case; reject anything else."""
+    if isinstance(value, bool):
+        return value
+    text = str(value).lower()
+    if text in TRUE_STRINGS:
+        return True
+    if text in FALSE_STRINGS:
+        return False
+    raise ValueError(f"{value!r} is not a boolean")
+
+
+CONVERTERS = {
+    "int": _to_int,
+    "float": float,
+    "bool": _to_bool,
+    "str": str,
+}
+
+
+def convert_value(value, data_type):
+    """Convert a raw value to data_type; raise ValueError or TypeError on failure."""
+    return CONVERTERS.get(data_type, str)(value)
+
+
+def convert_batch(batch, data_type):
+    """Convert a batch of raw values; return (converted, number_skipped)."""
+    converter = CONVERTERS.get(data_type, str)
+    try:
+        # Fast path: the whole batch converts cleanly
+        return list(map(converter, batch)), 0
+    except (ValueError, TypeError):
+        pass
+
+    converted = []
+    for value in batch:
+        try:
+            converted.append(converter(value))
+        except (ValueError, TypeError):
+            pass
+    return converted, len(batch) - len(converted)
+
+
+def _read_text_lines(text):
+    for line in text:
+        line = line.strip()
+        if line:
+            yield line
+
+
+def _read_csv(text):
+    for row in csv.reader(text):
+        for cell in row:
+            cell = cell.strip()
+            if cell:
+                yield cell
+
+
+def _read_jsonl(text):
+    for line in text:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError:
+            yield _MALFORMED
+            continue
+        if isinstance(item, list):
+            yield from item
+        elif isinstance(item, dict):
+            yield from item.values()
+        else:
+            yield item
+
+
+def _reader_for(file_path):
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == ".csv":
+        return _read_csv
+    if extension in (".jsonl", ".ndjson"):
+        return _read_jsonl
+    return _read_text_lines
+
+
+def read_values(file_path, data_type, progress=None, cancel_event=None):
+    """Stream values from a CSV, JSON Lines or plain text file.
+
+    Every CSV cell, every JSON Lines item (or the elements of a list or
+    object on the line) and every non-empty text line is one value.  Values
+    are converted to data_type in batches; those that fail to convert, such
+    as a CSV header, are skipped, and so is a JSON Lines line that is not
+    valid JSON.  Returns (values, number_skipped).
+    """
+    total_bytes = os.path.getsize(file_path) or 1
+    values = []
+    skipped = 0
+
+    with open(file_path, 'rb') as raw:
+        text = io.TextIOWrapper(raw, encoding='utf-8', newline='')
+        batch = []
+        for value in _reader_for(file_path)(text):
+            if value is _MALFORMED:
+                skipped += 1
+                continue
+            batch.append(value)
+            if len(batch) < BATCH_SIZE:
+                continue
+
+            if cancel_event is not None and cancel_event.is_set():
+                raise OperationCancelled()
+            converted, failed = convert_batch(batch, data_type)
+            values.extend(converted)
+            skipped += failed
+            batch = []
+            if progress:
+                progress(min(raw.tell() / total_bytes, 1.0))
+
+        converted, failed = convert_batch(batch, data_type)
+        values.extend(converted)
+        skipped += failed
+
+    if progress:
+        progress(1.0)
+    return values, skipped
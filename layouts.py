@@ -0,0 +1,632 @@
+import math
+
+from ring_layout import ring_arrows, ring_positions
+from scene import Scene
+from serpentine_layout import Serpentine, index_range
+from text_metrics import METRICS
+from tree_layout import TidyTreeLayout
+
+# Layouts turn a structure into a Scene for a drawing area of a given size.
+# They do not depend on Tk, so the same code draws the frames' canvases and
+# the headless SVG and PNG exports.
+#
+# The linear layouts also take an optional viewport (x1, y1, x2, y2): only
+# the nodes inside it are added to the scene, found by arithmetic on their
+# index, and scene.extent still covers the whole structure. They accept the
+# structure's get_nodes() list too, so a caller that keeps it between
+# redraws does not walk the structure again on every scroll. The tree
+# layouts take the viewport and a TidyTreeLayout of the tree the same way.
+#
+# zoom is the scale the scene will be shown at. It only picks the level of
+# detail: full boxes and labels, plain boxes, or bars that each stand for a
+# run of nodes (collapsed subtrees for the trees), so the number of items
+# stays bounded however large the structure is. The detail only changes
+# from one zoom_tier() to the next, so a viewer can zoom within a tier by
+# scaling what is already drawn.
+#
+# overview, when given, asks for the summary of the whole structure as it
+# is arranged at zoom, with the bars sized for being shown at the overview
+# scale instead. A small overview scale makes few, large bars, so such a
+# scene costs the same however many nodes there are; see minimap.py.
+#
+# The zoom tier also sets how wide the rows of the wrapped lists (queues and
+# linked lists) are. Their layouts take a separate row_zoom, zoom by
+# default, so views shown at different zooms can share one arrangement
+# while each gets the detail of its own zoom.
+#
+# Node boxes are as wide as the widest value in the structure needs, up to
+# MAX_BOX_WIDTH; longer values are cut short with an ellipsis. Widths come
+# from text_metrics.METRICS, which measures each label only once.
+
+DETAIL_FULL = "full"
+DETAIL_BOXES = "boxes"
+DETAIL_SUMMARY = "summary"
+
+# Lowest zoom that still shows values and labels, and lowest that shows every node
+FULL_DETAIL_ZOOM = 0.5
+BOXES_ZOOM = 0.125
+
+# Screen length of one summary bar
+SUMMARY_BAR_PIXELS = 60
+
+# Widest a node box grows to fit its value, and the room kept on each side
+# of a value inside its box
+MAX_BOX_WIDTH = 200
+BOX_PADDING = 8
+
+# Font of the bold node values; the others are drawn in the default font (None)
+VALUE_FONT = ("Arial", 12, "bold")
+
+# Queues and linked lists wrap into rows as wide as the view: room between
+# two rows for labels and the arrows turning into the next row, and the
+# least room above the first row
+ROW_GAP = 60
+ROW_TOP = 40
+
+# Trees: pixels between neighbouring nodes and between levels, and the
+# most nodes drawn in view before deeper levels are collapsed into counts
+NODE_SPACING = 60
+LEVEL_HEIGHT = 80
+TREE_TOP = 50
+TREE_MARGIN = 40
+TREE_NODE_BUDGET = 1500
+TREE_SUMMARY_BUDGET = 300
+
+# Circular lists: distance between successive nodes along the ring and
+# between the turns of the spiral that takes the nodes beyond one circle,
+# and the most nodes drawn before the ring only shows their count
+RING_PITCH = 100
+RING_GAP = 100
+RING_NODE_BUDGET = 2000
+
+
+def zoom_tier(zoom):
+    """Return the power of two at or below zoom; the detail is the same within a tier."""
+    return math.floor(math.log2(zoom) + 1e-9)
+
+
+def _tier_zoom(zoom):
+    return 2.0 ** zoom_tier(zoom)
+
+
+def detail_for_zoom(zoom):
+    zoom = _tier_zoom(zoom)
+    if zoom >= FULL_DETAIL_ZOOM:
+        return DETAIL_FULL
+    if zoom >= BOXES_ZOOM:
+        return DETAIL_BOXES
+    return DETAIL_SUMMARY
+
+
+def _detail(zoom, overview):
+    """Level of detail of a layout; overviews only ever show the summary."""
+    return DETAIL_SUMMARY if overview else detail_for_zoom(zoom)
+
+
+def _box_width(nodes, font, smallest):
+    """Width of boxes that fit the widest value of nodes, from smallest up to MAX_BOX_WIDTH.
+
+    The widest value is only looked for again when nodes is another list,
+    which the frames hand over after each change of the structure.
+    """
+    widest = METRICS.widest(nodes, font, lambda: (str(node.data) for node in nodes))
+    return max(smallest, min(MAX_BOX_WIDTH, math.ceil(widest) + 2 * BOX_PADDING))
+
+
+def _value_text(node, font, box_width):
+    """The value of node, cut short with an ellipsis when it does not fit in box_width."""
+    return METRICS.fit(str(node.data), font, box_width - 2 * BOX_PADDING)
+
+
+def _summary_bars(scene, count, first, pitch, zoom, visible, bar_box, fill, label_beside=False):
+    """Draw runs of consecutive nodes as single bars labelled with their node count.
+
+    Each bar covers enough nodes to be SUMMARY_BAR_PIXELS long on screen.
+    bar_box(start, stop) returns the rectangle of the nodes start to stop - 1
+    and visible is the (low, high) viewport range along the structure.
+    """
+    per_bar = max(1, math.ceil(SUMMARY_BAR_PIXELS / (abs(pitch) * _tier_zoom(zoom))))
+    bars = range(math.ceil(count / per_bar))
+    if visible:
+        bars = index_range(len(bars), first, pitch * per_bar, *visible)
+
+    for bar in bars:
+        start = bar * per_bar
+        stop = min(count, start + per_bar)
+        x1, y1, x2, y2 = bar_box(start, stop)
+        key = ("bar", bar)
+        scene.rectangle(x1, y1, x2, y2, key=(key, "box"), fill=fill, outline="gray40")
+        if label_beside:
+            scene.text(max(x1, x2) + 5, (y1 + y2) / 2, key=(key, "count"), text=str(stop - start),
+                       anchor="w", font=("Arial", 8))
+        else:
+            scene.text((x1 + x2) / 2, (y1 + y2) / 2, key=(key, "count"), text=str(stop - start),
+                       font=("Arial", 8))
+
+
+def layout_stack(structure, width, height, viewport=None, nodes=None, zoom=1.0, overview=None):
+    scene = Scene(width, height)
+
+    if nodes is None:
+        nodes = structure.get_nodes()
+    if not nodes:
+        return scene
+
+    # Draw the stack from bottom to top
+    box_width = _box_width(nodes, None, 100)
+    box_height = 40
+    x_center = width // 2
+    y_bottom = height - 30
+    pitch = box_height + 10
+
+    scene.extent = (x_center - box_width // 2, y_bottom - len(nodes) * pitch,
+                    x_center + box_width // 2, y_bottom)
+    visible = viewport and (viewport[1], viewport[3])
+
+    detail = _detail(zoom, overview)
+    if detail == DETAIL_SUMMARY:
+        _summary_bars(scene, len(nodes), y_bottom, -pitch, overview or zoom, visible,
+                      lambda start, stop: (x_center - box_width // 2, y_bottom - start * pitch,
+                                           x_center + box_width // 2,
+                                           y_bottom - stop * pitch + 10),
+                      "lightblue", label_beside=True)
+        indexes = ()
+    elif visible:
+        indexes = index_range(len(nodes), y_bottom, -pitch, *visible)
+    else:
+        indexes = range(len(nodes))
+
+    for i in indexes:
+        # get_nodes() lists the nodes from the top down
+        node = nodes[len(nodes) - 1 - i]
+        key = id(node)
+
+        # Calculate position
+        x = x_center - box_width // 2
+        y = y_bottom - i * pitch
+
+        # Draw node box
+        scene.rectangle(x, y, x + box_width, y - box_height, key=(key, "box"), node=node,
+                        fill="lightblue", outline="black")
+
+        if detail == DETAIL_FULL:
+            # Draw value
+            scene.text(x + box_width // 2, y - box_height // 2, key=(key, "value"),
+                       text=_value_text(node, None, box_width))
+
+            # Draw memory address
+            scene.text(x + box_width // 2, y - box_height - 5, key=(key, "address"),
+                       text=f"Mem: {hex(node.memory_address)}", font=("Arial", 8))
+
+        # Draw pointer (except for the top node)
+        if i < len(nodes) - 1:
+            scene.line(x_center, y - box_height - 5, x_center, y - box_height - 10,
+                       key=(key, "next"), arrow="last", fill="black")
+
+    return scene
+
+
+def _wrap(count, x_left, pitch, box_height, width, height, zoom):
+    """Return the Serpentine a linear layout places count nodes on.
+
+    Rows are as wide as the drawing area at the zoom tier, less x_left on
+    both sides. Lists of a few rows sit in the middle of the area.
+    """
+    row_width = (width - 2 * x_left) / min(1.0, _tier_zoom(zoom))
+    grid = Serpentine(count, x_left, 0, pitch, box_height + ROW_GAP, row_width)
+    grid.top = max(ROW_TOP, (height - grid.height + ROW_GAP) // 2)
+    return grid
+
+
+def _link(grid, x, y, direction, box_width, level, turn, reach=0.5, up=False):
+    """Return the coordinates of an arrow from the box at (x, y) to a neighbouring box.
+
+    direction is the side the neighbour is on, 1 for right and -1 for
+    left, and level the height of the arrow in the boxes. At a row turn
+    the neighbour is straight below, or above when up, and the arrow goes
+    round the end of the row, reach times the gap between boxes out.
+    """
+    side = x + box_width if direction > 0 else x
+    gap = grid.pitch - box_width
+    y1 = y + level
+    if turn:
+        out = side + direction * gap * reach
+        y2 = y1 - grid.row_pitch if up else y1 + grid.row_pitch
+        return (side, y1, out, y1, out, y2, side, y2)
+    return (side, y1, side + direction * gap, y1)
+
+
+def _label_point(coords, direction, offset):
+    """Where the label of an arrow goes: offset above a straight one, beside a turning one."""
+    if len(coords) == 4:
+        return (coords[0] + coords[2]) / 2, coords[1] - offset
+    return coords[2] + direction * offset, (coords[3] + coords[5]) / 2
+
+
+def _wrapped_summary(scene, grid, zoom, viewport, box_width, box_height, fill):
+    """Draw blocks of nodes about SUMMARY_BAR_PIXELS square on screen, with their node counts."""
+    scale = _tier_zoom(zoom)
+    columns = math.ceil(SUMMARY_BAR_PIXELS / (grid.pitch * scale))
+    rows = math.ceil(SUMMARY_BAR_PIXELS / (grid.row_pitch * scale))
+    gap = grid.pitch - box_width
+    for column, row, column_stop, row_stop, count in grid.blocks(columns, rows, viewport):
+        x1 = grid.left + column * grid.pitch
+        y1 = grid.top + row * grid.row_pitch
+        x2 = grid.left + column_stop * grid.pitch - gap
+        y2 = grid.top + (row_stop - 1) * grid.row_pitch + box_height
+        key = ("bar", (row, column))
+        scene.rectangle(x1, y1, x2, y2, key=(key, "box"), fill=fill, outline="gray40")
+        scene.text((x1 + x2) / 2, (y1 + y2) / 2, key=(key, "count"), text=str(count),
+                   font=("Arial", 8))
+
+
+def _wrapped_indexes(scene, grid, zoom, overview, viewport, box_width, box_height, fill):
+    """Return (detail, indexes of the nodes to draw); far out, summary blocks are drawn instead."""
+    detail = _detail(zoom, overview)
+    if detail == DETAIL_SUMMARY:
+        _wrapped_summary(scene, grid, overview or zoom, viewport, box_width, box_height, fill)
+        return detail, ()
+    if viewport:
+        return detail, grid.visible(viewport)
+    return detail, range(grid.count)
+
+
+def layout_queue(structure, width, height, viewport=None, nodes=None, zoom=1.0,
+                 overview=None, row_zoom=None):
+    scene = Scene(width, height)
+
+    if nodes is None:
+        nodes = structure.get_nodes()
+    if not nodes:
+        return scene
+
+    # Draw the queue from left to right, wrapping into rows
+    box_width = _box_width(nodes, None, 80)
+    box_height = 40
+    x_left = 30
+    pitch = box_width + 20
+    grid = _wrap(len(nodes), x_left, pitch, box_height, width, height, row_zoom or zoom)
+
+    scene.extent = (x_left, grid.top - 25, x_left + grid.width, grid.top + grid.height + 15)
+    detail, indexes = _wrapped_indexes(scene, grid, zoom, overview, viewport, box_width,
+                                       box_height, "lightgreen")
+
+    for i in indexes:
+        node = nodes[i]
+        key = id(node)
+
+        # Calculate position
+        x, y, direction = grid.position(i)
+
+        # Draw node box
+        scene.rectangle(x, y, x + box_width, y + box_height, key=(key, "box"), node=node,
+                        fill="lightgreen", outline="black")
+
+        if detail == DETAIL_FULL:
+            # Draw value
+            scene.text(x + box_width // 2, y + box_height // 2, key=(key, "value"),
+                       text=_value_text(node, None, box_width))
+
+            # Draw memory address
+            scene.text(x + box_width // 2, y - 15, key=(key, "address"),
+                       text=f"Mem: {hex(node.memory_address)}", font=("Arial", 8))
+
+        # Draw pointer (except for the last node)
+        if i < len(nodes) - 1:
+            scene.line(*_link(grid, x, y, direction, box_width, box_height // 2,
+                              grid.turns_after(i)),
+                       key=(key, "next"), arrow="last", fill="black")
+
+    # Label front and rear
+    x, y, _ = grid.position(0)
+    scene.text(x + box_width // 2, y + box_height + 25, key="front",
+               text="Front", font=("Arial", 10, "bold"))
+
+    x, y, _ = grid.position(len(nodes) - 1)
+    scene.text(x + box_width // 2, y + box_height + 25, key="rear",
+               text="Rear", font=("Arial", 10, "bold"))
+
+    return scene
+
+
+def layout_singly_linked_list(structure, width, height, viewport=None, nodes=None, zoom=1.0,
+                              overview=None, row_zoom=None):
+    scene = Scene(width, height)
+
+    if nodes is None:
+        nodes = structure.get_nodes()
+    if not nodes:
+        return scene
+
+    # Draw the linked list from left to right, wrapping into rows
+    box_width = _box_width(nodes, VALUE_FONT, 80)
+    box_height = 40
+    x_left = 80
+    pitch = box_width + 50
+    grid = _wrap(len(nodes), x_left, pitch, box_height, width, height, row_zoom or zoom)
+
+    scene.extent = (x_left - 25, grid.top - 25, x_left + grid.width, grid.top + grid.height)
+    detail, indexes = _wrapped_indexes(scene, grid, zoom, overview, viewport, box_width,
+                                       box_height, "lightyellow")
+
+    for i in indexes:
+        node = nodes[i]
+        key = id(node)
+
+        # Calculate position
+        x, y, direction = grid.position(i)
+
+        # Draw node box
+        scene.rectangle(x, y, x + box_width, y + box_height, key=(key, "box"), node=node,
+                        fill="lightyellow", outline="black", width=2)
+
+        # Draw value
+        if detail == DETAIL_FULL:
+            scene.text(x + box_width // 2, y + box_height // 2, key=(key, "value"),
+                       text=_value_text(node, VALUE_FONT, box_width), fill="black",
+                       font=VALUE_FONT)
+
+        # Draw pointer (except for the last node)
+        if i < len(nodes) - 1:
+            coords = _link(grid, x, y, direction, box_width, box_height // 2, grid.turns_after(i))
+            scene.line(*coords, key=(key, "next"), arrow="last", fill="black", width=2)
+
+            # Label the "next" pointer
+            if detail == DETAIL_FULL:
+                label_x, label_y = _label_point(coords, direction, 15)
+                scene.text(label_x, label_y, key=(key, "next_label"), text="next",
+                           fill="darkgreen", font=("Arial", 8))
+
+    # Mark the "head" pointer
+    y_center = grid.top + box_height // 2
+    scene.text(x_left - 25, y_center, key="head_label", text="head",
+               anchor="e", fill="red", font=("Arial", 10, "bold"))
+    scene.line(x_left - 20, y_center, x_left, y_center, key="head",
+               arrow="last", fill="red", width=2)
+
+    return scene
+
+
+def layout_circular_linked_list(structure, width, height, zoom=1.0, overview=None):
+    scene = Scene(width, height)
+
+    if not structure.size:
+        return scene
+
+    # Draw circular linked list in a circle
+    center_x = width // 2
+    center_y = height // 2
+    radius = max(min(center_x, center_y) - 70, 80)
+
+    detail = _detail(zoom, overview)
+    if structure.size > RING_NODE_BUDGET or detail == DETAIL_SUMMARY:
+        # Too many nodes to tell apart: one ring with the node count
+        scene.oval(center_x - radius, center_y - radius, center_x + radius, center_y + radius,
+                   key="ring", outline="black", width=2)
+        scene.text(center_x, center_y, key="count", text=f"{structure.size} nodes",
+                   font=("Arial", 12, "bold"))
+        scene.text(center_x, center_y - radius - 20, key="head_label", text="head",
+                   font=("Arial", 10, "bold"), fill="red")
+        return scene
+
+    # Calculate positions for nodes and the arrows between them
+    nodes = structure.get_nodes()
+    box_width = _box_width(nodes, VALUE_FONT, 60)
+    box_height = 40
+    # Wider boxes move the nodes further apart along the ring
+    xs, ys = ring_positions(len(nodes), center_x, center_y, radius,
+                            RING_PITCH + box_width - 60, RING_GAP)
+    x1, y1, x2, y2, nx, ny = ring_arrows(xs, ys, box_width / 2, box_height / 2)
+
+    # Draw nodes
+    for i, node in enumerate(nodes):
+        key = id(node)
+        x, y = xs[i], ys[i]
+
+        scene.rectangle(x - box_width / 2, y - box_height / 2,
+                        x + box_width / 2, y + box_height / 2, key=(key, "box"), node=node,
+                        fill="lightpink", outline="black", width=2)
+        if detail == DETAIL_FULL:
+            scene.text(x, y, key=(key, "value"), text=_value_text(node, VALUE_FONT, box_width),
+                       fill="black", font=VALUE_FONT)
+
+    # Draw connections between nodes
+    for i, node in enumerate(nodes):
+        key = id(node)
+        scene.line(x1[i], y1[i], x2[i], y2[i], key=(key, "next"),
+                   arrow="last", fill="black", width=2)
+
+        # Add "next" label midway, offset perpendicular to the arrow
+        if detail == DETAIL_FULL:
+            mid_x = (x1[i] + x2[i]) / 2
+            mid_y = (y1[i] + y2[i]) / 2
+            scene.text(mid_x - ny[i] * 10, mid_y + nx[i] * 10, key=(key, "next_label"),
+                       text="next", fill="darkgreen", font=("Arial", 8))
+
+    # Mark the head pointer from inside the ring, which the spiral leaves free
+    head_x, head_y = xs[0], ys[0]
+    head_text_y = head_y + box_height / 2 + 40
+
+    scene.text(head_x, head_text_y, key="head_label", text="head",
+               font=("Arial", 10, "bold"), fill="red")
+    scene.line(head_x, head_text_y - 10, head_x, head_y + box_height / 2, key="head",
+               arrow="last", dash=(4, 2), fill="red", width=2)
+
+    return scene
+
+
+def layout_doubly_linked_list(structure, width, height, viewport=None, nodes=None, zoom=1.0,
+                              overview=None, row_zoom=None):
+    scene = Scene(width, height)
+
+    if nodes is None:
+        nodes = structure.get_nodes()
+    if not nodes:
+        return scene
+
+    # Draw the doubly linked list from left to right, wrapping into rows
+    box_width = _box_width(nodes, None, 80)
+    box_height = 40
+    x_left = 30
+    pitch = box_width + 80
+    grid = _wrap(len(nodes), x_left, pitch, box_height, width, height, row_zoom or zoom)
+
+    scene.extent = (x_left - 15, grid.top - 25, x_left + grid.width, grid.top + grid.height)
+    detail, indexes = _wrapped_indexes(scene, grid, zoom, overview, viewport, box_width,
+                                       box_height, "lightblue")
+
+    for i in indexes:
+        node = nodes[i]
+        key = id(node)
+
+        # Calculate position
+        x, y, direction = grid.position(i)
+
+        # Draw node box
+        scene.rectangle(x, y, x + box_width, y + box_height, key=(key, "box"), node=node,
+                        fill="lightblue", outline="black")
+
+        if detail == DETAIL_FULL:
+            # Draw value
+            scene.text(x + box_width // 2, y + box_height // 2, key=(key, "value"),
+                       text=_value_text(node, None, box_width))
+
+            # Draw memory address
+            scene.text(x + box_width // 2, y - 15, key=(key, "address"),
+                       text=f"Mem: {hex(node.memory_address)}", font=("Arial", 8))
+
+        # Draw next pointer (except for the last node)
+        if i < len(nodes) - 1:
+            coords = _link(grid, x, y, direction, box_width, box_height // 3, grid.turns_after(i))
+            scene.line(*coords, key=(key, "next"), arrow="last", fill="black")
+            if detail == DETAIL_FULL:
+                label_x, label_y = _label_point(coords, direction, 10)
+                scene.text(label_x, label_y, key=(key, "next_label"), text="next",
+                           font=("Arial", 8))
+
+        # Draw prev pointer (except for the first node); at a row turn it goes
+        # back up round the end of the row, inside the next pointer
+        if i > 0:
+            coords = _link(grid, x, y, -direction, box_width, 2 * box_height // 3,
+                           grid.turns_after(i - 1), reach=0.25, up=True)
+            scene.line(*coords, key=(key, "prev"), arrow="last", fill="blue")
+            if detail == DETAIL_FULL:
+                label_x, label_y = _label_point(coords, -direction, 10)
+                scene.text(label_x, label_y, key=(key, "prev_label"), text="prev",
+                           font=("Arial", 8))
+
+    # Mark the "head" pointer
+    y_head = grid.top + box_height // 2 - 10
+    scene.text(x_left - 15, y_head, key="head_label", text="head",
+               anchor="e", font=("Arial", 10, "bold"))
+    scene.line(x_left - 10, y_head, x_left, y_head, key="head", arrow="last")
+
+    # Mark the "tail" pointer, outside the end of the last row
+    x, y, direction = grid.position(len(nodes) - 1)
+    side = x + box_width if direction > 0 else x
+    y_tail = y + box_height // 2 - 10
+    scene.text(side + direction * 15, y_tail, key="tail_label", text="tail",
+               anchor="w" if direction > 0 else "e", font=("Arial", 10, "bold"))
+    scene.line(side + direction * 10, y_tail, side, y_tail, key="tail", arrow="last")
+
+    return scene
+
+
+def _layout_tree(structure, width, height, viewport, zoom, tree, overview, node_fill):
+    scene = Scene(width, height)
+    if not structure.root:
+        return scene
+    if tree is None:
+        tree = TidyTreeLayout(structure.root)
+
+    node_radius = 25
+    detail = _detail(zoom, overview)
+    labelled = detail == DETAIL_FULL
+
+    # Center the tree when it is narrower than the drawing area
+    tree_width = tree.width * NODE_SPACING
+    left = max(TREE_MARGIN, (width - tree_width) / 2)
+    scene.extent = (left - node_radius, TREE_TOP - node_radius,
+                    left + tree_width + node_radius,
+                    TREE_TOP + tree.height * LEVEL_HEIGHT + node_radius + 15)
+
+    first_depth = 0
+    budget = TREE_SUMMARY_BUDGET if detail == DETAIL_SUMMARY else TREE_NODE_BUDGET
+    if viewport:
+        first_depth = max(0, math.floor((viewport[1] - TREE_TOP) / LEVEL_HEIGHT))
+        last_depth = math.ceil((viewport[3] - TREE_TOP) / LEVEL_HEIGHT)
+        levels, collapsed = tree.levels((viewport[0] - left) / NODE_SPACING,
+                                        (viewport[2] - left) / NODE_SPACING,
+                                        first_depth, last_depth, budget)
+    elif overview:
+        # The top levels, down to where the budget runs out
+        levels, collapsed = tree.levels(budget=budget)
+    else:
+        levels, collapsed = tree.levels()
+
+    # Draw the connections first so they stay behind the nodes
+    for depth, level in enumerate(levels, start=first_depth):
+        child_y = TREE_TOP + depth * LEVEL_HEIGHT
+        for node, x, parent, parent_x in level:
+            if parent is None:
+                continue
+            child_x = left + x * NODE_SPACING
+            parent_x = left + parent_x * NODE_SPACING
+            parent_y = child_y - LEVEL_HEIGHT
+
+            scene.line(parent_x, parent_y + node_radius, child_x, child_y - node_radius,
+                       key=(id(node), "edge"), width=2, fill="black", arrow="last")
+
+            # Label the edge "L" or "R" near its midpoint
+            if labelled:
+                is_left = parent.left is node
+                mid_x = (parent_x + child_x) / 2
+                mid_y = (parent_y + child_y) / 2
+                scene.text(mid_x + (10 if is_left else -10), mid_y,
+                           key=(id(node), "edge_label"), text="L" if is_left else "R",
+                           fill="darkgreen", font=("Arial", 10, "bold"))
+
+    # Then draw the nodes
+    for depth, level in enumerate(levels, start=first_depth):
+        y = TREE_TOP + depth * LEVEL_HEIGHT
+        last_level = collapsed and depth == first_depth + len(levels) - 1
+        for node, x, _, _ in level:
+            x = left + x * NODE_SPACING
+            hidden = last_level and (node.left or node.right)
+            scene.oval(x - node_radius, y - node_radius, x + node_radius, y + node_radius,
+                       key=(id(node), "box"), node=node, fill="lightgray" if hidden else node_fill,
+                       outline="black", width=2)
+            if labelled:
+                # Nodes keep their size, so that the tree layout does not depend on the
+                # values; the value may use the whole middle of the circle
+                scene.text(x, y, key=(id(node), "value"),
+                           text=METRICS.fit(str(node.data), VALUE_FONT, 2 * node_radius - 4),
+                           fill="black", font=VALUE_FONT)
+            if hidden:
+                # The rest of the subtree is summarised by its node count
+                scene.text(x, y + node_radius + 8, key=(id(node), "count"),
+                           text=f"+{tree.size_of(node) - 1}", font=("Arial", 8))
+
+    return scene
+
+
+def layout_binary_tree(structure, width, height, viewport=None, zoom=1.0, tree=None,
+                       overview=None):
+    return _layout_tree(structure, width, height, viewport, zoom, tree, overview, "lightgreen")
+
+
+def layout_binary_search_tree(structure, width, height, viewport=None, zoom=1.0, tree=None,
+                              overview=None):
+    return _layout_tree(structure, width, height, viewport, zoom, tree, overview, "lightyellow")
+
+
+# Layout for each structure class, used where there is no frame to ask
+LAYOUTS = {
+    "Stack": layout_stack,
+    "Queue": layout_queue,
+    "SinglyLinkedList": layout_singly_linked_list,
+    "CircularLinkedList": layout_circular_linked_list,
+    "DoublyLinkedList": layout_doubly_linked_list,
+    "BinaryTree": layout_binary_tree,
+    "BinarySearchTree": layout_binary_search_tree,
+}
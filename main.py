@@ -1,10 +1,16 @@
+import sys
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog, simpledialog
 from ui_components import StackFrame, QueueFrame
 from ui_components_linked_lists import SinglyLinkedListFrame, CircularLinkedListFrame
 from ui_components_double_linked_list import DoublyLinkedListFrame
 from ui_components_trees import BinaryTreeFrame, BinarySearchTreeFrame
 from file_manager import FileManager
+from background_tasks import BackgroundTask
+from importers import read_values, IMPORT_FILE_TYPES
+from file_index import MetadataIndex
+from open_dialog import OpenStructureDialog
+from tracing import TraceRecorder, TracePlayer, read_trace, start_structure, TRACE_FILE_TYPES
 
 
 class DataStructureVisualizer(tk.Tk):
@@ -17,6 +23,13 @@ class DataStructureVisualizer(tk.Tk):
         self.geometry("1000x700")
         self.minsize(800, 600)
 
+        # Cached headers of saved files and the recently opened list
+        self.file_index = MetadataIndex()
+
+        # Active trace recorder and GUI trace player, if any
+        self.recorder = None
+        self.player = None
+
         # Create menu
         self.create_menu()
 
@@ -42,6 +55,11 @@ class DataStructureVisualizer(tk.Tk):
         file_menu.add_command(label="New", command=self.new_structure)
         file_menu.add_command(label="Open", command=self.load_structure)
         file_menu.add_command(label="Save", command=self.save_structure)
+        file_menu.add_command(label="Import Values...", command=self.import_values)
+        file_menu.add_separator()
+        file_menu.add_command(label="Start Recording Trace...", command=self.start_recording)
+        file_menu.add_command(label="Stop Recording Trace", command=self.stop_recording)
+        file_menu.add_command(label="Replay Trace...", command=self.replay_trace)
         file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.quit)
 
@@ -84,8 +102,7 @@ class DataStructureVisualizer(tk.Tk):
 
         # Clear current frame if exists
         if self.current_frame:
-            # Unbind any existing events before destroying
-            self.unbind("<Configure>")
+            self._stop_trace_activity()
             self.current_frame.destroy()
 
         # Create new frame based on selection
@@ -108,54 +125,166 @@ class DataStructureVisualizer(tk.Tk):
         if self.current_frame:
             self.current_frame.pack(fill=tk.BOTH, expand=True)
 
-            # Create a safe resize handler
-            def safe_resize_handler(event):
-                if self.current_frame and self.current_frame.winfo_exists():
-                    try:
-                        self.current_frame.update_visualization()
-                    except (tk.TclError, AttributeError):
-                        # Silently ignore errors if the widget no longer exists
-                        pass
-
-            # Bind resize event to update visualization
-            self.bind("<Configure>", safe_resize_handler)
-
     def new_structure(self):
         """Create a new data structure."""
         if self.current_frame:
             if messagebox.askyesno("New Structure",
                                    "This will clear the current structure. Continue?"):
-                # Unbind events before destroying
-                self.unbind("<Configure>")
+                self._stop_trace_activity()
                 self.current_frame.destroy()
                 self.current_frame = None
                 self.structure_var.set("")
 
     def save_structure(self):
-        """Save current structure to a file."""
-        if not self.current_frame:
+        """Save current structure to a file in a background thread."""
+        if not self.current_frame or not hasattr(self.current_frame, "structure"):
             messagebox.showinfo("Save", "No structure to save.")
             return
 
-        success = FileManager.save_structure(
-            self.current_frame.structure,
-            self.structure_var.get()
-        )
+        file_path = FileManager.ask_save_path()
+        if not file_path:
+            return
+
+        # Take the snapshot on the Tk thread so the saved data is consistent
+        structure = self.current_frame.structure
+        structure_type = self.structure_var.get()
+        metadata = FileManager.describe(structure, structure_type)
+        snapshot = structure.snapshot()
+
+        def work(progress, cancel_event):
+            return FileManager.write_structure(file_path, metadata, snapshot,
+                                               progress, cancel_event)
 
-        if success:
-            messagebox.showinfo("Save", "Structure saved successfully.")
+        BackgroundTask(self, "Save", f"Saving {structure_type}...", work,
+                       on_done=lambda result: messagebox.showinfo(
+                           "Save", "Structure saved successfully."),
+                       on_error=lambda e: messagebox.showerror(
+                           "Save Error", f"Error saving file: {str(e)}"))
 
     def load_structure(self):
-        """Load a structure from a file."""
-        structure_type, structure = FileManager.load_structure()
+        """Load a structure from a file in a background thread."""
+        file_path = OpenStructureDialog.ask(self, self.file_index)
+        if not file_path:
+            return
+
+        def work(progress, cancel_event):
+            return FileManager.read_structure(file_path, progress, cancel_event)
+
+        def done(result):
+            self.file_index.add_recent(file_path)
+            self._show_loaded_structure(result)
 
-        if not structure_type or not structure:
+        BackgroundTask(self, "Open", "Loading structure...", work,
+                       on_done=done,
+                       on_error=lambda e: messagebox.showerror(
+                           "Load Error", f"Error loading file: {str(e)}"))
+
+    def import_values(self):
+        """Stream values from a CSV, JSON Lines or text file into the current structure."""
+        if not self.current_frame or not hasattr(self.current_frame, "structure"):
+            messagebox.showinfo("Import", "Select a data structure first.")
+            return
+
+        file_path = filedialog.askopenfilename(filetypes=IMPORT_FILE_TYPES,
+                                               title="Import Values")
+        if not file_path:
+            return
+
+        frame = self.current_frame
+        data_type = frame.data_type.get()
+
+        def work(progress, cancel_event):
+            return read_values(file_path, data_type, progress, cancel_event)
+
+        def done(result):
+            values, skipped = result
+            if not frame.winfo_exists():
+                return
+            frame.bulk_insert(values)
+            message = f"Imported {len(values)} values."
+            if skipped:
+                message += f"\n{skipped} values could not be converted to {data_type} and were skipped."
+            messagebox.showinfo("Import", message)
+
+        BackgroundTask(self, "Import", f"Importing values as {data_type}...", work,
+                       on_done=done,
+                       on_error=lambda e: messagebox.showerror(
+                           "Import Error", f"Error importing file: {str(e)}"))
+
+    def start_recording(self):
+        """Record every operation on the current structure to a trace file."""
+        if not self.current_frame or not hasattr(self.current_frame, "structure"):
+            messagebox.showinfo("Record Trace", "Select a data structure first.")
+            return
+
+        file_path = filedialog.asksaveasfilename(defaultextension=".jsonl",
+                                                 filetypes=TRACE_FILE_TYPES,
+                                                 title="Record Trace")
+        if not file_path:
+            return
+
+        self.stop_recording()
+        self.recorder = TraceRecorder(file_path, self.structure_var.get(),
+                                      self.current_frame.structure)
+        self.current_frame.recorder = self.recorder
+
+    def stop_recording(self):
+        """Finish the trace being recorded, if any."""
+        if not self.recorder:
+            return
+        if self.current_frame and hasattr(self.current_frame, "recorder"):
+            self.current_frame.recorder = None
+        self.recorder.close()
+        self.recorder = None
+
+    def replay_trace(self):
+        """Replay a recorded trace in a new frame at a chosen speed."""
+        file_path = filedialog.askopenfilename(filetypes=TRACE_FILE_TYPES, title="Replay Trace")
+        if not file_path:
+            return
+
+        try:
+            header, events = read_trace(file_path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Replay Error", f"Error reading trace: {str(e)}")
+            return
+
+        speed = simpledialog.askfloat("Replay Speed",
+                                      "Speed (1 = as recorded, 0 = as fast as possible):",
+                                      initialvalue=1.0, minvalue=0.0)
+        if speed is None:
+            return
+
+        # Start from what the structure held when recording started
+        self.structure_var.set(header["type"])
+        self.on_structure_selected(None)
+        if not self.current_frame or not self.current_frame.winfo_exists():
+            messagebox.showerror("Replay Error", f"Unknown structure type: {header['type']}")
+            return
+        self.current_frame.structure = start_structure(header)
+        self.current_frame.update_info()
+        self.current_frame.update_visualization()
+        self.player = TracePlayer(self.current_frame, events, speed,
+                                  on_finished=lambda: messagebox.showinfo(
+                                      "Replay", f"Replayed {len(events)} operations."))
+
+    def _stop_trace_activity(self):
+        """Stop recording and replaying before the current frame goes away."""
+        self.stop_recording()
+        if self.player:
+            self.player.stop()
+            self.player = None
+
+    def _show_loaded_structure(self, result):
+        """Replace the current frame with a loaded (structure_type, structure)."""
+        structure_type, structure = result
+
+        if not structure_type or structure is None:
             return
 
         # Clear current frame if exists
         if self.current_frame:
-            # Unbind any existing events before destroying
-            self.unbind("<Configure>")
+            self._stop_trace_activity()
             self.current_frame.destroy()
 
         # Set the combobox to the loaded structure type
@@ -184,18 +313,6 @@ class DataStructureVisualizer(tk.Tk):
             self.current_frame.pack(fill=tk.BOTH, expand=True)
             self.current_frame.update_visualization()
 
-            # Create a safe resize handler
-            def safe_resize_handler(event):
-                if self.current_frame and self.current_frame.winfo_exists():
-                    try:
-                        self.current_frame.update_visualization()
-                    except (tk.TclError, AttributeError):
-                        # Silently ignore errors if the widget no longer exists
-                        pass
-
-            # Bind resize event to update visualization
-            self.bind("<Configure>", safe_resize_handler)
-
             messagebox.showinfo("Load", "Structure loaded successfully.")
 
     def show_welcome(self):
@@ -230,5 +347,20 @@ class DataStructureVisualizer(tk.Tk):
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "render":
+        # Headless export: python main.py render in.dsv out.svg
+        from headless import main as render_main
+        sys.exit(render_main(sys.argv[2:]))
+
+    if len(sys.argv) > 1 and sys.argv[1] == "replay":
+        # Headless benchmark: python main.py replay trace.jsonl
+        from tracing import main as replay_main
+        sys.exit(replay_main(sys.argv[2:]))
+
+    if len(sys.argv) > 1 and sys.argv[1] == "benchmark":
+        # Render benchmark: python main.py benchmark --nodes 100000
+        from benchmark import main as benchmark_main
+        sys.exit(benchmark_main(sys.argv[2:]))
+
     app = DataStructureVisualizer()
-    app.mainloop()
\ No newline at end of file
+    app.mainloop()
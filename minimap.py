@@ -0,0 +1,138 @@
+# Overview of the whole layout in a small canvas beside the main one.
+#
+# The minimap draws no nodes. It asks the layout for the summary of the
+# whole structure with bars about one cell long on the minimap (see the
+# overview argument of the layouts), which holds about the same number of
+# items however many nodes there are. The areas of those items are added
+# up on a fixed grid of cells and each cell is shaded by how much of it
+# they cover, so the minimap shows where the nodes are dense. Only cells
+# whose shade changed are reconfigured: a small change of the structure
+# costs a few canvas calls.
+
+import math
+import tkinter as tk
+
+from layouts import SUMMARY_BAR_PIXELS
+
+MINIMAP_WIDTH = 160
+MINIMAP_HEIGHT = 120
+
+# Side of one density cell, in minimap pixels
+MINIMAP_CELL = 8
+
+# Room left around the layout inside the minimap
+MINIMAP_PADDING = 4
+
+# Shades from empty to the densest cell, white to DENSE_COLOR
+SHADES = 8
+DENSE_COLOR = (31, 78, 140)
+SHADE_COLORS = ["#%02x%02x%02x" % tuple(round(255 + (c - 255) * level / (SHADES - 1))
+                                        for c in DENSE_COLOR)
+                for level in range(SHADES)]
+
+
+class Minimap:
+    """Density map of a layout area, with the part in the main view outlined.
+
+    Clicking or dragging on it calls jump(x, y) with the layout point under
+    the pointer.
+    """
+
+    def __init__(self, parent, jump):
+        self.canvas = tk.Canvas(parent, width=MINIMAP_WIDTH, height=MINIMAP_HEIGHT, bg="white",
+                                bd=1, relief=tk.SUNKEN, highlightthickness=0)
+        self.jump = jump
+        self.columns = MINIMAP_WIDTH // MINIMAP_CELL
+        self.rows = MINIMAP_HEIGHT // MINIMAP_CELL
+        self.scale = (1.0, 1.0)  # Minimap pixels per layout unit, across and down
+        self.offset = (0.0, 0.0)  # Minimap point of the layout origin
+        self.calls = 0  # Canvas calls of the last show(), to check it stays incremental
+
+        # One rectangle per cell, only ever recoloured
+        self.cells = []
+        for row in range(self.rows):
+            for column in range(self.columns):
+                x = column * MINIMAP_CELL
+                y = row * MINIMAP_CELL
+                self.cells.append(self.canvas.create_rectangle(
+                    x, y, x + MINIMAP_CELL, y + MINIMAP_CELL, fill=SHADE_COLORS[0], outline=""))
+        self.levels = [0] * len(self.cells)
+        self.view = None  # Minimap rectangle of the main view
+        self.view_item = self.canvas.create_rectangle(0, 0, 0, 0, outline="red", width=2)
+
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<B1-Motion>", self._on_click)
+
+    def fit(self, area):
+        """Stretch the layout area (x1, y1, x2, y2) over the minimap.
+
+        Long lists are far taller than wide and trees the other way round,
+        so keeping the proportions would leave most of the minimap empty.
+        """
+        x1, y1, x2, y2 = area
+        scale_x = (MINIMAP_WIDTH - 2 * MINIMAP_PADDING) / max(1, x2 - x1)
+        scale_y = (MINIMAP_HEIGHT - 2 * MINIMAP_PADDING) / max(1, y2 - y1)
+        self.scale = (scale_x, scale_y)
+        self.offset = (MINIMAP_PADDING - x1 * scale_x, MINIMAP_PADDING - y1 * scale_y)
+
+    def overview_zoom(self):
+        """The overview argument for the layouts: summary bars about one cell long.
+
+        Bars are sized along the more shrunk direction, so they never get
+        smaller than a cell.
+        """
+        return min(self.scale) * SUMMARY_BAR_PIXELS / MINIMAP_CELL
+
+    def show(self, scene):
+        """Shade the cells by how much of them the shapes of scene cover."""
+        coverage = [0.0] * len(self.cells)
+        scale_x, scale_y = self.scale
+        offset_x, offset_y = self.offset
+        for item in scene.items:
+            if item.kind not in ("rectangle", "oval"):
+                continue
+            xs = item.coords[0::2]
+            ys = item.coords[1::2]
+            x1 = min(xs) * scale_x + offset_x
+            x2 = max(xs) * scale_x + offset_x
+            y1 = min(ys) * scale_y + offset_y
+            y2 = max(ys) * scale_y + offset_y
+            # Shapes smaller than a pixel still count for one
+            if x2 - x1 < 1:
+                x2 = x1 + 1
+            if y2 - y1 < 1:
+                y2 = y1 + 1
+            for row in range(max(0, int(y1 // MINIMAP_CELL)),
+                             min(self.rows, int(y2 // MINIMAP_CELL) + 1)):
+                top = row * MINIMAP_CELL
+                height = min(y2, top + MINIMAP_CELL) - max(y1, top)
+                if height <= 0:
+                    continue
+                for column in range(max(0, int(x1 // MINIMAP_CELL)),
+                                    min(self.columns, int(x2 // MINIMAP_CELL) + 1)):
+                    left = column * MINIMAP_CELL
+                    width = min(x2, left + MINIMAP_CELL) - max(x1, left)
+                    if width > 0:
+                        coverage[row * self.columns + column] += width * height
+
+        # Shades are relative to the densest cell, and any node at all shows
+        densest = max(coverage) or 1.0
+        self.calls = 0
+        for i, covered in enumerate(coverage):
+            level = math.ceil(covered / densest * (SHADES - 1))
+            if level != self.levels[i]:
+                self.levels[i] = level
+                self.canvas.itemconfigure(self.cells[i], fill=SHADE_COLORS[level])
+                self.calls += 1
+
+    def show_view(self, area):
+        """Outline the layout area (x1, y1, x2, y2) shown in the main view."""
+        view = tuple(round(value * scale + offset)
+                     for value, scale, offset in zip(area, self.scale * 2, self.offset * 2))
+        if view != self.view:
+            self.view = view
+            self.canvas.coords(self.view_item, *view)
+
+    def _on_click(self, event):
+        (scale_x, scale_y), (offset_x, offset_y) = self.scale, self.offset
+        self.jump((event.x - offset_x) / scale_x, (event.y - offset_y) / scale_y)
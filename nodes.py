@@ -26,4 +26,6 @@ class TreeNode(Node):
         super().__init__(data)
         self.left = None
         self.right = None
+        self.parent = None  # Kept by the trees in structures.py
+        self.height = 1  # Height of the subtree rooted here
         self.next = None  # This can be used for level order traversal
\ No newline at end of file
@@ -0,0 +1,146 @@
+import os
+import time
+import tkinter as tk
+from tkinter import ttk, filedialog
+
+
+COLUMNS = [
+    ("type", "Type", 150),
+    ("count", "Size", 80),
+    ("height", "Height", 60),
+    ("value_type", "Values", 70),
+    ("created", "Created", 140),
+]
+
+
+def format_header_value(header, key):
+    """Return a header field as display text."""
+    if not header:
+        return "?"
+    value = header.get(key)
+    if value is None:
+        return "-"
+    if key == "created":
+        return time.strftime("%Y-%m-%d %H:%M", time.localtime(value))
+    return str(value)
+
+
+class OpenStructureDialog(tk.Toplevel):
+    """Open dialog that previews saved files using only their headers."""
+
+    def __init__(self, parent, index, directory=None):
+        super().__init__(parent)
+        self.title("Open Structure")
+        self.geometry("700x450")
+        self.transient(parent)
+
+        self.index = index
+        self.result = None
+        self.paths = {}  # Treeview item id -> file path
+
+        if directory is None:
+            directory = os.path.dirname(index.recent[0]) if index.recent else os.getcwd()
+        self.directory_var = tk.StringVar(value=directory)
+
+        self._create_widgets()
+        self.show_directory()
+        self.grab_set()
+
+    def _create_widgets(self):
+        # Directory selection
+        top_frame = ttk.Frame(self)
+        top_frame.pack(fill=tk.X, padx=10, pady=5)
+
+        ttk.Label(top_frame, text="Folder:").pack(side=tk.LEFT, padx=5)
+        ttk.Entry(top_frame, textvariable=self.directory_var).pack(side=tk.LEFT, fill=tk.X,
+                                                                   expand=True, padx=5)
+        ttk.Button(top_frame, text="Browse...", command=self.browse).pack(side=tk.LEFT, padx=5)
+        ttk.Button(top_frame, text="Recent", command=self.show_recent).pack(side=tk.LEFT, padx=5)
+
+        # File list with the header of each file
+        list_frame = ttk.Frame(self)
+        list_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+        self.tree = ttk.Treeview(list_frame, columns=[key for key, _, _ in COLUMNS])
+        self.tree.heading("#0", text="File")
+        self.tree.column("#0", width=180)
+        for key, title, width in COLUMNS:
+            self.tree.heading(key, text=title)
+            self.tree.column(key, width=width, anchor=tk.W)
+
+        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.LEFT, fill=tk.Y)
+
+        self.tree.bind("<<TreeviewSelect>>", self.on_select)
+        self.tree.bind("<Double-1>", lambda event: self.open_selected())
+
+        # Preview of the selected file
+        self.preview_var = tk.StringVar(value="")
+        ttk.Label(self, textvariable=self.preview_var, justify=tk.LEFT).pack(anchor=tk.W,
+                                                                              padx=15, pady=5)
+
+        button_frame = ttk.Frame(self)
+        button_frame.pack(fill=tk.X, padx=10, pady=5)
+        ttk.Button(button_frame, text="Cancel", command=self.destroy).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(button_frame, text="Open", command=self.open_selected).pack(side=tk.RIGHT, padx=5)
+
+    def browse(self):
+        directory = filedialog.askdirectory(initialdir=self.directory_var.get(), parent=self)
+        if directory:
+            self.directory_var.set(directory)
+            self.show_directory()
+
+    def _fill(self, entries):
+        self.tree.delete(*self.tree.get_children())
+        self.paths.clear()
+        for path, header in entries:
+            item = self.tree.insert("", tk.END, text=os.path.basename(path),
+                                    values=[format_header_value(header, key)
+                                            for key, _, _ in COLUMNS])
+            self.paths[item] = path
+        self.preview_var.set("")
+
+    def show_directory(self):
+        self._fill(self.index.scan(self.directory_var.get()))
+
+    def show_recent(self):
+        self._fill([(path, self.index.get(path)) for path in self.index.recent
+                    if os.path.exists(path)])
+        self.index.save()
+
+    def on_select(self, event):
+        selection = self.tree.selection()
+        if not selection:
+            return
+        path = self.paths[selection[0]]
+        header = self.index.get(path)
+        if not header:
+            self.preview_var.set(f"{path}\nNot a readable structure file.")
+            return
+        if header.get("legacy"):
+            self.preview_var.set(f"{path}\nOlder file format: its contents are only known once opened.\n"
+                                 f"Modified {format_header_value(header, 'created')}")
+            return
+        checksum = header.get("checksum") or "-"
+        self.preview_var.set(
+            f"{path}\n"
+            f"{format_header_value(header, 'type')} with {format_header_value(header, 'count')} "
+            f"values of type {format_header_value(header, 'value_type')}, "
+            f"height {format_header_value(header, 'height')}\n"
+            f"Created {format_header_value(header, 'created')}, checksum {checksum[:16]}")
+
+    def open_selected(self):
+        selection = self.tree.selection()
+        if not selection:
+            return
+        self.result = self.paths[selection[0]]
+        self.destroy()
+
+    @classmethod
+    def ask(cls, parent, index):
+        """Show the dialog and return the chosen path, or None if cancelled."""
+        dialog = cls(parent, index)
+        parent.wait_window(dialog)
+        return dialog.result
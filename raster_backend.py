@@ -0,0 +1,237 @@
+import math
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:  # Pillow is optional; only raster output needs it
+    Image = ImageDraw = ImageFont = None
+
+try:
+    from PIL import ImageTk
+except ImportError:  # Also missing when Tk is, which headless exports do not need
+    ImageTk = None
+
+from canvas_backend import SCENE_TAG, highlight_overrides, node_of
+from scene import DEFAULT_FONT, POINTS_TO_PIXELS, Primitive, Scene
+from svg_backend import scene_size
+
+
+# Arrow head length and half width, matching Tk's default arrowshape
+ARROW_LENGTH = 10
+ARROW_HALF_WIDTH = 4
+
+_fonts = {}
+
+
+def can_show():
+    """Tell whether RasterRenderer can put its images on a Tk canvas."""
+    return Image is not None and ImageTk is not None
+
+
+def _require_pillow():
+    if Image is None:
+        raise RuntimeError("Raster output requires Pillow (pip install Pillow)")
+
+
+def _font(font):
+    """Return a Pillow font for a Tk font tuple, loading each one only once."""
+    family, size, *styles = font or DEFAULT_FONT
+    key = (size, "bold" in styles)
+    if key not in _fonts:
+        pixels = max(1, round(size * POINTS_TO_PIXELS))
+        name = "DejaVuSans-Bold.ttf" if key[1] else "DejaVuSans.ttf"
+        try:
+            _fonts[key] = ImageFont.truetype(name, pixels)
+        except OSError:
+            try:
+                _fonts[key] = ImageFont.load_default(pixels)
+            except TypeError:  # Pillow < 10.1 has a single bitmap font
+                _fonts[key] = ImageFont.load_default()
+    return _fonts[key]
+
+
+def _arrow_head(draw, tip, tail, color):
+    dx = tip[0] - tail[0]
+    dy = tip[1] - tail[1]
+    length = math.hypot(dx, dy)
+    if length == 0:
+        return
+    ux, uy = dx / length, dy / length
+    base = (tip[0] - ux * ARROW_LENGTH, tip[1] - uy * ARROW_LENGTH)
+    draw.polygon([tip,
+                  (base[0] - uy * ARROW_HALF_WIDTH, base[1] + ux * ARROW_HALF_WIDTH),
+                  (base[0] + uy * ARROW_HALF_WIDTH, base[1] - ux * ARROW_HALF_WIDTH)],
+                 fill=color)
+
+
+TEXT_ANCHORS = {"center": "mm", "n": "mt", "s": "mb", "e": "rm", "w": "lm",
+                "ne": "rt", "nw": "lt", "se": "rb", "sw": "lb"}
+
+
+def draw_scene(draw, scene, offset_x=0, offset_y=0, scale=1.0):
+    """Paint the scene with a Pillow ImageDraw, mapping (x, y) to (x - offset) * scale."""
+    def point(x, y):
+        return ((x - offset_x) * scale, (y - offset_y) * scale)
+
+    for item in scene.items:
+        options = item.options
+        width = max(1, round(options.get("width", 1) * scale))
+
+        if item.kind in ("rectangle", "oval"):
+            x1, y1 = point(*item.coords[:2])
+            x2, y2 = point(*item.coords[2:])
+            box = [min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)]
+            shape = draw.rectangle if item.kind == "rectangle" else draw.ellipse
+            shape(box, fill=options.get("fill") or None,
+                  outline=options.get("outline", "black"), width=width)
+
+        elif item.kind == "line":
+            color = options.get("fill", "black")
+            points = [point(*item.coords[i:i + 2]) for i in range(0, len(item.coords), 2)]
+            draw.line(points, fill=color, width=width)
+            arrow = options.get("arrow")
+            if arrow in ("last", "both"):
+                _arrow_head(draw, points[-1], points[-2], color)
+            if arrow in ("first", "both"):
+                _arrow_head(draw, points[0], points[1], color)
+
+        elif item.kind == "text" and options.get("text"):
+            family, size, *styles = options.get("font") or DEFAULT_FONT
+            font = _font((family, max(1, round(size * scale)), *styles))
+            draw.text(point(*item.coords), options["text"], fill=options.get("fill", "black"),
+                      font=font, anchor=TEXT_ANCHORS.get(options.get("anchor", "center"), "mm"))
+
+
+def render_image(scene):
+    """Rasterize the whole scene into a new Pillow image."""
+    _require_pillow()
+    x, y, width, height = scene_size(scene)
+    image = Image.new("RGB", (max(1, math.ceil(width)), max(1, math.ceil(height))), "white")
+    draw_scene(ImageDraw.Draw(image), scene, offset_x=x, offset_y=y)
+    return image
+
+
+def write_png(scene, file_path):
+    render_image(scene).save(file_path, "PNG")
+
+
+class RasterRenderer:
+    """Show scenes on a Tk canvas as one image painted offscreen with Pillow.
+
+    A canvas holding tens of thousands of items gets slow to scroll, redraw
+    and even to delete, while one image item costs the same however much is
+    drawn on it. Only the part of the scene in view, widened by margin
+    canvas pixels, is painted, so the image stays about the window's size
+    and every scroll or zoom paints it again (view_dependent).
+
+    It has the interface of canvas_backend.CanvasRenderer, so a frame can
+    switch between the two. There are no canvas items to find under the
+    pointer; hit testing goes through Scene.key_at() on the layout instead.
+    """
+
+    view_dependent = True
+
+    def __init__(self, canvas, margin=200):
+        _require_pillow()
+        self.canvas = canvas
+        self.margin = margin
+        self.zoom = 1.0
+        self.calls = 0  # canvas calls made by the last render()
+        self.image_id = None
+        self.photo = None  # Tk keeps no reference to the image it shows
+        self._scene = None  # Waiting for step()
+        self.shown = None  # Scene the image was last painted from
+        self.highlights = {}
+        self._overrides = {}
+
+    def clear(self):
+        self.canvas.delete(SCENE_TAG)
+        self.image_id = None
+        self.photo = None
+        self._scene = None
+        self.shown = None
+
+    def resize(self, width, height):
+        """Nothing to stretch: the image is painted again once the layout follows."""
+
+    def set_zoom(self, zoom):
+        """Paint at the new zoom from the next render() on."""
+        self.zoom = zoom
+
+    def _area(self, scene):
+        """Return the layout area (x1, y1, x2, y2) to paint, or None if nothing is in view."""
+        canvas = self.canvas
+        x1 = (canvas.canvasx(0) - self.margin) / self.zoom
+        y1 = (canvas.canvasy(0) - self.margin) / self.zoom
+        x2 = (canvas.canvasx(canvas.winfo_width()) + self.margin) / self.zoom
+        y2 = (canvas.canvasy(canvas.winfo_height()) + self.margin) / self.zoom
+        bbox = scene.bbox()
+        if not bbox:
+            return None
+        # Room for line widths, arrow heads and text around the coordinates
+        x1, y1 = max(x1, bbox[0] - 20), max(y1, bbox[1] - 20)
+        x2, y2 = min(x2, bbox[2] + 20), min(y2, bbox[3] + 20)
+        if x2 <= x1 or y2 <= y1:
+            return None
+        return x1, y1, x2, y2
+
+    def start(self, scene, focus=None):
+        """Let the next step() paint scene, replacing any scene still waiting."""
+        self._scene = scene
+
+    def step(self, budget=None):
+        """Paint the waiting scene. The view is painted in one go, so this always finishes."""
+        if self._scene is not None:
+            scene, self._scene = self._scene, None
+            self.render(scene)
+        return True
+
+    def set_highlight(self, name, node_ids):
+        """Show exactly the given nodes in the HIGHLIGHT_STYLES[name] look, painting the image again."""
+        self.highlights.pop(name, None)
+        node_ids = frozenset(node_ids)
+        if node_ids:
+            self.highlights[name] = node_ids
+        self._overrides = highlight_overrides(self.highlights)
+        if self.shown is not None and self._scene is None:
+            self.render(self.shown)
+
+    def _highlighted(self, scene):
+        """Return scene with the highlight looks applied to the shapes of their nodes."""
+        if not self._overrides:
+            return scene
+        highlighted = Scene(scene.width, scene.height)
+        highlighted.extent = scene.extent
+        for item in scene.items:
+            override = self._overrides.get(node_of(item.key)) if item.kind in ("rectangle", "oval") else None
+            if override:
+                item = Primitive(item.kind, item.coords, {**item.options, **override}, item.key)
+            highlighted.items.append(item)
+        return highlighted
+
+    def render(self, scene):
+        canvas = self.canvas
+        self.shown = scene
+        area = self._area(scene)
+        if area is None:
+            if self.image_id is not None:
+                self.clear()
+                self.calls = 1
+            else:
+                self.calls = 0
+            return
+
+        x1, y1, x2, y2 = area
+        size = (max(1, math.ceil((x2 - x1) * self.zoom)), max(1, math.ceil((y2 - y1) * self.zoom)))
+        image = Image.new("RGBA", size, (0, 0, 0, 0))
+        draw_scene(ImageDraw.Draw(image), self._highlighted(scene), offset_x=x1, offset_y=y1,
+                   scale=self.zoom)
+        self.photo = ImageTk.PhotoImage(image)
+
+        if self.image_id is None:
+            self.image_id = canvas.create_image(x1 * self.zoom, y1 * self.zoom, anchor="nw",
+                                                image=self.photo, tags=SCENE_TAG)
+            self.calls = 1
+        else:
+            canvas.itemconfigure(self.image_id, image=self.photo)
+            canvas.coords(self.image_id, x1 * self.zoom, y1 * self.zoom)
+            self.calls = 2
@@ -0,0 +1,54 @@
+import time
+
+# Shortest time between two redraws, about one frame of a 60 Hz display
+FRAME_INTERVAL_MS = 16
+
+
+class RenderScheduler:
+    """Redraw the frames marked dirty, at most once per display interval.
+
+    Frames ask for a redraw with request() instead of drawing right away,
+    so a burst of operations, scroll or zoom events ends in a single
+    redraw, and event handlers never force the window to update while
+    they run. There is one scheduler per application; see for_widget().
+    """
+
+    def __init__(self, widget, interval=FRAME_INTERVAL_MS):
+        self.widget = widget
+        self.interval = interval
+        self.dirty = {}  # frames waiting for a redraw, in the order they asked
+        self.after_id = None
+        self.last_render = None  # time.perf_counter() of the last redraw
+
+    @classmethod
+    def for_widget(cls, widget):
+        """Return the scheduler shared by every widget of widget's application."""
+        root = widget.nametowidget(".")
+        scheduler = getattr(root, "render_scheduler", None)
+        if scheduler is None:
+            scheduler = root.render_scheduler = cls(root)
+        return scheduler
+
+    def request(self, frame):
+        """Mark frame dirty; its render() runs with the next redraw."""
+        self.dirty[frame] = None
+        if self.after_id is not None:
+            return
+        delay = 0
+        if self.last_render is not None:
+            elapsed = (time.perf_counter() - self.last_render) * 1000
+            delay = max(0, round(self.interval - elapsed))
+        self.after_id = self.widget.after(delay, self._render)
+
+    def cancel(self, frame):
+        """Forget a pending redraw of frame, e.g. because it is being destroyed."""
+        self.dirty.pop(frame, None)
+
+    def _render(self):
+        self.after_id = None
+        self.last_render = time.perf_counter()
+        frames = list(self.dirty)
+        self.dirty.clear()
+        for frame in frames:
+            if frame.winfo_exists():
+                frame.render()
@@ -0,0 +1,111 @@
+# Positions of the nodes of a circular list around a ring.
+#
+# As long as they fit, the nodes are spread evenly over one circle. Beyond
+# that they follow an Archimedean spiral that starts on the same circle and
+# moves outwards by one ring gap per turn, successive nodes a fixed arc
+# length apart, so any number of nodes can be shown without overlapping.
+# Arrows between successive nodes start and end where they cross the edges
+# of the boxes.
+#
+# Everything is computed for all nodes at once with NumPy when it is
+# installed, and node by node with the math module otherwise.
+
+import math
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the math module gives the same result
+    np = None
+
+
+def fits_on_circle(count, radius, pitch):
+    """Tell whether count nodes pitch apart fit on one circle of the given radius."""
+    return count * pitch <= 2 * math.pi * radius
+
+
+def ring_positions(count, center_x, center_y, radius, pitch, gap):
+    """Return the lists (xs, ys) of count node centres, the first one at the top.
+
+    The nodes go clockwise, on one circle when they fit on it and else on
+    a spiral whose turns are gap apart.
+    """
+    spiral = not fits_on_circle(count, radius, pitch)
+    # Growth of the spiral radius per radian
+    growth = gap / (2 * math.pi)
+
+    if np is not None:
+        index = np.arange(count, dtype=float)
+        if spiral:
+            # The arc length radius*angle + growth*angle**2/2 grows by pitch per node
+            angles = (np.sqrt(radius * radius + 2 * growth * pitch * index) - radius) / growth
+            radii = radius + growth * angles
+        else:
+            angles = 2 * math.pi * index / count
+            radii = radius
+        xs = center_x + radii * np.sin(angles)
+        ys = center_y - radii * np.cos(angles)
+        return xs.tolist(), ys.tolist()
+
+    xs = []
+    ys = []
+    for i in range(count):
+        if spiral:
+            angle = (math.sqrt(radius * radius + 2 * growth * pitch * i) - radius) / growth
+            node_radius = radius + growth * angle
+        else:
+            angle = 2 * math.pi * i / count
+            node_radius = radius
+        xs.append(center_x + node_radius * math.sin(angle))
+        ys.append(center_y - node_radius * math.cos(angle))
+    return xs, ys
+
+
+def _edge_distance(nx, ny, half_width, half_height):
+    """Distance from the centre of a box to its edge along the unit vector (nx, ny)."""
+    return min(half_width / abs(nx) if nx else math.inf,
+               half_height / abs(ny) if ny else math.inf)
+
+
+def ring_arrows(xs, ys, half_width, half_height):
+    """Return (x1, y1, x2, y2, nx, ny) lists of the arrows from each node to the next.
+
+    The arrow of the last node goes back to the first. Arrows are clipped
+    to the edges of boxes of the given half sizes; (nx, ny) is the unit
+    direction of each arrow, (0, 0) for boxes on top of each other.
+    """
+    if np is not None:
+        x = np.asarray(xs, dtype=float)
+        y = np.asarray(ys, dtype=float)
+        dx = np.roll(x, -1) - x
+        dy = np.roll(y, -1) - y
+        dist = np.hypot(dx, dy)
+        safe = np.where(dist > 0, dist, 1.0)
+        nx = np.where(dist > 0, dx / safe, 0.0)
+        ny = np.where(dist > 0, dy / safe, 0.0)
+        with np.errstate(divide="ignore"):
+            edge = np.minimum(half_width / np.abs(nx), half_height / np.abs(ny))
+        edge = np.where(dist > 0, edge, 0.0)
+        return ((x + nx * edge).tolist(), (y + ny * edge).tolist(),
+                (x + dx - nx * edge).tolist(), (y + dy - ny * edge).tolist(),
+                nx.tolist(), ny.tolist())
+
+    count = len(xs)
+    x1, y1, x2, y2, nxs, nys = [], [], [], [], [], []
+    for i in range(count):
+        start_x, start_y = xs[i], ys[i]
+        end_x, end_y = xs[(i + 1) % count], ys[(i + 1) % count]
+        dx = end_x - start_x
+        dy = end_y - start_y
+        dist = math.hypot(dx, dy)
+        if dist > 0:
+            nx, ny = dx / dist, dy / dist
+            edge = _edge_distance(nx, ny, half_width, half_height)
+        else:
+            nx = ny = edge = 0.0
+        x1.append(start_x + nx * edge)
+        y1.append(start_y + ny * edge)
+        x2.append(end_x - nx * edge)
+        y2.append(end_y - ny * edge)
+        nxs.append(nx)
+        nys.append(ny)
+    return x1, y1, x2, y2, nxs, nys
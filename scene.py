@@ -0,0 +1,104 @@
+# Side of the square cells key_at() sorts the shapes of a scene into, in layout units
+HIT_CELL = 64
+
+# Tk draws text without a font option in TkDefaultFont
+DEFAULT_FONT = ("Arial", 10)
+
+# Points to pixels at the usual 96 DPI, for sizing text outside Tk
+POINTS_TO_PIXELS = 96 / 72
+
+
+class Primitive:
+    """One drawable item of a scene: a rectangle, oval, line or text.
+
+    coords follow the Tk canvas convention for the kind of item and options
+    use Tk canvas option names (fill, outline, width, text, font, anchor,
+    arrow, dash), so every backend translates from the same vocabulary.
+    key identifies the item across redraws, usually (id(node), role).
+    """
+
+    __slots__ = ("kind", "coords", "options", "key")
+
+    def __init__(self, kind, coords, options, key=None):
+        self.kind = kind
+        self.coords = coords
+        self.options = options
+        self.key = key
+
+    def __repr__(self):
+        return f"Primitive({self.kind!r}, {self.coords!r}, {self.options!r}, key={self.key!r})"
+
+
+class Scene:
+    """Display list produced by a layout and consumed by a rendering backend."""
+
+    def __init__(self, width, height):
+        # Size of the drawing area the layout was computed for
+        self.width = width
+        self.height = height
+        self.items = []
+        # (x1, y1, x2, y2) of the whole structure when the layout culled items
+        # outside a viewport, so the canvas can still scroll over all of it
+        self.extent = None
+        # key -> structure node drawn by the shape with that key, see node_at()
+        self.nodes = {}
+        self._grid = None  # (cell -> indexes of the shapes over it, item count), see key_at()
+
+    def rectangle(self, x1, y1, x2, y2, key=None, node=None, **options):
+        self.items.append(Primitive("rectangle", (x1, y1, x2, y2), options, key))
+        if node is not None:
+            self.nodes[key] = node
+
+    def oval(self, x1, y1, x2, y2, key=None, node=None, **options):
+        self.items.append(Primitive("oval", (x1, y1, x2, y2), options, key))
+        if node is not None:
+            self.nodes[key] = node
+
+    def line(self, *coords, key=None, **options):
+        self.items.append(Primitive("line", coords, options, key))
+
+    def text(self, x, y, key=None, **options):
+        self.items.append(Primitive("text", (x, y), options, key))
+
+    def _build_grid(self):
+        """Sort the keyed shapes into the HIT_CELL cells their bounding boxes cover."""
+        grid = {}
+        for index, item in enumerate(self.items):
+            if item.kind in ("rectangle", "oval") and item.key is not None:
+                x1, y1, x2, y2 = item.coords
+                for cell_x in range(int(min(x1, x2) // HIT_CELL), int(max(x1, x2) // HIT_CELL) + 1):
+                    for cell_y in range(int(min(y1, y2) // HIT_CELL),
+                                        int(max(y1, y2) // HIT_CELL) + 1):
+                        grid.setdefault((cell_x, cell_y), []).append(index)
+        return grid
+
+    def key_at(self, x, y):
+        """Return the key of the topmost rectangle or oval containing (x, y), or None.
+
+        Lets a viewer find what is under the pointer from the layout alone,
+        whatever backend drew it. The first call sorts the shapes into a
+        grid of HIT_CELL cells; after that a lookup only looks at the few
+        shapes over one cell.
+        """
+        if self._grid is None or self._grid[1] != len(self.items):
+            self._grid = (self._build_grid(), len(self.items))
+        for index in reversed(self._grid[0].get((int(x // HIT_CELL), int(y // HIT_CELL)), ())):
+            item = self.items[index]
+            x1, y1, x2, y2 = item.coords
+            if min(x1, x2) <= x <= max(x1, x2) and min(y1, y2) <= y <= max(y1, y2):
+                return item.key
+        return None
+
+    def node_at(self, x, y):
+        """Return the structure node whose shape is topmost at (x, y), or None."""
+        return self.nodes.get(self.key_at(x, y))
+
+    def bbox(self):
+        """Return (x1, y1, x2, y2) around every coordinate, or None if empty."""
+        if self.extent:
+            return self.extent
+        if not self.items:
+            return None
+        xs = [x for item in self.items for x in item.coords[0::2]]
+        ys = [y for item in self.items for y in item.coords[1::2]]
+        return min(xs), min(ys), max(xs), max(ys)
@@ -0,0 +1,132 @@
+# Positions of the nodes of a long linear structure wrapped into rows.
+#
+# Nodes flow left to right along the first row, right to left along the
+# second, and so on, so that successive nodes always stay next to each
+# other and the arrow at the end of a row only has to turn down into the
+# row below. Everything is plain arithmetic on the node index: the place of
+# any node, and the nodes inside any rectangle of the layout, are found
+# without looking at the others, so scrolling or jumping anywhere in a
+# list of millions of nodes costs the same as near its head.
+
+import math
+
+
+def index_range(count, first, pitch, low, high):
+    """Return the range of indexes i whose position first + i * pitch lies
+    within [low, high], widened by one pitch on each side for the items a
+    node draws beyond its position (labels, arrows to the next node)."""
+    if pitch < 0:
+        first, pitch, low, high = -first, -pitch, -high, -low
+    start = math.floor((low - first) / pitch) - 1
+    stop = math.floor((high - first) / pitch) + 2
+    return range(max(0, start), min(count, stop))
+
+
+class Serpentine:
+    """Row-wrapped grid of count cells of pitch by row_pitch, starting at (left, top).
+
+    Rows hold as many cells as fit in row_width, at least one.
+    """
+
+    __slots__ = ("count", "left", "top", "pitch", "row_pitch", "per_row", "rows")
+
+    def __init__(self, count, left, top, pitch, row_pitch, row_width):
+        self.count = count
+        self.left = left
+        self.top = top
+        self.pitch = pitch
+        self.row_pitch = row_pitch
+        self.per_row = max(1, min(count, int(row_width // pitch)))
+        self.rows = math.ceil(count / self.per_row)
+
+    @property
+    def width(self):
+        return self.per_row * self.pitch
+
+    @property
+    def height(self):
+        return self.rows * self.row_pitch
+
+    def position(self, index):
+        """Return (x, y, direction) of the cell of a node; direction is 1 left to right, else -1."""
+        row, column = divmod(index, self.per_row)
+        y = self.top + row * self.row_pitch
+        if row % 2:
+            return self.left + (self.per_row - 1 - column) * self.pitch, y, -1
+        return self.left + column * self.pitch, y, 1
+
+    def turns_after(self, index):
+        """Tell whether the node after index starts the next row."""
+        return (index + 1) % self.per_row == 0
+
+    def visible(self, viewport):
+        """Return the node indexes in order whose cells touch viewport (x1, y1, x2, y2).
+
+        One more cell on each side of the area is included, for the arrows
+        and labels a node draws beyond its own cell.
+        """
+        x1, y1, x2, y2 = viewport
+        per_row = self.per_row
+        columns = index_range(per_row, self.left, self.pitch, x1, x2)
+        indexes = []
+        for row in index_range(self.rows, self.top, self.row_pitch, y1, y2):
+            first = row * per_row
+            if row % 2:
+                # Cells of odd rows are numbered from the right
+                last = first + per_row
+                row_indexes = range(last - columns.stop, last - columns.start)
+            else:
+                row_indexes = range(first + columns.start, first + columns.stop)
+            indexes.extend(i for i in row_indexes if i < self.count)
+        return indexes
+
+    def blocks(self, columns, rows, viewport=None):
+        """Group the cells into blocks of columns by rows cells, for drawing far zoomed out.
+
+        Returns (column, row, column_stop, row_stop, nodes) for each block
+        holding nodes, only those touching viewport when one is given.
+        """
+        per_row = self.per_row
+        columns = max(1, min(columns, per_row))
+        rows = max(1, rows)
+        column_starts = range(0, per_row, columns)
+        row_starts = range(0, self.rows, rows)
+        if viewport:
+            x1, y1, x2, y2 = viewport
+            column_starts = column_starts[_block_range(len(column_starts), self.left,
+                                                        columns * self.pitch, x1, x2)]
+            row_starts = row_starts[_block_range(len(row_starts), self.top,
+                                                 rows * self.row_pitch, y1, y2)]
+        blocks = []
+        for row in row_starts:
+            row_stop = min(self.rows, row + rows)
+            for column in column_starts:
+                column_stop = min(per_row, column + columns)
+                nodes = self._block_nodes(row, row_stop, column, column_stop)
+                if nodes:
+                    blocks.append((column, row, column_stop, row_stop, nodes))
+        return blocks
+
+    def _block_nodes(self, row, row_stop, column, column_stop):
+        """Number of nodes in the cells column to column_stop - 1 of rows row to row_stop - 1."""
+        # Every row but the last is full
+        full_rows = max(0, min(row_stop, self.count // self.per_row) - row)
+        nodes = full_rows * (column_stop - column)
+        if row + full_rows < row_stop:
+            nodes += self._filled(row + full_rows, column, column_stop)
+        return nodes
+
+    def _filled(self, row, column, column_stop):
+        """Number of nodes in the cells column to column_stop - 1 of a row."""
+        in_row = min(self.per_row, self.count - row * self.per_row)
+        if in_row <= 0:
+            return 0
+        # The last row may be partly filled, from the left or from the right
+        first = 0 if row % 2 == 0 else self.per_row - in_row
+        return max(0, min(column_stop, first + in_row) - max(column, first))
+
+
+def _block_range(count, first, pitch, low, high):
+    """Slice of the blocks first + i * pitch that touch [low, high]."""
+    indexes = index_range(count, first, pitch, low, high)
+    return slice(indexes.start, indexes.stop)
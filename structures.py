@@ -1,5 +1,163 @@
+import gc
+from collections import deque
+
 from nodes import *
 
+
+# How many recent changes a tree remembers for changes_since()
+TREE_CHANGE_LOG = 64
+
+
+def _link_nodes(node_class, values):
+    """Build a chain of nodes from values and return its first and last node."""
+    head = tail = None
+    # Allocating millions of nodes would otherwise trigger many useless GC passes
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for data in values:
+            node = node_class(data)
+            if tail is None:
+                head = node
+            else:
+                tail.next = node
+                if node_class is DoubleNode:
+                    node.prev = tail
+            tail = node
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return head, tail
+
+
+def _tree_snapshot(root):
+    """Return the tree as a pre-order list of (data, has_left, has_right)."""
+    result = []
+    stack = [root] if root else []
+    while stack:
+        node = stack.pop()
+        result.append((node.data, node.left is not None, node.right is not None))
+        if node.right:
+            stack.append(node.right)
+        if node.left:
+            stack.append(node.left)
+    return result
+
+
+def _record_tree_change(tree, node):
+    """Note that the children of node changed; None stands for the whole tree."""
+    tree.version += 1
+    tree._changes.append((tree.version, node))
+
+
+def _tree_changes_since(tree, version):
+    """Return the nodes whose children changed after version, or None if unknown."""
+    if version == tree.version:
+        return []
+    if not tree._changes or tree._changes[0][0] > version + 1:
+        return None
+    changed = []
+    for change_version, node in tree._changes:
+        if change_version > version:
+            if node is None:
+                return None
+            changed.append(node)
+    return changed
+
+
+def _subtree_height(node):
+    """Return the height of the subtree rooted at node, 0 for None."""
+    return node.height if node else 0
+
+
+def _tree_fix_heights(tree, node):
+    """Update the subtree heights from node up to the root after its children changed.
+
+    Stops at the first ancestor whose height stays the same, so this costs
+    at most one node-to-root path.
+    """
+    while node is not None:
+        height = 1 + max(_subtree_height(node.left), _subtree_height(node.right))
+        if height == node.height:
+            break
+        node.height = height
+        node = node.parent
+    tree.height = _subtree_height(tree.root)
+
+
+def _tree_set_heights(tree):
+    """Recompute the subtree height of every node, after changes to many nodes at once."""
+    order = []
+    pending = [tree.root] if tree.root else []
+    while pending:
+        node = pending.pop()
+        order.append(node)
+        pending.extend(child for child in (node.left, node.right) if child)
+    # Children come after their parent in order
+    for node in reversed(order):
+        node.height = 1 + max(_subtree_height(node.left), _subtree_height(node.right))
+    tree.height = _subtree_height(tree.root)
+
+
+def _tree_parent(tree, node):
+    """Return the parent of node in tree, None for the root, or False if node is not in it."""
+    # Following the parent links up to the root checks that node is still in the tree
+    top = node
+    while top.parent is not None:
+        top = top.parent
+    if top is not tree.root:
+        return False
+    return node.parent
+
+
+def _replace_child(tree, parent, node, child):
+    """Put child where node was under parent, None being the root position."""
+    if parent is None:
+        tree.root = child
+        _record_tree_change(tree, None)
+    else:
+        if parent.left is node:
+            parent.left = child
+        else:
+            parent.right = child
+        _record_tree_change(tree, parent)
+    if child is not None:
+        child.parent = parent
+    node.parent = None
+    _tree_fix_heights(tree, parent)
+
+
+def _tree_restore(tree, snapshot):
+    """Rebuild the nodes of tree from a pre-order snapshot."""
+    tree.root = None
+    tree.size = len(snapshot)
+    # Each pending entry is (parent, is_left) waiting for a child
+    pending = []
+    nodes = []
+    for data, has_left, has_right in snapshot:
+        node = TreeNode(data)
+        nodes.append(node)
+        if pending:
+            parent, is_left = pending.pop()
+            if is_left:
+                parent.left = node
+            else:
+                parent.right = node
+            node.parent = parent
+        else:
+            tree.root = node
+        if has_right:
+            pending.append((node, False))
+        if has_left:
+            pending.append((node, True))
+    # Pre-order puts children after their parent
+    for node in reversed(nodes):
+        node.height = 1 + max(_subtree_height(node.left), _subtree_height(node.right))
+    tree.height = _subtree_height(tree.root)
+    _record_tree_change(tree, None)
+    return tree
+
+
 class Stack:
     def __init__(self):
         self.top = None
@@ -13,6 +171,16 @@ class Stack:
         self.size += 1
         return True
 
+    def extend(self, values):
+        """Push every value in order, so the last one ends up on top."""
+        top, bottom = _link_nodes(Node, reversed(values))
+        if top is None:
+            return True
+        bottom.next = self.top
+        self.top = top
+        self.size += len(values)
+        return True
+
     def pop(self):
         if self.is_empty():
             return None
@@ -48,6 +216,18 @@ class Stack:
             current = current.next
         return nodes
 
+    def snapshot(self):
+        """Return the values from top to bottom as a plain list."""
+        return [node.data for node in self.get_nodes()]
+
+    @classmethod
+    def restore(cls, snapshot):
+        """Create a stack from a list produced by snapshot()."""
+        stack = cls()
+        stack.top, _ = _link_nodes(Node, snapshot)
+        stack.size = len(snapshot)
+        return stack
+
 
 class Queue:
     def __init__(self):
@@ -66,6 +246,19 @@ class Queue:
         self.size += 1
         return True
 
+    def extend(self, values):
+        """Enqueue every value in order."""
+        head, tail = _link_nodes(Node, values)
+        if head is None:
+            return True
+        if self.is_empty():
+            self.front = head
+        else:
+            self.rear.next = head
+        self.rear = tail
+        self.size += len(values)
+        return True
+
     def dequeue(self):
         if self.is_empty():
             return None
@@ -103,6 +296,18 @@ class Queue:
             current = current.next
         return nodes
 
+    def snapshot(self):
+        """Return the values from front to rear as a plain list."""
+        return [node.data for node in self.get_nodes()]
+
+    @classmethod
+    def restore(cls, snapshot):
+        """Create a queue from a list produced by snapshot()."""
+        queue = cls()
+        queue.front, queue.rear = _link_nodes(Node, snapshot)
+        queue.size = len(snapshot)
+        return queue
+
 
 class SinglyLinkedList:
     def __init__(self):
@@ -130,6 +335,21 @@ class SinglyLinkedList:
         self.size += 1
         return True
 
+    def extend(self, values):
+        """Insert every value at the end, walking to the tail only once."""
+        head, _ = _link_nodes(Node, values)
+        if head is None:
+            return True
+        if not self.head:
+            self.head = head
+        else:
+            current = self.head
+            while current.next:
+                current = current.next
+            current.next = head
+        self.size += len(values)
+        return True
+
     def delete_from_beginning(self):
         if not self.head:
             return None
@@ -158,6 +378,31 @@ class SinglyLinkedList:
         self.size -= 1
         return current.data
 
+    def insert_after(self, node, data):
+        """Insert data right after node, which must be in the list."""
+        new_node = Node(data)
+        new_node.next = node.next
+        node.next = new_node
+        self.size += 1
+        return True
+
+    def delete_node(self, node):
+        """Delete node from the list and return its data, or None if it is not in it.
+
+        Only the node before it is looked for, by identity: a singly linked
+        node does not know its predecessor.
+        """
+        if node is self.head:
+            return self.delete_from_beginning()
+        previous = self.head
+        while previous and previous.next is not node:
+            previous = previous.next
+        if previous is None:
+            return None
+        previous.next = node.next
+        self.size -= 1
+        return node.data
+
     def search(self, value):
         current = self.head
         position = 0
@@ -177,6 +422,18 @@ class SinglyLinkedList:
             current = current.next
         return nodes
 
+    def snapshot(self):
+        """Return the values from head to tail as a plain list."""
+        return [node.data for node in self.get_nodes()]
+
+    @classmethod
+    def restore(cls, snapshot):
+        """Create a list from a list produced by snapshot()."""
+        linked_list = cls()
+        linked_list.head, _ = _link_nodes(Node, snapshot)
+        linked_list.size = len(snapshot)
+        return linked_list
+
 
 class CircularLinkedList:
     def __init__(self):
@@ -212,6 +469,22 @@ class CircularLinkedList:
         self.size += 1
         return True
 
+    def extend(self, values):
+        """Insert every value at the end, walking to the tail only once."""
+        head, tail = _link_nodes(Node, values)
+        if head is None:
+            return True
+        if not self.head:
+            self.head = head
+        else:
+            current = self.head
+            while current.next != self.head:
+                current = current.next
+            current.next = head
+        tail.next = self.head
+        self.size += len(values)
+        return True
+
     def delete_from_beginning(self):
         if not self.head:
             return None
@@ -252,6 +525,29 @@ class CircularLinkedList:
         self.size -= 1
         return current.data
 
+    def insert_after(self, node, data):
+        """Insert data right after node, which must be in the list."""
+        new_node = Node(data)
+        new_node.next = node.next
+        node.next = new_node
+        self.size += 1
+        return True
+
+    def delete_node(self, node):
+        """Delete node from the list and return its data, or None if it is not in it."""
+        if not self.head:
+            return None
+        if node is self.head:
+            return self.delete_from_beginning()
+        previous = self.head
+        while previous.next is not node:
+            previous = previous.next
+            if previous is self.head:
+                return None  # Went round without meeting node
+        previous.next = node.next
+        self.size -= 1
+        return node.data
+
     def search(self, value):
         if not self.head:
             return -1
@@ -300,6 +596,20 @@ class CircularLinkedList:
 
         return nodes
 
+    def snapshot(self):
+        """Return the values starting at the head as a plain list."""
+        return [node.data for node in self.get_nodes()]
+
+    @classmethod
+    def restore(cls, snapshot):
+        """Create a list from a list produced by snapshot()."""
+        linked_list = cls()
+        linked_list.head, tail = _link_nodes(Node, snapshot)
+        if tail:
+            tail.next = linked_list.head
+        linked_list.size = len(snapshot)
+        return linked_list
+
 
 class DoublyLinkedList:
     def __init__(self):
@@ -331,6 +641,20 @@ class DoublyLinkedList:
         self.size += 1
         return True
 
+    def extend(self, values):
+        """Insert every value at the end."""
+        head, tail = _link_nodes(DoubleNode, values)
+        if head is None:
+            return True
+        if not self.head:
+            self.head = head
+        else:
+            self.tail.next = head
+            head.prev = self.tail
+        self.tail = tail
+        self.size += len(values)
+        return True
+
     def insert_at_position(self, position, data):
         if position < 0 or position > self.size:
             return False
@@ -402,6 +726,29 @@ class DoublyLinkedList:
         self.size -= 1
         return current.data
 
+    def insert_after(self, node, data):
+        """Insert data right after node, which must be in the list."""
+        if node is self.tail:
+            return self.insert_at_end(data)
+        new_node = DoubleNode(data)
+        new_node.prev = node
+        new_node.next = node.next
+        node.next.prev = new_node
+        node.next = new_node
+        self.size += 1
+        return True
+
+    def delete_node(self, node):
+        """Delete node, which must be in the list, and return its data."""
+        if node is self.head:
+            return self.delete_from_beginning()
+        if node is self.tail:
+            return self.delete_from_end()
+        node.prev.next = node.next
+        node.next.prev = node.prev
+        self.size -= 1
+        return node.data
+
     def search(self, value):
         current = self.head
         position = 0
@@ -421,12 +768,26 @@ class DoublyLinkedList:
             current = current.next
         return nodes
 
+    def snapshot(self):
+        """Return the values from head to tail as a plain list."""
+        return [node.data for node in self.get_nodes()]
+
+    @classmethod
+    def restore(cls, snapshot):
+        """Create a list from a list produced by snapshot()."""
+        linked_list = cls()
+        linked_list.head, linked_list.tail = _link_nodes(DoubleNode, snapshot)
+        linked_list.size = len(snapshot)
+        return linked_list
+
 
 class BinaryTree:
     def __init__(self):
         self.root = None
         self.size = 0
         self.height = 0
+        self.version = 0  # Incremented by every change to the nodes
+        self._changes = deque(maxlen=TREE_CHANGE_LOG)  # (version, node) as in changes_since()
 
     def insert(self, parent_value, data, is_left=True):
         """
@@ -437,6 +798,7 @@ class BinaryTree:
             self.root = TreeNode(data)
             self.size += 1
             self.height = 1
+            _record_tree_change(self, None)
             return True
 
         # Find the parent node
@@ -444,7 +806,13 @@ class BinaryTree:
         if not parent:
             return False
 
-        # Create and insert the new node
+        return self.insert_child(parent, data, is_left)
+
+    def insert_child(self, parent, data, is_left=True):
+        """Insert data as the left or right child of parent, a node of the tree.
+
+        Returns False when parent already has that child.
+        """
         new_node = TreeNode(data)
         if is_left:
             if parent.left:
@@ -454,9 +822,11 @@ class BinaryTree:
             if parent.right:
                 return False  # Right child already exists
             parent.right = new_node
+        new_node.parent = parent
 
         self.size += 1
-        self._update_height()
+        _tree_fix_heights(self, parent)
+        _record_tree_change(self, parent)
         return True
 
     def _find_node(self, node, value):
@@ -472,6 +842,47 @@ class BinaryTree:
 
         return self._find_node(node.right, value)
 
+    def extend(self, values):
+        """Fill the free child slots in level order with the given values."""
+        values = iter(values)
+        if not self.root:
+            for data in values:
+                self.root = TreeNode(data)
+                self.size = 1
+                break
+            else:
+                return True
+
+        # Nodes that still have a free child slot, in level order
+        open_nodes = []
+        level = [self.root]
+        while level:
+            next_level = []
+            for node in level:
+                if not node.left or not node.right:
+                    open_nodes.append(node)
+                next_level.extend(child for child in (node.left, node.right) if child)
+            level = next_level
+
+        index = 0
+        for data in values:
+            parent = open_nodes[index]
+            new_node = TreeNode(data)
+            if not parent.left:
+                parent.left = new_node
+                if parent.right:
+                    index += 1
+            else:
+                parent.right = new_node
+                index += 1
+            new_node.parent = parent
+            open_nodes.append(new_node)
+            self.size += 1
+
+        self._update_height()
+        _record_tree_change(self, None)
+        return True
+
     def delete(self, value):
         """Delete a node with the given value."""
         if not self.root:
@@ -479,56 +890,38 @@ class BinaryTree:
 
         # Special case: deleting the root
         if self.root.data == value:
-            if not self.root.left and not self.root.right:
-                self.root = None
-            elif not self.root.right:
-                self.root = self.root.left
-            elif not self.root.left:
-                self.root = self.root.right
-            else:
-                # Root has two children, this is more complex
-                # For simplicity, we're not handling this case in this example
+            parent = None
+            node_to_delete = self.root
+        else:
+            # Find the parent of the node to delete
+            parent = self._find_parent(self.root, value)
+            if not parent:
                 return False
+            if parent.left and parent.left.data == value:
+                node_to_delete = parent.left
+            else:
+                node_to_delete = parent.right
 
-            self.size -= 1
-            self._update_height()
-            return True
-
-        # Find the parent of the node to delete
-        parent = self._find_parent(self.root, value)
-        if not parent:
+        if node_to_delete.left and node_to_delete.right:
+            # Node has two children, this is more complex
+            # For simplicity, we're not handling this case in this example
             return False
 
-        # Determine which child to delete
-        if parent.left and parent.left.data == value:
-            node_to_delete = parent.left
-            if not node_to_delete.left and not node_to_delete.right:
-                parent.left = None
-            elif not node_to_delete.right:
-                parent.left = node_to_delete.left
-            elif not node_to_delete.left:
-                parent.left = node_to_delete.right
-            else:
-                # Node has two children, this is more complex
-                # For simplicity, we're not handling this case in this example
-                return False
-        elif parent.right and parent.right.data == value:
-            node_to_delete = parent.right
-            if not node_to_delete.left and not node_to_delete.right:
-                parent.right = None
-            elif not node_to_delete.right:
-                parent.right = node_to_delete.left
-            elif not node_to_delete.left:
-                parent.right = node_to_delete.right
-            else:
-                # Node has two children, this is more complex
-                # For simplicity, we're not handling this case in this example
-                return False
-        else:
-            return False
+        _replace_child(self, parent, node_to_delete, node_to_delete.left or node_to_delete.right)
+        self.size -= 1
+        return True
+
+    def delete_node(self, node):
+        """Delete node itself rather than the first node holding its value.
 
+        As with delete(), nodes with two children are not deleted; returns
+        False for those and for nodes that are not in the tree.
+        """
+        parent = _tree_parent(self, node)
+        if parent is False or (node.left and node.right):
+            return False
+        _replace_child(self, parent, node, node.left or node.right)
         self.size -= 1
-        self._update_height()
         return True
 
     def _find_parent(self, node, value):
@@ -549,23 +942,20 @@ class BinaryTree:
         """Search for a node with the given value."""
         return bool(self._find_node(self.root, value))
 
-    def _update_height(self):
-        """Update the height of the tree."""
-        if not self.root:
-            self.height = 0
-            return
-
-        self.height = self._height(self.root)
-
-    def _height(self, node):
-        """Calculate the height of a subtree."""
-        if not node:
-            return 0
-
-        left_height = self._height(node.left)
-        right_height = self._height(node.right)
+    def find(self, value):
+        """Return the first node holding value in preorder, or None."""
+        # Iterative so that degenerate (list-like) trees do not hit the recursion limit
+        pending = [self.root] if self.root else []
+        while pending:
+            node = pending.pop()
+            if node.data == value:
+                return node
+            pending.extend(child for child in (node.right, node.left) if child)
+        return None
 
-        return max(left_height, right_height) + 1
+    def _update_height(self):
+        """Update the height of the tree and of every subtree."""
+        _tree_set_heights(self)
 
     def get_nodes_by_level(self):
         """Return a dictionary of nodes by level for visualization."""
@@ -589,12 +979,32 @@ class BinaryTree:
         self._get_nodes_by_level(node.left, level + 1, result)
         self._get_nodes_by_level(node.right, level + 1, result)
 
+    def changes_since(self, version):
+        """Return the nodes whose children changed after the given version.
+
+        None means the changes are not known node by node, because the
+        root was replaced, many nodes changed at once or the version is
+        older than the last TREE_CHANGE_LOG changes.
+        """
+        return _tree_changes_since(self, version)
+
+    def snapshot(self):
+        """Return the tree shape and values as a pre-order list."""
+        return _tree_snapshot(self.root)
+
+    @classmethod
+    def restore(cls, snapshot):
+        """Create a tree from a list produced by snapshot()."""
+        return _tree_restore(cls(), snapshot)
+
 
 class BinarySearchTree:
     def __init__(self):
         self.root = None
         self.size = 0
         self.height = 0
+        self.version = 0  # Incremented by every change to the nodes
+        self._changes = deque(maxlen=TREE_CHANGE_LOG)  # (version, node) as in changes_since()
 
     def insert(self, data):
         """Insert a node with the given value."""
@@ -602,36 +1012,69 @@ class BinarySearchTree:
             self.root = TreeNode(data)
             self.size += 1
             self.height = 1
+            _record_tree_change(self, None)
             return True
 
-        self._insert_recursive(self.root, data)
-        self._update_height()
+        new_node = TreeNode(data)
+        node = self.root
+        while True:
+            if data < node.data:
+                if node.left is None:
+                    node.left = new_node
+                    break
+                node = node.left
+            else:  # data >= node.data
+                if node.right is None:
+                    node.right = new_node
+                    break
+                node = node.right
+        new_node.parent = node
+
+        self.size += 1
+        # Only the heights on the path back up to the root can change
+        _tree_fix_heights(self, node)
+        _record_tree_change(self, node)
         return True
 
-    def _insert_recursive(self, node, data):
-        """Helper method to recursively insert a value."""
-        if data < node.data:
-            if node.left is None:
-                node.left = TreeNode(data)
-                self.size += 1
-            else:
-                self._insert_recursive(node.left, data)
-        else:  # data >= node.data
-            if node.right is None:
-                node.right = TreeNode(data)
-                self.size += 1
-            else:
-                self._insert_recursive(node.right, data)
+    def extend(self, values):
+        """Insert every value, updating the height once at the end.
+
+        Values go in in the order given, as with insert(), so sorted values
+        build a chain and cost O(n²) steps in all; shuffle them first for a
+        tree of logarithmic height.
+        """
+        for data in values:
+            new_node = TreeNode(data)
+            self.size += 1
+            if not self.root:
+                self.root = new_node
+                continue
+
+            node = self.root
+            while True:
+                if data < node.data:
+                    if node.left is None:
+                        node.left = new_node
+                        break
+                    node = node.left
+                else:  # data >= node.data
+                    if node.right is None:
+                        node.right = new_node
+                        break
+                    node = node.right
+            new_node.parent = node
+
+        self._update_height()
+        _record_tree_change(self, None)
+        return True
 
     def delete(self, data):
         """Delete a node with the given value."""
         if not self.root:
             return False
 
-        result = self._delete_recursive(self.root, None, data)
-        if result:
-            self._update_height()
-        return result
+        # _remove() updates the heights along the path above the removed node
+        return self._delete_recursive(self.root, None, data)
 
     def _delete_recursive(self, node, parent, data):
         """Helper method to recursively delete a value."""
@@ -643,59 +1086,56 @@ class BinarySearchTree:
         elif data > node.data:
             return self._delete_recursive(node.right, node, data)
         else:  # Found the node to delete
-            # Case 1: Node has no children
-            if not node.left and not node.right:
-                if parent:
-                    if parent.left == node:
-                        parent.left = None
-                    else:
-                        parent.right = None
-                else:  # Deleting the root
-                    self.root = None
-
-            # Case 2: Node has only right child
-            elif not node.left:
-                if parent:
-                    if parent.left == node:
-                        parent.left = node.right
-                    else:
-                        parent.right = node.right
-                else:  # Deleting the root
-                    self.root = node.right
-
-            # Case 3: Node has only left child
-            elif not node.right:
-                if parent:
-                    if parent.left == node:
-                        parent.left = node.left
-                    else:
-                        parent.right = node.left
-                else:  # Deleting the root
-                    self.root = node.left
-
-            # Case 4: Node has two children
-            else:
-                # Find the in-order successor (smallest value in right subtree)
-                successor = self._find_min(node.right)
-                node.data = successor.data  # Copy successor data to this node
+            self._remove(node, parent)
+            return True
 
-                # Delete the successor
-                self._delete_recursive(node.right, node, successor.data)
+    def _remove(self, node, parent):
+        """Take node out from under parent (None for the root), keeping the search order."""
+        if node.left and node.right:
+            # Two children: move the in-order successor's value here and remove the successor,
+            # the smallest node of the right subtree, which has no left child
+            successor_parent = node
+            successor = node.right
+            while successor.left:
+                successor_parent, successor = successor, successor.left
+            node.data = successor.data
+            _replace_child(self, successor_parent, successor, successor.right)
+        else:
+            # Zero or one child, which takes the node's place
+            _replace_child(self, parent, node, node.left or node.right)
+        self.size -= 1
 
-            self.size -= 1
-            return True
+    def delete_node(self, node):
+        """Delete node itself, also when other nodes hold the same value.
 
-    def _find_min(self, node):
-        """Find the node with the minimum value in a subtree."""
-        current = node
-        while current.left:
-            current = current.left
-        return current
+        Its parent is found by following node.data down from the root, so
+        this costs one root-to-node path. Returns False if node is not in the tree.
+        """
+        parent = None
+        current = self.root
+        while current is not None and current is not node:
+            parent = current
+            current = current.left if node.data < current.data else current.right
+        if current is None:
+            return False
+        self._remove(node, parent)
+        return True
 
     def search(self, data):
         """Search for a node with the given value."""
         return self._search_recursive(self.root, data)
 
+    def search_path(self, data):
+        """Return the nodes a search for data visits, ending with the one holding it if any."""
+        path = []
+        node = self.root
+        while node:
+            path.append(node)
+            if data == node.data:
+                break
+            node = node.left if data < node.data else node.right
+        return path
+
     def _search_recursive(self, node, data):
         """Helper method to recursively search for a value."""
         if not node:
@@ -709,22 +1149,8 @@ class BinarySearchTree:
             return self._search_recursive(node.right, data)
 
     def _update_height(self):
-        """Update the height of the tree."""
-        if not self.root:
-            self.height = 0
-            return
-
-        self.height = self._height(self.root)
-
-    def _height(self, node):
-        """Calculate the height of a subtree."""
-        if not node:
-            return 0
-
-        left_height = self._height(node.left)
-        right_height = self._height(node.right)
-
-        return max(left_height, right_height) + 1
+        """Update the height of the tree and of every subtree."""
+        _tree_set_heights(self)
 
     def get_nodes_by_level(self):
         """Return a dictionary of nodes by level for visualization."""
@@ -747,3 +1173,21 @@ class BinarySearchTree:
 
         self._get_nodes_by_level(node.left, level + 1, result)
         self._get_nodes_by_level(node.right, level + 1, result)
+
+    def changes_since(self, version):
+        """Return the nodes whose children changed after the given version.
+
+        None means the changes are not known node by node, because the
+        root was replaced, many nodes changed at once or the version is
+        older than the last TREE_CHANGE_LOG changes.
+        """
+        return _tree_changes_since(self, version)
+
+    def snapshot(self):
+        """Return the tree shape and values as a pre-order list."""
+        return _tree_snapshot(self.root)
+
+    @classmethod
+    def restore(cls, snapshot):
+        """Create a tree from a list produced by snapshot()."""
+        return _tree_restore(cls(), snapshot)
@@ -0,0 +1,144 @@
+from xml.sax.saxutils import escape, quoteattr
+
+from scene import DEFAULT_FONT
+
+# Extra space around the drawing so nothing touches the image border
+MARGIN = 20
+
+TEXT_ANCHORS = {
+    "center": ("middle", "central"),
+    "n": ("middle", "hanging"),
+    "s": ("middle", "text-after-edge"),
+    "e": ("end", "central"),
+    "w": ("start", "central"),
+    "ne": ("end", "hanging"),
+    "nw": ("start", "hanging"),
+    "se": ("end", "text-after-edge"),
+    "sw": ("start", "text-after-edge"),
+}
+
+
+def scene_size(scene):
+    """Return (x, y, width, height) of the area to export.
+
+    It covers the drawing area the layout was made for and grows to include
+    anything the layout placed outside of it.
+    """
+    x1, y1, x2, y2 = 0, 0, scene.width, scene.height
+    bbox = scene.bbox()
+    if bbox:
+        x1 = min(x1, bbox[0] - MARGIN)
+        y1 = min(y1, bbox[1] - MARGIN)
+        x2 = max(x2, bbox[2] + MARGIN)
+        y2 = max(y2, bbox[3] + MARGIN)
+
+    # Text anchored at its right or left edge extends away from its point
+    for item in scene.items:
+        if item.kind == "text" and item.options.get("anchor") in ("e", "w"):
+            size = (item.options.get("font") or DEFAULT_FONT)[1]
+            extent = len(item.options.get("text", "")) * size
+            if item.options["anchor"] == "e":
+                x1 = min(x1, item.coords[0] - extent - MARGIN)
+            else:
+                x2 = max(x2, item.coords[0] + extent + MARGIN)
+    return x1, y1, x2 - x1, y2 - y1
+
+
+def _number(value):
+    return f"{value:.2f}".rstrip("0").rstrip(".")
+
+
+def _font_attributes(font):
+    family, size, *styles = font or DEFAULT_FONT
+    attributes = f'font-family={quoteattr(family + ", sans-serif")} font-size="{size}pt"'
+    if "bold" in styles:
+        attributes += ' font-weight="bold"'
+    if "italic" in styles:
+        attributes += ' font-style="italic"'
+    return attributes
+
+
+def _marker_id(color, markers):
+    if color not in markers:
+        markers[color] = f"arrow{len(markers)}"
+    return markers[color]
+
+
+def _line_element(item, markers):
+    options = item.options
+    color = options.get("fill", "black")
+    points = " ".join(_number(value) for value in item.coords)
+    attributes = (f'points="{points}" fill="none" stroke={quoteattr(color)} '
+                  f'stroke-width="{_number(options.get("width", 1))}"')
+    if options.get("dash"):
+        attributes += f' stroke-dasharray="{" ".join(str(d) for d in options["dash"])}"'
+
+    arrow = options.get("arrow")
+    if arrow in ("last", "both"):
+        attributes += f' marker-end="url(#{_marker_id(color, markers)})"'
+    if arrow in ("first", "both"):
+        attributes += f' marker-start="url(#{_marker_id(color, markers)})"'
+    return f"<polyline {attributes}/>"
+
+
+def _shape_element(item):
+    options = item.options
+    x1, y1, x2, y2 = item.coords
+    x1, x2 = min(x1, x2), max(x1, x2)
+    y1, y2 = min(y1, y2), max(y1, y2)
+    paint = (f'fill={quoteattr(options.get("fill") or "none")} '
+             f'stroke={quoteattr(options.get("outline", "black"))} '
+             f'stroke-width="{_number(options.get("width", 1))}"')
+
+    if item.kind == "rectangle":
+        return (f'<rect x="{_number(x1)}" y="{_number(y1)}" width="{_number(x2 - x1)}" '
+                f'height="{_number(y2 - y1)}" {paint}/>')
+    return (f'<ellipse cx="{_number((x1 + x2) / 2)}" cy="{_number((y1 + y2) / 2)}" '
+            f'rx="{_number((x2 - x1) / 2)}" ry="{_number((y2 - y1) / 2)}" {paint}/>')
+
+
+def _text_element(item):
+    options = item.options
+    x, y = item.coords
+    text_anchor, baseline = TEXT_ANCHORS[options.get("anchor", "center")]
+    return (f'<text x="{_number(x)}" y="{_number(y)}" text-anchor="{text_anchor}" '
+            f'dominant-baseline="{baseline}" fill={quoteattr(options.get("fill", "black"))} '
+            f'{_font_attributes(options.get("font"))}>{escape(options.get("text", ""))}</text>')
+
+
+def scene_to_svg(scene):
+    """Return the scene as an SVG document."""
+    markers = {}
+    elements = []
+    for item in scene.items:
+        if item.kind == "line":
+            elements.append(_line_element(item, markers))
+        elif item.kind == "text":
+            elements.append(_text_element(item))
+        else:
+            elements.append(_shape_element(item))
+
+    x, y, width, height = scene_size(scene)
+    definitions = "".join(
+        f'<marker id="{marker}" viewBox="0 0 10 10" refX="10" refY="5" markerWidth="8" '
+        f'markerHeight="8" orient="auto-start-reverse" markerUnits="userSpaceOnUse">'
+        f'<path d="M 0 0 L 10 5 L 0 10 z" fill={quoteattr(color)}/></marker>'
+        for color, marker in markers.items())
+
+    return "\n".join([
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{_number(width)}" '
+        f'height="{_number(height)}" viewBox="{_number(x)} {_number(y)} '
+        f'{_number(width)} {_number(height)}">',
+        f"<defs>{definitions}</defs>",
+        f'<rect x="{_number(x)}" y="{_number(y)}" width="{_number(width)}" '
+        f'height="{_number(height)}" fill="white"/>',
+        *elements,
+        "</svg>",
+        "",
+    ])
+
+
+def write_svg(scene, file_path):
+    with open(file_path, 'w', encoding='utf-8') as file:
+        file.write(scene_to_svg(scene))
@@ -0,0 +1,84 @@
+import itertools
+
+
+class FakeCanvas:
+    """In-memory stand-in for the part of tk.Canvas the renderers use.
+
+    Items are [kind, coords, options, tags]; item ids and tags can be used
+    wherever Tk accepts a tag or id.
+    """
+
+    def __init__(self):
+        self.items = {}
+        self.calls = 0
+        self._ids = itertools.count(1)
+
+    def _matching(self, tag_or_id):
+        if isinstance(tag_or_id, int):
+            return [tag_or_id] if tag_or_id in self.items else []
+        if tag_or_id == "all":
+            return list(self.items)
+        return [item_id for item_id, item in self.items.items() if tag_or_id in item[3]]
+
+    def _create(self, kind, coords, options):
+        self.calls += 1
+        options = dict(options)
+        tags = options.pop("tags", ())
+        if isinstance(tags, str):
+            tags = (tags,)
+        item_id = next(self._ids)
+        self.items[item_id] = [kind, list(coords), options, set(tags)]
+        return item_id
+
+    def create_rectangle(self, *coords, **options):
+        return self._create("rectangle", coords, options)
+
+    def create_oval(self, *coords, **options):
+        return self._create("oval", coords, options)
+
+    def create_line(self, *coords, **options):
+        return self._create("line", coords, options)
+
+    def create_text(self, *coords, **options):
+        return self._create("text", coords, options)
+
+    def itemconfigure(self, tag_or_id, **options):
+        self.calls += 1
+        for item_id in self._matching(tag_or_id):
+            item = self.items[item_id]
+            if "tags" in options:
+                tags = options["tags"]
+                item[3] = {tags} if isinstance(tags, str) else set(tags)
+            item[2].update((name, value) for name, value in options.items() if name != "tags")
+
+    def coords(self, item_id, *coords):
+        self.calls += 1
+        self.items[item_id][1] = list(coords)
+
+    def delete(self, tag_or_id):
+        self.calls += 1
+        for item_id in self._matching(tag_or_id):
+            del self.items[item_id]
+
+    def move(self, tag_or_id, dx, dy):
+        self.calls += 1
+        for item_id in self._matching(tag_or_id):
+            item = self.items[item_id]
+            item[1] = [value + (dx if i % 2 == 0 else dy) for i, value in enumerate(item[1])]
+
+    def scale(self, tag_or_id, x, y, scale_x, scale_y):
+        self.calls += 1
+        for item_id in self._matching(tag_or_id):
+            item = self.items[item_id]
+            item[1] = [(value - x) * scale_x + x if i % 2 == 0 else (value - y) * scale_y + y
+                       for i, value in enumerate(item[1])]
+
+    def tag_lower(self, tag_or_id):
+        self.calls += 1
+
+    def tag_raise(self, tag_or_id):
+        self.calls += 1
+
+    def shown(self):
+        """The visible items as (kind, coords, options), options without Tk's defaults."""
+        return [item for item in self.items.values() if item[2].get("state") != "hidden"]
@@ -0,0 +1,114 @@
+import random
+
+from canvas_backend import CanvasRenderer, HIGHLIGHT_STYLES, _RESET_OPTIONS, node_tag
+from layouts import layout_doubly_linked_list
+from structures import DoublyLinkedList
+
+from fake_canvas import FakeCanvas
+
+
+def _visible_state(canvas):
+    """What the canvas shows, with options at their reset value left out."""
+    state = []
+    for kind, coords, options, _ in canvas.items.values():
+        if options.get("state") == "hidden":
+            continue
+        resets = _RESET_OPTIONS[kind]
+        options = {name: value for name, value in options.items()
+                   if name != "state" and resets.get(name) != value}
+        state.append((kind, tuple(round(value, 6) for value in coords), repr(sorted(options.items()))))
+    return sorted(state)
+
+
+def _scene_state(scene, renderer):
+    state = []
+    for primitive in scene.items:
+        kind = primitive.kind
+        options = dict(primitive.options)
+        if kind in ("rectangle", "oval") and isinstance(primitive.key, tuple):
+            options.update(renderer._overrides.get(primitive.key[0], {}))
+        resets = _RESET_OPTIONS[kind]
+        options = {name: value for name, value in options.items() if resets.get(name) != value}
+        state.append((kind, tuple(round(value * renderer.zoom, 6) for value in primitive.coords),
+                      repr(sorted(options.items()))))
+    return sorted(state)
+
+
+def _list_with_scene(count):
+    structure = DoublyLinkedList()
+    structure.extend(range(count))
+    nodes = structure.get_nodes()
+    return structure, nodes, layout_doubly_linked_list(structure, 1000, 600, None, nodes)
+
+
+def test_clearing_a_highlight_restores_the_node_look():
+    _, nodes, scene = _list_with_scene(5)
+    canvas = FakeCanvas()
+    renderer = CanvasRenderer(canvas)
+    renderer.render(scene)
+    before = _visible_state(canvas)
+    node = id(nodes[2])
+
+    for name in HIGHLIGHT_STYLES:
+        renderer.set_highlight(name, [node])
+        item = next(item for item in canvas.items.values() if node_tag(node) in item[3])
+        for option, value in HIGHLIGHT_STYLES[name].items():
+            assert item[2][option] == value
+        renderer.set_highlight(name, [])
+        assert _visible_state(canvas) == before
+
+    # A redraw after the highlight went away leaves nothing behind either
+    renderer.set_highlight("search", [node])
+    renderer.render(scene)
+    renderer.set_highlight("search", [])
+    renderer.render(scene)
+    assert _visible_state(canvas) == before
+
+
+def test_renders_with_highlights_match_the_scene():
+    rng = random.Random(7)
+    for pool in (True, False):
+        structure, nodes, scene = _list_with_scene(30)
+        canvas = FakeCanvas()
+        renderer = CanvasRenderer(canvas, pool=pool)
+        for _ in range(60):
+            action = rng.random()
+            if action < 0.3:
+                structure.insert_at_beginning(rng.randint(0, 9))
+            elif action < 0.5 and structure.size > 1:
+                structure.delete_from_beginning()
+            nodes = structure.get_nodes()
+            name = rng.choice(list(HIGHLIGHT_STYLES))
+            renderer.set_highlight(name, [id(node) for node in rng.sample(nodes, rng.randint(0, 3))])
+            scene = layout_doubly_linked_list(structure, 1000, 600, None, nodes)
+            renderer.render(scene)
+            assert _visible_state(canvas) == _scene_state(scene, renderer)
+
+
+def test_highlights_set_during_a_sliced_render_reach_later_slices():
+    structure, nodes, scene = _list_with_scene(200)
+    canvas = FakeCanvas()
+    renderer = CanvasRenderer(canvas)
+    renderer.start(scene, (0, 0))
+    assert not renderer.step(0)  # One slice, nearest nodes first
+    last = id(nodes[-1])
+    renderer.set_highlight("search", [last])
+    while not renderer.step(0):
+        pass
+    item = next(item for item in canvas.items.values() if node_tag(last) in item[3])
+    assert item[2]["fill"] == HIGHLIGHT_STYLES["search"]["fill"]
+    assert _visible_state(canvas) == _scene_state(scene, renderer)
+
+    # Items already on the canvas with changes still pending keep the new look too
+    rng = random.Random(11)
+    for _ in range(20):
+        structure.insert_at_beginning(rng.randint(0, 9))
+        nodes = structure.get_nodes()
+        scene = layout_doubly_linked_list(structure, 1000, 600, None, nodes)
+        renderer.start(scene, (0, 0))
+        renderer.step(0)
+        name = rng.choice(list(HIGHLIGHT_STYLES))
+        renderer.set_highlight(name, [id(node) for node in rng.sample(nodes, 5)])
+        while not renderer.step(0):
+            pass
+        assert _visible_state(canvas) == _scene_state(scene, renderer)
@@ -0,0 +1,93 @@
+import pickle
+import random
+
+import pytest
+
+import structures
+from file_index import MetadataIndex
+from file_manager import FileManager
+
+STRUCTURE_TYPES = {
+    "Stack": structures.Stack,
+    "Queue": structures.Queue,
+    "Singly Linked List": structures.SinglyLinkedList,
+    "Circular Linked List": structures.CircularLinkedList,
+    "Doubly Linked List": structures.DoublyLinkedList,
+    "Binary Search Tree": structures.BinarySearchTree,
+}
+
+
+def _save(path, structure, structure_type):
+    metadata = FileManager.describe(structure, structure_type)
+    FileManager.write_structure(str(path), metadata, structure.snapshot())
+
+
+@pytest.mark.parametrize("structure_type", sorted(STRUCTURE_TYPES))
+def test_saved_structures_load_back(tmp_path, monkeypatch, structure_type):
+    # Several chunks, the last one partial
+    monkeypatch.setattr("file_manager.CHUNK_SIZE", 7)
+    structure = STRUCTURE_TYPES[structure_type]()
+    structure.extend(random.Random(1).sample(range(1000), 30))
+    path = tmp_path / "saved.dsv"
+    _save(path, structure, structure_type)
+
+    progress = []
+    loaded_type, loaded = FileManager.read_structure(str(path), progress.append)
+    assert loaded_type == structure_type
+    assert type(loaded) is type(structure)
+    assert loaded.snapshot() == structure.snapshot()
+    assert progress[-1] == 1.0
+
+    header = FileManager.peek(str(path))
+    assert header["type"] == structure_type
+    assert header["count"] == len(structure.snapshot())
+    assert header["value_type"] == "int"
+
+
+def test_empty_structures_load_back(tmp_path):
+    path = tmp_path / "empty.dsv"
+    _save(path, structures.Stack(), "Stack")
+    assert FileManager.read_structure(str(path))[1].snapshot() == []
+
+
+def test_corrupted_payload_is_detected(tmp_path):
+    structure = structures.Queue()
+    structure.extend(range(100))
+    path = tmp_path / "saved.dsv"
+    _save(path, structure, "Queue")
+    data = bytearray(path.read_bytes())
+    data[-3] ^= 0xFF
+    path.write_bytes(bytes(data))
+    with pytest.raises(ValueError, match="checksum"):
+        FileManager.read_structure(str(path))
+
+
+def test_index_reuses_headers_of_unchanged_files(tmp_path, monkeypatch):
+    structure = structures.Stack()
+    structure.extend(range(5))
+    path = tmp_path / "saved.dsv"
+    _save(path, structure, "Stack")
+    index = MetadataIndex(str(tmp_path / "index.json"))
+    assert [header["count"] for _, header in index.scan(str(tmp_path))] == [5]
+
+    peeks = []
+    monkeypatch.setattr(FileManager, "peek", staticmethod(lambda file_path: peeks.append(file_path)))
+    assert MetadataIndex(str(tmp_path / "index.json")).get(str(path))["count"] == 5
+    assert peeks == []
+
+
+def test_legacy_files_are_peeked_without_unpickling(tmp_path, monkeypatch):
+    structure = structures.BinarySearchTree()
+    structure.extend([5, 3, 8])
+    path = tmp_path / "old.dsv"
+    path.write_bytes(pickle.dumps({"type": "Binary Search Tree", "data": pickle.dumps(structure)}))
+
+    with monkeypatch.context() as patch:
+        patch.setattr(pickle, "load", None)
+        header = FileManager.peek(str(path))
+    assert header["legacy"] and header["type"] is None and header["count"] is None
+    assert header["created"] == path.stat().st_mtime
+
+    loaded_type, loaded = FileManager.read_structure(str(path))
+    assert loaded_type == "Binary Search Tree"
+    assert loaded.snapshot() == structure.snapshot()
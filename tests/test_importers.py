@@ -0,0 +1,61 @@
+import json
+import threading
+
+import pytest
+
+from file_manager import OperationCancelled
+from importers import convert_batch, convert_value, read_values
+
+
+def test_int_conversion_rejects_fractions():
+    assert convert_value("7", "int") == 7
+    assert convert_value(3.0, "int") == 3
+    with pytest.raises(ValueError):
+        convert_value(3.9, "int")
+    with pytest.raises(ValueError):
+        convert_value("3.9", "int")
+    assert convert_batch([1, 2.5, "x", 4.0], "int") == ([1, 4], 2)
+
+
+def test_bool_conversion_accepts_only_true_and_false_words():
+    assert convert_batch(["Yes", "no", "T", "0", 1, False], "bool") == (
+        [True, False, True, False, True, False], 0)
+    assert convert_batch(["maybe", "", 2, "true"], "bool") == ([True], 3)
+
+
+def test_reads_csv_and_skips_what_does_not_convert(tmp_path):
+    path = tmp_path / "values.csv"
+    path.write_text("value,other\n1,2\n3, 4\n\n5,\n", encoding="utf-8")
+    assert read_values(str(path), "int") == ([1, 2, 3, 4, 5], 2)
+
+
+def test_reads_json_lines(tmp_path):
+    path = tmp_path / "values.jsonl"
+    lines = [1, [2, 3], {"a": 4, "b": 5.0}, 6.5, "", "7"]
+    path.write_text("\n".join(json.dumps(line) if line != "" else "" for line in lines),
+                    encoding="utf-8")
+    assert read_values(str(path), "int") == ([1, 2, 3, 4, 5, 7], 1)
+
+
+def test_malformed_json_lines_are_skipped(tmp_path):
+    path = tmp_path / "values.jsonl"
+    path.write_text('1\n{"a": 2\n[3, 4]\nnot json\n5\n', encoding="utf-8")
+    assert read_values(str(path), "str") == (["1", "3", "4", "5"], 2)
+
+
+def test_reads_text_lines_with_progress(tmp_path):
+    path = tmp_path / "values.txt"
+    path.write_text("a\n\n b \nc\n", encoding="utf-8")
+    progress = []
+    assert read_values(str(path), "str", progress.append) == (["a", "b", "c"], 0)
+    assert progress[-1] == 1.0
+
+
+def test_cancelling_stops_the_import(tmp_path, monkeypatch):
+    monkeypatch.setattr("importers.BATCH_SIZE", 2)
+    path = tmp_path / "values.txt"
+    path.write_text("\n".join(map(str, range(10))), encoding="utf-8")
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(OperationCancelled):
+        read_values(str(path), "int", cancel_event=cancel)
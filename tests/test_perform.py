@@ -0,0 +1,42 @@
+import types
+
+import structures
+from ui_components import StructureFrame
+
+
+def _frame(structure):
+    """Stand-in with the state StructureFrame.perform() uses, without Tk."""
+    frame = types.SimpleNamespace(structure=structure, recorder=None, version=0,
+                                  animate_changes=True, _animate_next=False,
+                                  selected=object(), highlighted={"search": [1]}, cleared=0)
+
+    def clear_highlights():
+        frame.cleared += 1
+        frame.highlighted = {}
+
+    frame.clear_highlights = clear_highlights
+    return frame
+
+
+def test_failed_operations_keep_the_selection_and_version():
+    frame = _frame(structures.BinarySearchTree())
+    assert StructureFrame.perform(frame, "delete", 5) is False
+    assert StructureFrame.perform(frame, "delete_node", structures.TreeNode(5)) is False
+    assert frame.version == 0 and frame.selected is not None and frame.cleared == 0
+
+
+def test_changes_drop_the_selection_and_highlights():
+    frame = _frame(structures.SinglyLinkedList())
+    assert StructureFrame.perform(frame, "insert_at_end", 1)
+    assert frame.version == 1 and frame.selected is None and frame.cleared == 1
+    assert frame._animate_next
+
+
+def test_rotations_count_only_with_several_nodes():
+    frame = _frame(structures.CircularLinkedList())
+    frame.structure.extend([1])
+    StructureFrame.perform(frame, "rotate_left")
+    assert frame.version == 0
+    frame.structure.extend([2])
+    StructureFrame.perform(frame, "rotate_left")
+    assert frame.version == 1
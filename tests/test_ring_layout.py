@@ -0,0 +1,55 @@
+import math
+
+import pytest
+
+import ring_layout
+from ring_layout import fits_on_circle, ring_arrows, ring_positions
+
+
+def test_nodes_that_fit_are_spread_over_one_circle():
+    xs, ys = ring_positions(12, 300, 200, 100, 40, 60)
+    assert fits_on_circle(12, 100, 40)
+    assert (xs[0], ys[0]) == pytest.approx((300, 100))
+    # Clockwise: the second node is right of the first
+    assert xs[1] > xs[0]
+    for x, y in zip(xs, ys):
+        assert math.hypot(x - 300, y - 200) == pytest.approx(100)
+    steps = [math.hypot(xs[i + 1] - xs[i], ys[i + 1] - ys[i]) for i in range(11)]
+    assert max(steps) == pytest.approx(min(steps))
+
+
+def test_nodes_that_do_not_fit_follow_a_spiral():
+    count, radius, pitch, gap = 500, 100, 40, 60
+    xs, ys = ring_positions(count, 0, 0, radius, pitch, gap)
+    assert not fits_on_circle(count, radius, pitch)
+    radii = [math.hypot(x, y) for x, y in zip(xs, ys)]
+    assert radii[0] == pytest.approx(radius)
+    assert all(a < b for a, b in zip(radii, radii[1:]))
+    # Successive nodes are about an arc of pitch apart, and no two nodes overlap
+    for i in range(count - 1):
+        assert math.hypot(xs[i + 1] - xs[i], ys[i + 1] - ys[i]) == pytest.approx(pitch, rel=0.05)
+    for i in range(0, count, 7):
+        for j in range(i + 1, count):
+            assert math.hypot(xs[j] - xs[i], ys[j] - ys[i]) > 0.9 * min(pitch, gap)
+
+
+def test_arrows_run_between_the_box_edges():
+    xs, ys = ring_positions(8, 0, 0, 100, 40, 60)
+    x1, y1, x2, y2, nxs, nys = ring_arrows(xs, ys, 20, 10)
+    for i in range(8):
+        j = (i + 1) % 8
+        # Each end is on the edge of its box, along the line between the centres
+        for x, y, cx, cy in ((x1[i], y1[i], xs[i], ys[i]), (x2[i], y2[i], xs[j], ys[j])):
+            assert max(abs(x - cx) / 20, abs(y - cy) / 10) == pytest.approx(1)
+        assert math.hypot(nxs[i], nys[i]) == pytest.approx(1)
+    assert ring_arrows([5, 5], [5, 5], 20, 10)[4] == [0.0, 0.0]
+
+
+def test_without_numpy_the_result_is_the_same(monkeypatch):
+    pytest.importorskip("numpy")
+    with_numpy = ring_positions(300, 10, 20, 100, 40, 60)
+    arrows = ring_arrows(*with_numpy, 20, 10)
+    monkeypatch.setattr(ring_layout, "np", None)
+    for got, expected in zip(ring_positions(300, 10, 20, 100, 40, 60) + ring_arrows(*with_numpy, 20, 10),
+                             with_numpy + arrows):
+        assert got == pytest.approx(expected)
@@ -0,0 +1,55 @@
+import random
+
+from serpentine_layout import Serpentine, index_range
+
+
+def test_successive_nodes_stay_next_to_each_other():
+    grid = Serpentine(103, 10, 20, 50, 80, 520)
+    assert grid.per_row == 10 and grid.rows == 11
+    cells = [grid.position(i) for i in range(grid.count)]
+    assert len({(x, y) for x, y, _ in cells}) == grid.count
+    for i in range(grid.count - 1):
+        (x, y, direction), (next_x, next_y, _) = cells[i], cells[i + 1]
+        if grid.turns_after(i):
+            assert (next_x, next_y) == (x, y + 80)
+        else:
+            assert (next_x, next_y) == (x + direction * 50, y)
+
+
+def test_visible_lists_the_cells_in_the_viewport():
+    rng = random.Random(4)
+    grid = Serpentine(1000, 0, 0, 40, 60, 900)
+    for _ in range(200):
+        x1, y1 = rng.uniform(-200, 1000), rng.uniform(-200, 10000)
+        viewport = (x1, y1, x1 + rng.uniform(0, 500), y1 + rng.uniform(0, 500))
+        visible = grid.visible(viewport)
+        rows = [i // grid.per_row for i in visible]
+        assert len(set(visible)) == len(visible) and rows == sorted(rows)
+        shown = set(visible)
+        for i in range(grid.count):
+            x, y, _ = grid.position(i)
+            if viewport[0] <= x <= viewport[2] and viewport[1] <= y <= viewport[3]:
+                assert i in shown
+            if i in shown:
+                assert viewport[0] - 2 * 40 <= x <= viewport[2] + 2 * 40
+                assert viewport[1] - 2 * 60 <= y <= viewport[3] + 2 * 60
+
+
+def test_blocks_count_every_node_once():
+    for count in (1, 7, 100, 1001):
+        grid = Serpentine(count, 0, 0, 40, 60, 1000)
+        blocks = grid.blocks(4, 3)
+        assert sum(block[4] for block in blocks) == count
+        in_view = grid.blocks(4, 3, (0, 0, 300, 300))
+        assert sum(block[4] for block in in_view) <= count
+
+
+def test_index_range_covers_the_interval_widened_by_one_pitch():
+    for first, pitch in ((0, 10), (100, -10), (3, 7), (-50, -4)):
+        for low, high in ((55, 75), (-20, 5), (0, 0), (200, 260)):
+            indexes = index_range(20, first, pitch, low, high)
+            positions = [first + i * pitch for i in indexes]
+            wanted = [i for i in range(20) if low - abs(pitch) <= first + i * pitch <= high + abs(pitch)]
+            assert set(wanted) <= set(indexes)
+            assert all(low - 2 * abs(pitch) <= x <= high + 2 * abs(pitch) for x in positions)
+    assert len(index_range(3, 0, 10, 500, 600)) == 0
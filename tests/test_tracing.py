@@ -0,0 +1,82 @@
+import random
+
+import structures
+import tracing
+from tracing import TraceRecorder, read_trace, replay, resolve_nodes, start_structure
+
+
+def _perform(recorder, structure, operation, *args):
+    """Record and run an operation the way StructureFrame.perform does."""
+    recorder.record(operation, args, structure)
+    return getattr(structure, operation)(*args)
+
+
+def test_replay_starts_from_the_recorded_contents(tmp_path):
+    rng = random.Random(3)
+    structure = structures.DoublyLinkedList()
+    structure.extend(range(20))
+    path = tmp_path / "trace.jsonl"
+    recorder = TraceRecorder(str(path), "Doubly Linked List", structure)
+    for step in range(60):
+        nodes = structure.get_nodes()
+        if nodes and step % 3 == 0:
+            _perform(recorder, structure, "delete_node", rng.choice(nodes))
+        elif nodes and step % 3 == 1:
+            _perform(recorder, structure, "insert_after", rng.choice(nodes), 100 + step)
+        else:
+            _perform(recorder, structure, "insert_at_beginning", 200 + step)
+    recorder.close()
+
+    header, events = read_trace(str(path))
+    assert len(events) == 60
+    replayed = start_structure(header)
+    for event in events:
+        getattr(replayed, event["op"])(*resolve_nodes(replayed, event["args"]))
+    assert replayed.snapshot() == structure.snapshot()
+
+    latencies, _ = replay(header, events, repeat=2)
+    assert sum(map(len, latencies.values())) == 120
+
+
+def test_tree_traces_replay_on_the_same_shape(tmp_path):
+    values = random.Random(5).sample(range(100), 40)
+    structure = structures.BinarySearchTree()
+    structure.extend(values)
+    path = tmp_path / "trace.jsonl"
+    recorder = TraceRecorder(str(path), "Binary Search Tree", structure)
+    for value in values[::4]:
+        _perform(recorder, structure, "delete_node", structure.search_path(value)[-1])
+    _perform(recorder, structure, "insert", 50)
+    recorder.close()
+
+    header, events = read_trace(str(path))
+    replayed = start_structure(header)
+    for event in events:
+        getattr(replayed, event["op"])(*resolve_nodes(replayed, event["args"]))
+    assert replayed.snapshot() == structure.snapshot()
+
+
+def test_node_indexes_are_listed_once_per_version(tmp_path, monkeypatch):
+    structure = structures.SinglyLinkedList()
+    structure.extend(range(50))
+    recorder = TraceRecorder(str(tmp_path / "trace.jsonl"), "Singly Linked List", structure)
+    listed = []
+    all_nodes = tracing._all_nodes
+    monkeypatch.setattr(tracing, "_all_nodes", lambda structure: listed.append(1) or all_nodes(structure))
+
+    nodes = structure.get_nodes()
+    for node in nodes[::5]:
+        recorder.record("insert_after", [node, 0], structure, 0)
+    assert len(listed) == 1
+    structure.delete_node(nodes[0])
+    recorder.record("delete_node", [nodes[10]], structure, 1)
+    recorder.close()
+    assert len(listed) == 2
+
+    _, events = read_trace(str(tmp_path / "trace.jsonl"))
+    assert [event["args"][0] for event in events] == [{"node": i} for i in range(0, 50, 5)] + [{"node": 9}]
+
+
+def test_traces_without_a_snapshot_start_empty():
+    header = {"trace": 1, "type": "Stack", "class": "Stack"}
+    assert start_structure(header).snapshot() == []
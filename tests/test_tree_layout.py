@@ -0,0 +1,135 @@
+import random
+
+import pytest
+
+import structures
+from tree_layout import SEPARATION, TidyTreeLayout, layout_for
+
+
+def _positions(layout):
+    """Return {id(node): (depth, x)} of every node of a layout."""
+    levels, _ = layout.levels()
+    return {id(node): (depth, x)
+            for depth, level in enumerate(levels) for node, x, _, _ in level}
+
+
+def _check_tidy(layout):
+    levels, truncated = layout.levels()
+    assert not truncated
+    for level in levels:
+        xs = sorted(x for _, x, _, _ in level)
+        assert all(b - a >= SEPARATION - 1e-9 for a, b in zip(xs, xs[1:]))
+        for node, x, parent, parent_x in level:
+            if parent is not None:
+                assert (x < parent_x) == (parent.left is node)
+
+
+def _check_links(tree):
+    """Check the parent links and subtree heights the tree keeps up to date."""
+    def height(node):
+        if node is None:
+            return 0
+        assert node.height == 1 + max(height(node.left), height(node.right))
+        for child in (node.left, node.right):
+            assert child is None or child.parent is node
+        return node.height
+
+    assert tree.root is None or tree.root.parent is None
+    assert tree.height == height(tree.root)
+
+
+def _random_bst_step(rng, tree):
+    nodes = tree.get_nodes_by_level()
+    nodes = [node for level in nodes.values() for node in level] if nodes else []
+    choice = rng.random()
+    if not nodes or choice < 0.55:
+        tree.insert(rng.randrange(1000))
+    elif choice < 0.8:
+        tree.delete_node(rng.choice(nodes))
+    else:
+        tree.delete(rng.choice(nodes).data)
+
+
+def _random_binary_tree_step(rng, tree):
+    nodes = tree.get_nodes_by_level()
+    nodes = [node for level in nodes.values() for node in level] if nodes else []
+    if not nodes:
+        tree.insert(None, rng.randrange(1000))
+    elif rng.random() < 0.6:
+        tree.insert_child(rng.choice(nodes), rng.randrange(1000), rng.random() < 0.5)
+    elif rng.random() < 0.5:
+        tree.delete_node(rng.choice(nodes))
+    else:
+        tree.delete(rng.choice(nodes).data)
+
+
+@pytest.mark.parametrize("tree_class, step", [
+    (structures.BinarySearchTree, _random_bst_step),
+    (structures.BinaryTree, _random_binary_tree_step),
+])
+def test_incremental_layout_matches_a_full_layout(tree_class, step):
+    rng = random.Random(7)
+    tree = tree_class()
+    layout = None
+    reused = 0
+    for _ in range(400):
+        step(rng, tree)
+        _check_links(tree)
+        previous = layout
+        layout = layout_for(tree, layout)
+        reused += layout is previous
+        full = TidyTreeLayout(tree.root)
+        incremental = _positions(layout)
+        expected = _positions(full)
+        assert incremental.keys() == expected.keys()
+        for key, (depth, x) in expected.items():
+            assert incremental[key][0] == depth
+            assert incremental[key][1] == pytest.approx(x)
+        assert layout.width == pytest.approx(full.width)
+        _check_tidy(layout)
+    # Most steps were laid out incrementally
+    assert reused > 200
+
+
+@pytest.mark.parametrize("tree_class", [structures.BinarySearchTree, structures.BinaryTree])
+def test_restored_and_extended_trees_keep_their_links(tree_class):
+    tree = tree_class()
+    tree.extend(random.Random(3).sample(range(1000), 200))
+    _check_links(tree)
+    _check_links(tree_class.restore(tree.snapshot()))
+
+
+def test_removed_nodes_are_not_deleted_again():
+    tree = structures.BinaryTree()
+    tree.extend(range(7))
+    leaf = tree.find(6)
+    assert tree.delete_node(leaf)
+    assert not tree.delete_node(leaf)
+    assert tree.size == 6
+
+
+def test_deletes_update_the_height_without_walking_the_tree(monkeypatch):
+    tree = structures.BinarySearchTree()
+    values = random.Random(4).sample(range(1000), 300)
+    tree.extend(values)
+    monkeypatch.setattr(structures, "_tree_set_heights", None)
+    for value in values[:150]:
+        assert tree.delete(value)
+        _check_links(tree)
+    for value in values[150:250]:
+        assert tree.delete_node(tree.search_path(value)[-1])
+        _check_links(tree)
+
+
+def test_levels_cull_by_position_and_budget():
+    tree = structures.BinarySearchTree()
+    tree.extend(random.Random(2).sample(range(10000), 500))
+    layout = layout_for(tree)
+    x1, x2 = layout.width * 0.25, layout.width * 0.5
+    levels, _ = layout.levels(x1, x2)
+    shown = {id(node) for level in levels for node, _, _, _ in level}
+    everything = _positions(layout)
+    assert shown == {key for key, (_, x) in everything.items() if x1 <= x <= x2}
+
+    levels, truncated = layout.levels(budget=20)
+    assert truncated and sum(map(len, levels)) <= 20
@@ -0,0 +1,141 @@
+# Widths of the labels the layouts draw, measured once per font and text.
+#
+# The layouts size node boxes to the values in them and cut values that do
+# not fit short with an ellipsis, so they need the width of each label in
+# its font. Asking Tk for one is a round trip to the font engine, too slow
+# to repeat for every node on every redraw, so a width is kept once it is
+# known and scrolling, zooming or animating measure nothing new. Fonts are
+# the unscaled font tuples of the scene, or None for the default font: the
+# renderers scale text with the zoom, so widths at zoom 1 hold at any zoom.
+#
+# Without a Tk window to ask, e.g. in the headless exports, widths are
+# estimated from the font size.
+
+import heapq
+import itertools
+
+from scene import DEFAULT_FONT, POINTS_TO_PIXELS
+
+ELLIPSIS = "…"
+
+# Average character width of the estimates, as a share of the font size
+CHAR_WIDTH = 0.6
+BOLD_CHAR_WIDTH = 0.65
+
+# Widths kept before the oldest half of them is forgotten
+CACHE_LIMIT = 200000
+
+# Longest labels widest() measures; labels with fewer characters are taken to be narrower
+WIDEST_SAMPLE = 32
+
+
+def estimate_width(text, font):
+    """Width in pixels of text in font, from its size and number of characters."""
+    family, size, *styles = font or DEFAULT_FONT
+    share = BOLD_CHAR_WIDTH if "bold" in styles else CHAR_WIDTH
+    # Negative Tk font sizes are in pixels already
+    pixels = -size if size < 0 else size * POINTS_TO_PIXELS
+    return len(text) * pixels * share
+
+
+class _TkMeasure:
+    """Measure text with the fonts of a Tk application."""
+
+    def __init__(self, root):
+        import tkinter.font
+
+        self.root = root
+        self.tk_font = tkinter.font
+        self.fonts = {}  # font tuple -> tkinter.font.Font, kept alive so Tk keeps it
+
+    def __call__(self, text, font):
+        tk_font = self.fonts.get(font)
+        if tk_font is None:
+            if font is None:
+                tk_font = self.tk_font.nametofont("TkDefaultFont", root=self.root)
+            else:
+                tk_font = self.tk_font.Font(root=self.root, font=font)
+            self.fonts[font] = tk_font
+        return tk_font.measure(text)
+
+
+class TextMetrics:
+    """Label widths in pixels, measured on first use and then kept.
+
+    measure(text, font) returns the width of one label; it is only called
+    for labels not seen before, counted in measurements.
+    """
+
+    def __init__(self, measure=estimate_width, limit=CACHE_LIMIT):
+        self.measure = measure
+        self.limit = limit
+        self.measurements = 0
+        self._widths = {}  # (font, text) -> width
+        self._fits = {}  # (font, text, max_width) -> text as fit() shortens it
+        self._widest = {}  # font -> (source, width) of the last widest() call
+
+    def use_widget(self, widget):
+        """Measure with the fonts of widget's Tk application from now on."""
+        root = widget.nametowidget(".")
+        if getattr(self.measure, "root", None) is not root:
+            self.measure = _TkMeasure(root)
+            self.clear()
+
+    def clear(self):
+        self._widths.clear()
+        self._fits.clear()
+        self._widest.clear()
+
+    def _keep(self, cache, key, value):
+        if len(cache) >= self.limit:
+            # Dictionaries keep insertion order, so these are the oldest entries
+            for old in list(itertools.islice(cache, self.limit // 2)):
+                del cache[old]
+        cache[key] = value
+        return value
+
+    def width(self, text, font=None):
+        """Return the width of text drawn in font."""
+        width = self._widths.get((font, text))
+        if width is None:
+            self.measurements += 1
+            width = self._keep(self._widths, (font, text), self.measure(text, font))
+        return width
+
+    def fit(self, text, font, max_width):
+        """Return text, or the longest start of it that fits in max_width with an ellipsis."""
+        key = (font, text, max_width)
+        fitted = self._fits.get(key)
+        if fitted is not None:
+            return fitted
+        if self.width(text, font) <= max_width:
+            return self._keep(self._fits, key, text)
+        # Binary search for the longest start that still fits
+        low, high = 0, len(text) - 1
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self.width(text[:middle] + ELLIPSIS, font) <= max_width:
+                low = middle
+            else:
+                high = middle - 1
+        return self._keep(self._fits, key, text[:low] + ELLIPSIS)
+
+    def widest(self, source, font, texts):
+        """Return the width of the widest label of texts() in font.
+
+        source stands for the labels, e.g. the node list they come from: as
+        long as the same source is passed again, the last result is returned
+        without calling texts(). Only the WIDEST_SAMPLE labels with the most
+        characters are measured.
+        """
+        last = self._widest.get(font)
+        if last is not None and last[0] is source:
+            return last[1]
+        longest = heapq.nlargest(WIDEST_SAMPLE, set(texts()), key=len)
+        width = max((self.width(text, font) for text in longest), default=0)
+        self._widest[font] = (source, width)
+        return width
+
+
+# Shared by all layouts; frames switch it to Tk's fonts, see use_widget()
+METRICS = TextMetrics()
@@ -0,0 +1,245 @@
+import argparse
+import json
+import sys
+import time
+
+import structures
+from nodes import Node
+
+
+TRACE_FILE_TYPES = [("Operation Traces", "*.jsonl"), ("All Files", "*.*")]
+
+# Events handled per after() tick when a GUI replay runs as fast as possible
+REPLAY_BATCH = 500
+
+
+def _all_nodes(structure):
+    """Return every node of structure in an order that only depends on its shape."""
+    if hasattr(structure, "get_nodes"):
+        return structure.get_nodes()
+    nodes = []
+    pending = [structure.root] if structure.root else []
+    while pending:
+        node = pending.pop()
+        nodes.append(node)
+        pending.extend(child for child in (node.right, node.left) if child)
+    return nodes
+
+
+def node_reference(structure, node):
+    """Return the JSON form of a node argument: {"node": its index in _all_nodes()}."""
+    for index, candidate in enumerate(_all_nodes(structure)):
+        if candidate is node:
+            return {"node": index}
+    raise ValueError("node is not in the structure")
+
+
+def _is_reference(arg):
+    return isinstance(arg, dict) and "node" in arg
+
+
+def resolve_nodes(structure, args):
+    """Return args with the node references of a trace replaced by the nodes of structure."""
+    if not any(_is_reference(arg) for arg in args):
+        return args
+    nodes = _all_nodes(structure)
+    return [nodes[arg["node"]] if _is_reference(arg) else arg for arg in args]
+
+
+class TraceRecorder:
+    """Write every structure operation with its arguments to a JSON Lines file.
+
+    The first line is a header naming the structure and holding its
+    snapshot() when recording started; each following line is
+    {"t": seconds since recording started, "op": method name, "args": [...]}.
+    Node arguments are written as node_reference()s, so record() needs the
+    structure before the operation runs. Given the version of its node
+    order, as StructureFrame.version, the indexes are looked up in a map
+    built once per version instead of listing the nodes for every node.
+    """
+
+    def __init__(self, file_path, structure_type, structure):
+        self.file_path = file_path
+        self.file = open(file_path, 'w', encoding='utf-8')
+        self.start = time.perf_counter()
+        self.file.write(json.dumps({"trace": 1, "type": structure_type,
+                                    "class": type(structure).__name__,
+                                    "started": time.time(),
+                                    "snapshot": structure.snapshot()}) + "\n")
+        self._indexes = (None, None, {})  # (structure, version, {id(node): index})
+
+    def _reference(self, structure, version, node):
+        """node_reference() from the index map of structure at version."""
+        if version is None:
+            return node_reference(structure, node)
+        cached_structure, cached_version, indexes = self._indexes
+        if cached_structure is not structure or cached_version != version:
+            indexes = {id(candidate): index for index, candidate in enumerate(_all_nodes(structure))}
+            self._indexes = (structure, version, indexes)
+        if id(node) not in indexes:
+            raise ValueError("node is not in the structure")
+        return {"node": indexes[id(node)]}
+
+    def record(self, operation, args, structure=None, version=None):
+        args = [self._reference(structure, version, arg) if isinstance(arg, Node) else arg
+                for arg in args]
+        event = {"t": round(time.perf_counter() - self.start, 6), "op": operation,
+                 "args": args}
+        self.file.write(json.dumps(event) + "\n")
+
+    def close(self):
+        self.file.close()
+
+
+def read_trace(file_path):
+    """Return (header, events) of a trace written by TraceRecorder."""
+    with open(file_path, 'r', encoding='utf-8') as file:
+        header = json.loads(file.readline())
+        if header.get("trace") != 1:
+            raise ValueError(f"{file_path} is not an operation trace")
+        events = [json.loads(line) for line in file if line.strip()]
+    return header, events
+
+
+def start_structure(header):
+    """Return a new structure holding what the traced one held when recording started.
+
+    Traces written before headers carried a snapshot start from an empty structure.
+    """
+    structure_class = getattr(structures, header["class"])
+    snapshot = header.get("snapshot")
+    return structure_class.restore(snapshot) if snapshot else structure_class()
+
+
+def replay(header, events, repeat=1):
+    """Run the events against the starting structure without Tk, as fast as possible.
+
+    Returns (latencies, elapsed): latencies maps each operation name to the
+    list of its call durations in seconds, elapsed is the wall time of the
+    operations, leaving out rebuilding the starting structure for each run.
+    """
+    calls = [(event["op"], event["args"], any(_is_reference(arg) for arg in event["args"]))
+             for event in events]
+    latencies = {}
+    clock = time.perf_counter
+
+    elapsed = 0.0
+    for _ in range(repeat):
+        structure = start_structure(header)
+        start = clock()
+        for operation, args, refers_to_nodes in calls:
+            method = getattr(structure, operation)
+            if refers_to_nodes:
+                args = resolve_nodes(structure, args)
+            before = clock()
+            method(*args)
+            latencies.setdefault(operation, []).append(clock() - before)
+        elapsed += clock() - start
+    return latencies, elapsed
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def format_report(latencies, elapsed):
+    """Return a text table with throughput and latency percentiles per operation."""
+    total = sum(len(values) for values in latencies.values())
+    lines = [f"{total} operations in {elapsed:.3f} s "
+             f"({total / elapsed if elapsed else 0:,.0f} ops/sec)",
+             "",
+             f"{'operation':<22}{'count':>9}{'ops/sec':>13}{'p50 us':>10}"
+             f"{'p90 us':>10}{'p99 us':>10}{'max us':>11}"]
+    for operation, values in sorted(latencies.items()):
+        values = sorted(values)
+        busy = sum(values)
+        lines.append(f"{operation:<22}{len(values):>9}"
+                     f"{len(values) / busy if busy else 0:>13,.0f}"
+                     f"{percentile(values, 0.50) * 1e6:>10.1f}"
+                     f"{percentile(values, 0.90) * 1e6:>10.1f}"
+                     f"{percentile(values, 0.99) * 1e6:>10.1f}"
+                     f"{values[-1] * 1e6:>11.1f}")
+    return "\n".join(lines)
+
+
+class TracePlayer:
+    """Replay a trace in a StructureFrame, scheduling operations with after().
+
+    The frame should hold the trace's start_structure().
+
+    speed scales the recorded timing (2 plays twice as fast); with a speed
+    of 0 events run back to back in batches of REPLAY_BATCH per tick.
+    """
+
+    def __init__(self, frame, events, speed=1.0, on_finished=None):
+        self.frame = frame
+        self.events = events
+        self.speed = speed
+        self.on_finished = on_finished
+        self.position = 0
+        self.start = time.perf_counter()
+        self._after_id = None
+        self._tick()
+
+    def stop(self):
+        if self._after_id is not None:
+            self.frame.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _tick(self):
+        self._after_id = None
+        if not self.frame.winfo_exists():
+            return
+
+        if self.speed > 0:
+            elapsed = (time.perf_counter() - self.start) * self.speed
+            end = self.position
+            while end < len(self.events) and self.events[end]["t"] <= elapsed:
+                end += 1
+        else:
+            end = min(self.position + REPLAY_BATCH, len(self.events))
+
+        for event in self.events[self.position:end]:
+            self.frame.perform(event["op"], *resolve_nodes(self.frame.structure, event["args"]))
+        if end > self.position:
+            self.frame.update_info()
+            self.frame.update_visualization()
+        self.position = end
+
+        if self.position >= len(self.events):
+            if self.on_finished:
+                self.on_finished()
+            return
+
+        if self.speed > 0:
+            wait = (self.events[self.position]["t"] / self.speed
+                    - (time.perf_counter() - self.start))
+            delay = max(1, int(wait * 1000))
+        else:
+            delay = 1
+        self._after_id = self.frame.after(delay, self._tick)
+
+
+def main(argv):
+    """Entry point of 'python main.py replay ...'; returns the exit status."""
+    parser = argparse.ArgumentParser(
+        prog="main.py replay",
+        description="Replay an operation trace against the structures without Tk "
+                    "and report throughput and latency per operation.")
+    parser.add_argument("trace", help="trace file recorded from the visualizer")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="run the whole trace this many times (default: 1)")
+    args = parser.parse_args(argv)
+
+    try:
+        header, events = read_trace(args.trace)
+    except (OSError, ValueError) as e:
+        print(f"{args.trace}: {e}", file=sys.stderr)
+        return 1
+
+    latencies, elapsed = replay(header, events, args.repeat)
+    print(f"{header['type']} trace: {args.trace}")
+    print(format_report(latencies, elapsed))
+    return 0
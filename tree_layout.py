@@ -0,0 +1,338 @@
+# Tidy drawing of binary trees in the style of Reingold and Tilford.
+#
+# Every subtree is laid out once, bottom up, relative to its own root. Two
+# sibling subtrees are pushed apart just enough that the right contour of
+# the left one stays SEPARATION away from the left contour of the right
+# one. Contours are followed through the children and, below the end of a
+# shallower subtree, through threads added when the subtrees were joined,
+# so the whole layout takes time linear in the number of nodes.
+#
+# The layout of a subtree only depends on the nodes below it, so after a
+# few nodes gained or lost children only they and their ancestors are laid
+# out again; every other subtree keeps its placement. Absolute positions are
+# never stored: levels() adds up the offsets from the root while it walks
+# the visible part of the tree.
+#
+# Coordinates are in units of one node spacing horizontally and one level
+# vertically; the layouts scale them to pixels.
+
+# Smallest horizontal distance between two nodes of the same level
+SEPARATION = 1.0
+
+
+class _Placement:
+    """What the layout knows about one node and the subtree below it."""
+
+    __slots__ = ("node", "parent", "offset", "thread", "thread_offset", "threaded",
+                 "left_node", "left_offset", "right_node", "right_offset",
+                 "min_x", "max_x", "size", "height")
+
+    def __init__(self, node):
+        # The node is kept alive so that its id() cannot be reused while it is placed
+        self.node = node
+        self.parent = None
+        self.offset = 0.0  # x relative to the parent
+        # Next contour node for a leaf at the bottom of a shallower subtree
+        self.thread = None
+        self.thread_offset = 0.0
+        # Leaf whose thread was set when this node joined its children's subtrees
+        self.threaded = None
+        # Leftmost and rightmost nodes of the deepest level, x relative to this node
+        self.left_node = None
+        self.left_offset = 0.0
+        self.right_node = None
+        self.right_offset = 0.0
+        # Horizontal extent of the subtree relative to this node
+        self.min_x = 0.0
+        self.max_x = 0.0
+        self.size = 1
+        self.height = 0
+
+
+class TidyTreeLayout:
+    """Compact, non-overlapping positions for the nodes of a binary tree.
+
+    A left child is always to the left of its parent and a right child to
+    the right, also when it is the only child.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.placements = {}  # id(node) -> _Placement
+        # Tree and tree version the layout was made for, kept up to date by layout_for()
+        self.tree = None
+        self.version = None
+        if root:
+            for node in self._postorder(root):
+                self._place(node)
+
+    @staticmethod
+    def _postorder(root):
+        """Return the nodes with every node after its children, without recursion."""
+        order = []
+        pending = [root]
+        while pending:
+            node = pending.pop()
+            order.append(node)
+            if node.left:
+                pending.append(node.left)
+            if node.right:
+                pending.append(node.right)
+        order.reverse()
+        return order
+
+    def _next_left(self, node):
+        """Return (next node of the left contour, its x relative to node)."""
+        child = node.left or node.right
+        if child:
+            return child, self.placements[id(child)].offset
+        placement = self.placements[id(node)]
+        return placement.thread, placement.thread_offset
+
+    def _next_right(self, node):
+        """Return (next node of the right contour, its x relative to node)."""
+        child = node.right or node.left
+        if child:
+            return child, self.placements[id(child)].offset
+        placement = self.placements[id(node)]
+        return placement.thread, placement.thread_offset
+
+    def _place(self, node):
+        """Lay out node's subtree, given the layouts of its children's subtrees."""
+        placements = self.placements
+        placement = placements.get(id(node))
+        if placement is None or placement.node is not node:
+            placement = placements[id(node)] = _Placement(node)
+        placement.thread = None
+        placement.threaded = None
+        left, right = node.left, node.right
+
+        if not left and not right:
+            placement.left_node = placement.right_node = node
+            placement.left_offset = placement.right_offset = 0.0
+            placement.min_x = placement.max_x = 0.0
+            placement.size = 1
+            placement.height = 0
+            return
+
+        if not left or not right:
+            child = left or right
+            below = placements[id(child)]
+            below.parent = node
+            below.offset = -SEPARATION / 2 if left else SEPARATION / 2
+            placement.left_node = below.left_node
+            placement.left_offset = below.offset + below.left_offset
+            placement.right_node = below.right_node
+            placement.right_offset = below.offset + below.right_offset
+            placement.min_x = min(0.0, below.offset + below.min_x)
+            placement.max_x = max(0.0, below.offset + below.max_x)
+            placement.size = below.size + 1
+            placement.height = below.height + 1
+            return
+
+        # Follow the facing contours down to the end of the shallower subtree
+        # and find the distance the two children need between them
+        inner_left, inner_left_x = left, 0.0
+        inner_right, inner_right_x = right, 0.0
+        distance = SEPARATION
+        while True:
+            distance = max(distance, inner_left_x - inner_right_x + SEPARATION)
+            next_left, step_left = self._next_right(inner_left)
+            next_right, step_right = self._next_left(inner_right)
+            if next_left is None or next_right is None:
+                break
+            inner_left, inner_left_x = next_left, inner_left_x + step_left
+            inner_right, inner_right_x = next_right, inner_right_x + step_right
+
+        left_placement = placements[id(left)]
+        right_placement = placements[id(right)]
+        left_placement.parent = right_placement.parent = node
+        left_placement.offset = -distance / 2
+        right_placement.offset = distance / 2
+
+        # Outer contours of the joined tree, threaded where one side ends first
+        if next_left is not None:
+            # The left subtree is deeper: the right contour continues into it
+            source = right_placement.right_node
+            source_x = right_placement.offset + right_placement.right_offset
+            target_x = left_placement.offset + inner_left_x + step_left
+            source_placement = placements[id(source)]
+            source_placement.thread = next_left
+            source_placement.thread_offset = target_x - source_x
+            placement.threaded = source
+            deepest = (left_placement, left_placement)
+        elif next_right is not None:
+            # The right subtree is deeper: the left contour continues into it
+            source = left_placement.left_node
+            source_x = left_placement.offset + left_placement.left_offset
+            target_x = right_placement.offset + inner_right_x + step_right
+            source_placement = placements[id(source)]
+            source_placement.thread = next_right
+            source_placement.thread_offset = target_x - source_x
+            placement.threaded = source
+            deepest = (right_placement, right_placement)
+        else:
+            deepest = (left_placement, right_placement)
+
+        placement.left_node = deepest[0].left_node
+        placement.left_offset = deepest[0].offset + deepest[0].left_offset
+        placement.right_node = deepest[1].right_node
+        placement.right_offset = deepest[1].offset + deepest[1].right_offset
+        # A deeper subtree can reach past its sibling on the far side
+        placement.min_x = min(left_placement.offset + left_placement.min_x,
+                              right_placement.offset + right_placement.min_x)
+        placement.max_x = max(left_placement.offset + left_placement.max_x,
+                              right_placement.offset + right_placement.max_x)
+        placement.size = left_placement.size + right_placement.size + 1
+        placement.height = max(left_placement.height, right_placement.height) + 1
+
+    def _placed(self, node):
+        """Return the placement of node if it has one from an earlier layout."""
+        placement = self.placements.get(id(node))
+        if placement is not None and placement.node is node:
+            return placement
+        return None
+
+    def update(self, root, changed):
+        """Lay the tree out again after the children of the changed nodes were replaced.
+
+        changed lists, oldest first, the nodes whose left or right child
+        changed; nodes no longer in the tree may be among them. Only the
+        changed nodes, the subtrees new to the tree and the ancestors of the
+        changed nodes are placed again, deepest first, so the work grows
+        with the height of the tree rather than with its size. Returns
+        False, leaving the layout as it was, when the whole tree has to be
+        laid out again instead.
+        """
+        if root is not self.root or not root:
+            return False
+        placements = self.placements
+        # Placements of removed nodes pile up until a full layout drops them
+        if len(placements) > 2 * placements[id(root)].size + len(changed):
+            return False
+
+        # Attach the children, in the order the changes happened so that a
+        # subtree that moved more than once ends up under its last parent
+        for node in changed:
+            for child in (node.left, node.right):
+                if not child:
+                    continue
+                placement = self._placed(child)
+                if placement is None:
+                    for below in self._postorder(child):
+                        self._place(below)
+                    placement = placements[id(child)]
+                elif placement.parent is not node and placement.parent is not None:
+                    # The threads the old parent added may run through the moved subtree
+                    old_parent = self._placed(placement.parent)
+                    if old_parent is not None and old_parent.threaded is not None:
+                        placements[id(old_parent.threaded)].thread = None
+                placement.parent = node
+
+        # The changed nodes still in the tree and all their ancestors, with their depths
+        spine = {}
+        for node in changed:
+            path = []
+            current = node
+            while current is not root:
+                placement = self._placed(current)
+                parent = placement.parent if placement is not None else None
+                if parent is None or (parent.left is not current and parent.right is not current):
+                    path = None  # Removed from the tree
+                    break
+                path.append(current)
+                current = parent
+            if path is None:
+                continue
+            path.append(root)
+            depth = len(path)
+            for current in path:
+                depth -= 1
+                spine[id(current)] = (depth, current)
+
+        # The threads the spine added cross the subtrees being placed again
+        for _, node in spine.values():
+            threaded = placements[id(node)].threaded
+            if threaded is not None:
+                placements[id(threaded)].thread = None
+        for _, node in sorted(spine.values(), key=lambda entry: -entry[0]):
+            self._place(node)
+        return True
+
+    @property
+    def width(self):
+        """Distance between the leftmost and the rightmost node, in node spacings."""
+        if not self.root:
+            return 0.0
+        placement = self.placements[id(self.root)]
+        return placement.max_x - placement.min_x
+
+    @property
+    def height(self):
+        """Depth of the deepest node."""
+        return self.placements[id(self.root)].height if self.root else 0
+
+    def size_of(self, node):
+        """Number of nodes in the subtree rooted at node."""
+        return self.placements[id(node)].size
+
+    def levels(self, x1=None, x2=None, first_depth=0, last_depth=None, budget=None):
+        """Return the nodes level by level as lists of (node, x, parent, parent_x).
+
+        x is measured from the leftmost node of the tree. Only nodes with x
+        within [x1, x2] and depth within [first_depth, last_depth] are
+        listed; subtrees entirely outside are not visited. When budget is
+        given, levels stop before the one that would take the number of
+        listed nodes past it. Returns (levels, truncated), levels[0] being
+        first_depth and truncated telling whether the budget cut levels off.
+        """
+        if not self.root:
+            return [], False
+        placements = self.placements
+        x1 = float("-inf") if x1 is None else x1
+        x2 = float("inf") if x2 is None else x2
+        root_x = -placements[id(self.root)].min_x
+
+        levels = []
+        listed = 0
+        depth = 0
+        level = [(self.root, root_x, None, None)]
+        while level and (last_depth is None or depth <= last_depth):
+            if depth >= first_depth:
+                shown = [entry for entry in level if x1 <= entry[1] <= x2]
+                if budget is not None and levels and listed + len(shown) > budget:
+                    return levels, True
+                levels.append(shown)
+                listed += len(shown)
+
+            next_level = []
+            for node, x, _, _ in level:
+                for child in (node.left, node.right):
+                    if child:
+                        placement = placements[id(child)]
+                        child_x = x + placement.offset
+                        if child_x + placement.max_x >= x1 and child_x + placement.min_x <= x2:
+                            next_level.append((child, child_x, node, x))
+            level = next_level
+            depth += 1
+        return levels, False
+
+
+def layout_for(tree, layout=None):
+    """Return a TidyTreeLayout of tree, updating layout instead when it was made for tree.
+
+    The layout remembers the tree version it reflects and asks the tree
+    which nodes changed since then, so a single insert or delete only
+    places the nodes along one path from the root again.
+    """
+    if layout is not None and layout.tree is tree:
+        if layout.version == tree.version:
+            return layout
+        changed = tree.changes_since(layout.version)
+        if changed is not None and layout.update(tree.root, changed):
+            layout.version = tree.version
+            return layout
+    layout = TidyTreeLayout(tree.root)
+    layout.tree = tree
+    layout.version = tree.version
+    return layout
@@ -1,18 +1,99 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
+from importers import convert_value
+from layouts import layout_stack, layout_queue, zoom_tier
+from canvas_backend import CanvasRenderer, HIGHLIGHT_STYLES
+import raster_backend
+from render_scheduler import RenderScheduler, FRAME_INTERVAL_MS
+from animation import SceneAnimation, TraversalAnimation
+from minimap import Minimap
+from scene import Scene
+from text_metrics import METRICS
+
+# Milliseconds the canvas size must stay unchanged before the structure is laid out again
+RESIZE_SETTLE_MS = 150
+
+# Pixels drawn beyond each edge of the visible area, so short scrolls reveal finished nodes
+VIEWPORT_MARGIN = 200
+
+# Longest one slice of drawing keeps the event loop busy; the rest follows
+# in later slices, so input stays responsive while a large scene is drawn
+RENDER_SLICE_MS = 10
+
+# Pixels the pointer may move between press and release for a click rather than a drag
+CLICK_SLOP = 4
+
+# Zoom limits and the factor applied by each zoom button press
+MIN_ZOOM = 1 / 64
+MAX_ZOOM = 4
+ZOOM_STEP = 1.25
+WHEEL_ZOOM_STEP = 1.1
+
+# Structures with more nodes than this are painted offscreen into a single
+# image, when Pillow is installed, instead of as one canvas item per shape
+RASTER_NODE_THRESHOLD = 20000
+
+# Structure methods that do not change it, so they keep cached node lists valid
+READ_ONLY_OPERATIONS = {"peek", "search", "is_empty", "get_nodes", "get_nodes_by_level",
+                        "find", "search_path"}
+
+# Changes drawn without animation: bulk loads would send every node flying at once
+UNANIMATED_OPERATIONS = {"extend"}
+
+# Changes that move nodes around without adding or removing any
+RESHAPING_OPERATIONS = {"rotate_left", "rotate_right"}
+
+
+def scene_scroll_region(scene):
+    """Return the layout area a canvas showing scene scrolls over: the drawing area and the scene."""
+    x1, y1, x2, y2 = 0, 0, scene.width, scene.height
+    bbox = scene.bbox()
+    if bbox:
+        x1, y1 = min(x1, bbox[0] - 20), min(y1, bbox[1] - 20)
+        x2, y2 = max(x2, bbox[2] + 20), max(y2, bbox[3] + 20)
+    return x1, y1, x2, y2
 
 
 class StructureFrame(ttk.Frame):
     """Base frame for displaying and interacting with a data structure."""
 
+    # Whether changes move the nodes to their new places instead of jumping there
+    animate_changes = True
+
+    # Whether the layout only draws the visible area, so scrolling must redraw
+    uses_viewport = False
+
+    # Node count above which the frame switches to the offscreen raster renderer
+    raster_threshold = RASTER_NODE_THRESHOLD
+
     def __init__(self, parent, structure_type):
         super().__init__(parent)
         self.parent = parent
         self.structure_type = structure_type
         self.structure = None
         self.data_type = tk.StringVar(value="int")  # Default data type
+        self.recorder = None  # TraceRecorder while a trace is being recorded
+        self.zoom = 1.0
+        self.scroll_region = (0, 0, 0, 0)  # Layout area the canvas can scroll over
+        self.version = 0  # Incremented by every operation that changes the structure
+        self.scene = None  # Scene drawn last, for key_at()
+        self.highlighted = {}  # highlight name -> nodes shown in it, see highlight()
+        self.selected = None  # Node last clicked on the canvas, for the node actions
+        self._press = None  # Pointer position of a button press that may still be a click
+        self.animation = None  # SceneAnimation of the last change, while it runs
+        self._animate_next = False  # Whether the next render() starts an animation
+        self._traversal = None  # (TraversalAnimation, highlight name, then) in progress
+        self._traversal_after_id = None
+        self._cache = {}  # name -> (structure, version, value) for cached()
+        self._resize_after_id = None
+        self._draw_after_id = None  # Next slice of a drawing in progress
+        self._minimap_key = None  # What the minimap was last drawn for, see _update_minimap()
+        self.views = []  # ExtraView windows and panes showing the same structure
 
         self._create_widgets()
+        self.scheduler = RenderScheduler.for_widget(self)
+        # Size the node boxes with the fonts the canvas draws in
+        METRICS.use_widget(self)
 
     def _create_widgets(self):
         # Top control frame
@@ -26,6 +107,20 @@ class StructureFrame(ttk.Frame):
                                        values=data_types, state="readonly", width=10)
         data_type_combo.pack(side=tk.LEFT, padx=5)
 
+        # Zoom controls; far out the layouts switch to a lower level of detail
+        self.zoom_var = tk.StringVar(value="100%")
+        ttk.Button(control_frame, text="Reset Zoom",
+                   command=lambda: self.set_zoom(1.0)).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(control_frame, text="+", width=3,
+                   command=lambda: self.set_zoom(self.zoom * ZOOM_STEP)).pack(side=tk.RIGHT)
+        ttk.Label(control_frame, textvariable=self.zoom_var, width=6,
+                  anchor=tk.CENTER).pack(side=tk.RIGHT)
+        ttk.Button(control_frame, text="-", width=3,
+                   command=lambda: self.set_zoom(self.zoom / ZOOM_STEP)).pack(side=tk.RIGHT)
+        ttk.Label(control_frame, text="Zoom:").pack(side=tk.RIGHT, padx=5)
+        ttk.Button(control_frame, text="Split View",
+                   command=self.add_view).pack(side=tk.RIGHT, padx=5)
+
         # Structure info frame
         self.info_frame = ttk.LabelFrame(self, text=f"{self.structure_type} Information")
         self.info_frame.pack(fill=tk.X, padx=10, pady=5)
@@ -44,9 +139,308 @@ class StructureFrame(ttk.Frame):
         self.viz_frame = ttk.LabelFrame(self, text="Visualization")
         self.viz_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
 
-        # Canvas for drawing the structure
-        self.canvas = tk.Canvas(self.viz_frame, bg="white", bd=2, relief=tk.SUNKEN)
-        self.canvas.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        # Extra views split off with add_view() go into panes beside the canvas
+        self.view_panes = ttk.PanedWindow(self.viz_frame, orient=tk.HORIZONTAL)
+        self.view_panes.grid(row=0, column=0, sticky="nsew")
+        main_view = ttk.Frame(self.view_panes)
+        self.view_panes.add(main_view, weight=1)
+
+        # Canvas for drawing the structure, scrollable when it does not fit
+        self.canvas = tk.Canvas(main_view, bg="white", bd=2, relief=tk.SUNKEN)
+        x_scrollbar = ttk.Scrollbar(main_view, orient=tk.HORIZONTAL, command=self._xview)
+        y_scrollbar = ttk.Scrollbar(main_view, orient=tk.VERTICAL, command=self._yview)
+        self.canvas.configure(xscrollcommand=x_scrollbar.set, yscrollcommand=y_scrollbar.set)
+
+        self.canvas.grid(row=0, column=0, sticky="nsew", padx=(5, 0), pady=(5, 0))
+        y_scrollbar.grid(row=0, column=1, sticky="ns", pady=(5, 0))
+        x_scrollbar.grid(row=1, column=0, sticky="ew", padx=(5, 0))
+        main_view.rowconfigure(0, weight=1)
+        main_view.columnconfigure(0, weight=1)
+
+        # Overview of the whole structure; clicking it jumps the canvas there
+        self.minimap = Minimap(self.viz_frame, self.jump_to)
+        self.minimap.canvas.grid(row=0, column=1, sticky="n", padx=5, pady=(5, 0))
+        self.viz_frame.rowconfigure(0, weight=1)
+        self.viz_frame.columnconfigure(0, weight=1)
+
+        # Updates the canvas items in place instead of redrawing everything
+        self.canvas_renderer = CanvasRenderer(self.canvas)
+        self.raster_renderer = None  # Created the first time a structure is big enough
+        self.renderer = self.canvas_renderer
+        self.canvas.bind("<Configure>", self._on_canvas_resize)
+        self.canvas.bind("<Map>", self._on_canvas_map)
+
+        # Mouse wheel zooms about the pointer and dragging pans the view
+        self.canvas.bind("<MouseWheel>", self._on_mouse_wheel)
+        self.canvas.bind("<Button-4>", self._on_mouse_wheel)
+        self.canvas.bind("<Button-5>", self._on_mouse_wheel)
+        # A press and release without dragging selects the node under the pointer
+        self.canvas.bind("<ButtonPress-1>", self._start_pan)
+        self.canvas.bind("<B1-Motion>", self._pan)
+        self.canvas.bind("<ButtonRelease-1>", self._on_release)
+
+    def _on_canvas_resize(self, event):
+        """Scale the current drawing right away and relayout once the size settles."""
+        self.renderer.resize(event.width, event.height)
+        if self._resize_after_id is not None:
+            self.after_cancel(self._resize_after_id)
+        self._resize_after_id = self.after(RESIZE_SETTLE_MS, self._resize_settled)
+
+    def _resize_settled(self):
+        self._resize_after_id = None
+        self.update_visualization()
+
+    def _on_canvas_map(self, event):
+        # Redraws are skipped while the canvas is not shown
+        self.update_visualization()
+
+    def _xview(self, *args):
+        self.canvas.xview(*args)
+        self._viewport_changed()
+
+    def _yview(self, *args):
+        self.canvas.yview(*args)
+        self._viewport_changed()
+
+    def _on_mouse_wheel(self, event):
+        zoom_in = event.num == 4 or event.delta > 0
+        factor = WHEEL_ZOOM_STEP if zoom_in else 1 / WHEEL_ZOOM_STEP
+        self.set_zoom(self.zoom * factor, event.x, event.y)
+
+    def _start_pan(self, event):
+        self._press = (event.x, event.y)
+        self.canvas.scan_mark(event.x, event.y)
+
+    def _pan(self, event):
+        if self._press is not None:
+            if max(abs(event.x - self._press[0]), abs(event.y - self._press[1])) <= CLICK_SLOP:
+                return
+            self._press = None  # A drag from now on
+        self.canvas.scan_dragto(event.x, event.y, gain=1)
+        self._viewport_changed()
+
+    def _on_release(self, event):
+        if self._press is not None:
+            self._press = None
+            self.select(self.node_at(event.x, event.y))
+
+    def _viewport_changed(self):
+        """Draw the nodes scrolled into view, once per burst of scroll events."""
+        self.minimap.show_view(self.visible_area(0))
+        if self.uses_viewport or self.renderer.view_dependent:
+            self.update_visualization()
+
+    def destroy(self):
+        for view in list(self.views):
+            view.close()
+        for after_id in (self._resize_after_id, self._draw_after_id, self._traversal_after_id):
+            if after_id is not None:
+                self.after_cancel(after_id)
+        self._resize_after_id = self._draw_after_id = self._traversal_after_id = None
+        self.scheduler.cancel(self)
+        super().destroy()
+
+    def set_zoom(self, zoom, x=None, y=None):
+        """Zoom about the canvas window point (x, y), its middle by default.
+
+        What is drawn is scaled in place and scrolled so the point stays put.
+        The structure is laid out again only when the zoom crosses into
+        another level-of-detail tier.
+        """
+        zoom = min(MAX_ZOOM, max(MIN_ZOOM, zoom))
+        if zoom == self.zoom:
+            return
+        if x is None:
+            x, y = self.canvas.winfo_width() / 2, self.canvas.winfo_height() / 2
+
+        # Layout coordinates of the point that has to stay under (x, y)
+        point_x = self.canvas.canvasx(x) / self.zoom
+        point_y = self.canvas.canvasy(y) / self.zoom
+        old_tier = zoom_tier(self.zoom)
+
+        self.zoom = zoom
+        self.zoom_var.set(f"{zoom:.0%}")
+        self.renderer.set_zoom(zoom)
+        self._apply_scroll_region()
+        self._scroll_to(point_x * zoom - x, point_y * zoom - y)
+
+        if zoom_tier(zoom) != old_tier:
+            self.update_visualization()
+        else:
+            self._viewport_changed()
+
+    def _apply_scroll_region(self):
+        x1, y1, x2, y2 = (value * self.zoom for value in self.scroll_region)
+        self.canvas.configure(scrollregion=(x1, y1, x2, y2))
+
+    def _scroll_to(self, left, top):
+        """Scroll so the canvas point (left, top) is at the window's top left corner."""
+        x1, y1, x2, y2 = (value * self.zoom for value in self.scroll_region)
+        if x2 > x1:
+            self.canvas.xview_moveto((left - x1) / (x2 - x1))
+        if y2 > y1:
+            self.canvas.yview_moveto((top - y1) / (y2 - y1))
+
+    def visible_area(self, margin=VIEWPORT_MARGIN):
+        """Return the (x1, y1, x2, y2) layout area in view, widened by margin canvas pixels."""
+        x1 = self.canvas.canvasx(0) - margin
+        y1 = self.canvas.canvasy(0) - margin
+        x2 = self.canvas.canvasx(self.canvas.winfo_width()) + margin
+        y2 = self.canvas.canvasy(self.canvas.winfo_height()) + margin
+        return x1 / self.zoom, y1 / self.zoom, x2 / self.zoom, y2 / self.zoom
+
+    def add_view(self, detached=False, zoom=None, center=None):
+        """Open another view of the structure, in a pane beside the canvas or in its own window.
+
+        It starts at the zoom and around the layout point center given, by
+        default those of the canvas. See ExtraView.
+        """
+        if center is None:
+            x1, y1, x2, y2 = self.visible_area(0)
+            center = ((x1 + x2) / 2, (y1 + y2) / 2)
+        view = ExtraView(self, detached, self.zoom if zoom is None else zoom, center)
+        self.views.append(view)
+        self.update_visualization()
+        return view
+
+    def jump_to(self, x, y):
+        """Scroll the canvas so the layout point (x, y) is in the middle of the view."""
+        self._scroll_to(x * self.zoom - self.canvas.winfo_width() / 2,
+                        y * self.zoom - self.canvas.winfo_height() / 2)
+        self._viewport_changed()
+
+    def _draw_slice(self):
+        self._draw_after_id = None
+        if not self.renderer.step(RENDER_SLICE_MS / 1000):
+            self._draw_after_id = self.after(0, self._draw_slice)
+
+    def key_at(self, x, y):
+        """Return the key of the node shape at canvas window point (x, y), or None.
+
+        Looked up in the last scene rather than among the canvas items, so it
+        works the same whichever renderer drew it.
+        """
+        if self.scene is None:
+            return None
+        return self.scene.key_at(self.canvas.canvasx(x) / self.zoom,
+                                 self.canvas.canvasy(y) / self.zoom)
+
+    def node_at(self, x, y):
+        """Return the structure node drawn at canvas window point (x, y), or None."""
+        if self.scene is None:
+            return None
+        return self.scene.node_at(self.canvas.canvasx(x) / self.zoom,
+                                  self.canvas.canvasy(y) / self.zoom)
+
+    def select(self, node):
+        """Make node, or nothing for None, the target of the actions on the selected node."""
+        self.selected = node
+        self.highlight("selection", [node] if node is not None else [])
+
+    def require_selection(self):
+        """Return the selected node, or None after telling the user to click one."""
+        if self.selected is None:
+            messagebox.showinfo("No Node Selected", "Click a node on the canvas first")
+        return self.selected
+
+    def cached(self, name, compute):
+        """Return compute(), calling it again only after the structure changed."""
+        structure, version, value = self._cache.get(name, (None, None, None))
+        if structure is not self.structure or version != self.version:
+            value = compute()
+            self._cache[name] = (self.structure, self.version, value)
+        return value
+
+    def get_nodes(self):
+        """Return structure.get_nodes(), walking the structure only after it changed."""
+        return self.cached("nodes", self.structure.get_nodes)
+
+    def _choose_renderer(self, view=None):
+        """Return the raster renderer for structures above raster_threshold nodes.
+
+        It is the renderer of view, an ExtraView, or else of the frame's own
+        canvas. Falls back to the canvas renderer when Pillow cannot show images.
+        """
+        view = view or self
+        size = getattr(self.structure, "size", 0)
+        if size <= self.raster_threshold or not raster_backend.can_show():
+            return view.canvas_renderer
+        if view.raster_renderer is None:
+            view.raster_renderer = raster_backend.RasterRenderer(view.canvas, VIEWPORT_MARGIN)
+        return view.raster_renderer
+
+    def draw(self, scene):
+        """Bring the canvas up to date with a scene and let it scroll over all of it.
+
+        The canvas is updated in slices of at most RENDER_SLICE_MS, the
+        nodes in the middle of the view first. A new scene replaces the
+        rest of one still being drawn.
+        """
+        if self._draw_after_id is not None:
+            self.after_cancel(self._draw_after_id)
+            self._draw_after_id = None
+        renderer = self._choose_renderer()
+        if renderer is not self.renderer:
+            self.renderer.clear()
+            renderer.set_zoom(self.zoom)
+            for name in HIGHLIGHT_STYLES:
+                renderer.set_highlight(name, map(id, self.highlighted.get(name, ())))
+            self.renderer = renderer
+        x1, y1, x2, y2 = self.visible_area()
+        self.renderer.start(scene, ((x1 + x2) / 2, (y1 + y2) / 2))
+        self.scene = scene
+        self._draw_slice()
+        self.scroll_region = scene_scroll_region(scene)
+        self._apply_scroll_region()
+
+    def highlight(self, name, nodes):
+        """Show the given nodes in the HIGHLIGHT_STYLES[name] look, e.g. "search".
+
+        The items already drawn are restyled through their node tags, so
+        the structure is not laid out or drawn again. An empty list of
+        nodes removes the highlight.
+        """
+        nodes = list(nodes)
+        if nodes:
+            self.highlighted[name] = nodes  # Keeps the nodes, and so their ids, alive
+        else:
+            self.highlighted.pop(name, None)
+        self.renderer.set_highlight(name, map(id, nodes))
+        for view in self.views:
+            view.renderer.set_highlight(name, map(id, nodes))
+
+    def clear_highlights(self):
+        self._stop_traversal()
+        for name in list(self.highlighted):
+            self.highlight(name, [])
+
+    def animate_traversal(self, nodes, name="traversal", then=None):
+        """Highlight the nodes one after another in the order a traversal visits them.
+
+        then() runs once the last node is highlighted, unless the structure
+        changes first.
+        """
+        self._stop_traversal()
+        self._traversal = (TraversalAnimation(list(nodes)), name, then)
+        self._traversal_tick()
+
+    def _traversal_tick(self):
+        self._traversal_after_id = None
+        animation, name, then = self._traversal
+        # Only the nodes reached since the last tick are restyled
+        self.highlight(name, animation.visible())
+        if not animation.finished():
+            self._traversal_after_id = self.after(FRAME_INTERVAL_MS, self._traversal_tick)
+            return
+        self._traversal = None
+        if then:
+            then()
+
+    def _stop_traversal(self):
+        if self._traversal_after_id is not None:
+            self.after_cancel(self._traversal_after_id)
+            self._traversal_after_id = None
+        self._traversal = None
 
     def _create_info_widgets(self):
         """Create widgets to display structure information.
@@ -61,27 +455,342 @@ class StructureFrame(ttk.Frame):
     def convert_input_value(self, value_str):
         """Convert input string to the selected data type."""
         try:
-            if self.data_type.get() == "int":
-                return int(value_str)
-            elif self.data_type.get() == "float":
-                return float(value_str)
-            elif self.data_type.get() == "bool":
-                return value_str.lower() in ['true', 'yes', '1', 't', 'y']
-            else:  # Default to string
-                return value_str
+            return convert_value(value_str, self.data_type.get())
         except (ValueError, TypeError):
             messagebox.showerror("Type Error",
                                  f"Cannot convert '{value_str}' to {self.data_type.get()}")
             return None
 
+    def perform(self, operation, *args):
+        """Call a structure method, recording it when a trace is active.
+
+        Every operation the frame runs on its structure goes through here.
+        Only an operation that changed the structure, found by its size or
+        by it being a rotation of several nodes, drops the selection and the
+        highlights and counts as a new version: a failed one leaves them be.
+        """
+        if self.recorder:
+            self.recorder.record(operation, args, self.structure, self.version)
+        if operation in READ_ONLY_OPERATIONS:
+            return getattr(self.structure, operation)(*args)
+
+        size = self.structure.size
+        result = getattr(self.structure, operation)(*args)
+        if self.structure.size != size or (operation in RESHAPING_OPERATIONS and size > 1):
+            self.version += 1
+            if operation not in UNANIMATED_OPERATIONS:
+                self._animate_next = self.animate_changes
+            self.selected = None  # The node may be gone
+            if self.highlighted:
+                self.clear_highlights()
+        return result
+
+    def bulk_insert(self, values):
+        """Add many already converted values at once and redraw a single time."""
+        self.perform("extend", values)
+        self.update_info()
+        self.update_visualization()
+
     def update_visualization(self):
-        """Update the visualization of the structure. Override in subclasses."""
-        pass
+        """Redraw the structure with the next frame of the render scheduler.
+
+        Cheap to call after every change: any number of calls before the
+        next frame end in a single render().
+        """
+        self.scheduler.request(self)
+
+    def render(self):
+        """Lay the structure out for the canvas and bring the canvas up to date.
+
+        Every frame draws through here: layout_scene() turns the structure
+        into a Scene and draw() hands it to the renderer. After a change the
+        items move from where they are on screen to the new layout over the
+        next frames of the render scheduler, see animation.SceneAnimation.
+
+        Every extra view is rendered along with the canvas, see ExtraView.render().
+        """
+        if not self.canvas.winfo_ismapped():
+            return  # Drawn by _on_canvas_map() once it is shown
+        width, height = self.layout_size()
+        viewport = self.visible_area() if self.uses_viewport else None
+        scene = self.layout_scene(width, height, viewport)
+
+        if self._animate_next and self.scene is not None:
+            # Starts from the scene on screen, which may be the middle of another animation
+            self.animation = SceneAnimation(self.scene)
+        self._animate_next = False
+        if self.animation is not None:
+            scene, finished = self.animation.frame(scene)
+            if finished:
+                self.animation = None
+            else:
+                self.scheduler.request(self)
+        self.draw(scene)
+        for view in self.views:
+            view.render()
+        self._update_minimap(width, height)
+
+    def layout_size(self):
+        """Return the (width, height) the structure is laid out for, those of the canvas."""
+        # Asegúrate de que el canvas tiene un tamaño antes de calcular posiciones
+        width = self.canvas.winfo_width() or 800  # Valor por defecto si el ancho es 0
+        height = self.canvas.winfo_height() or 400  # Valor por defecto si la altura es 0
+        return width, height
+
+    def _update_minimap(self, width, height):
+        """Bring the minimap up to date, laying out its overview only after it went stale.
+
+        The overview depends on the structure, the zoom tier, which decides
+        how the nodes are arranged, and the canvas size; scrolling and
+        animation frames only move the outline of the view.
+        """
+        key = (self.structure, self.version, zoom_tier(self.zoom), width, height)
+        if key != self._minimap_key:
+            self._minimap_key = key
+            self.minimap.fit(self.scroll_region)
+            self.minimap.show(self.layout_scene(width, height, None,
+                                                self.minimap.overview_zoom()))
+        self.minimap.show_view(self.visible_area(0))
+
+    def layout_scene(self, width, height, viewport, overview=None, zoom=None):
+        """Return the Scene of the structure for a canvas size. Override in subclasses.
+
+        viewport is the visible area in layout coordinates, or None when
+        the whole structure is wanted. overview is passed on to the layout
+        for the minimap's summary of the whole structure. zoom is the scale
+        the scene is shown at, the canvas's by default; an ExtraView passes
+        its own and gets its own level of detail, with the nodes arranged
+        as on the canvas.
+        """
+        return Scene(width, height)
+
+
+class ExtraView:
+    """Another canvas on the structure of a frame, with its own zoom and scroll position.
+
+    It sits in a pane beside the frame's canvas or, detached, in a window
+    of its own. Each view gets a scene of its own from the frame's
+    layout_scene(): only the area it shows, at the level of detail of its
+    own zoom. The positions come from the same cached layout as the
+    canvas's (node list, tree layout, label widths), and lists wrap their
+    rows as on the canvas, so a node is in the same place in every view.
+    Like the frame, it switches to a raster renderer for large structures.
+    """
+
+    def __init__(self, frame, detached, zoom, center):
+        self.frame = frame
+        self.detached = detached
+        self.zoom = zoom
+        self.scroll_region = (0, 0, 0, 0)
+        self.scene = None  # Scene drawn last, for selecting by clicks
+        self._center = center  # Layout point to scroll to once the canvas has a size
+        self._press = None
+        self._draw_after_id = None
+
+        if detached:
+            self.container = tk.Toplevel(frame)
+            self.container.title(f"{frame.structure_type} View")
+            self.container.protocol("WM_DELETE_WINDOW", self.close)
+        else:
+            self.container = ttk.Frame(frame.view_panes)
+            frame.view_panes.add(self.container, weight=1)
+
+        toolbar = ttk.Frame(self.container)
+        toolbar.pack(fill=tk.X)
+        ttk.Button(toolbar, text="Close", command=self.close).pack(side=tk.RIGHT)
+        ttk.Button(toolbar, text="Attach" if detached else "Detach",
+                   command=self.toggle_detached).pack(side=tk.RIGHT)
+        ttk.Button(toolbar, text="+", width=3,
+                   command=lambda: self.set_zoom(self.zoom * ZOOM_STEP)).pack(side=tk.RIGHT)
+        self.zoom_var = tk.StringVar(value=f"{zoom:.0%}")
+        ttk.Label(toolbar, textvariable=self.zoom_var, width=6,
+                  anchor=tk.CENTER).pack(side=tk.RIGHT)
+        ttk.Button(toolbar, text="-", width=3,
+                   command=lambda: self.set_zoom(self.zoom / ZOOM_STEP)).pack(side=tk.RIGHT)
+
+        self.canvas = tk.Canvas(self.container, bg="white", bd=2, relief=tk.SUNKEN,
+                                width=400, height=300)
+        x_scrollbar = ttk.Scrollbar(self.container, orient=tk.HORIZONTAL, command=self._xview)
+        y_scrollbar = ttk.Scrollbar(self.container, orient=tk.VERTICAL, command=self._yview)
+        self.canvas.configure(xscrollcommand=x_scrollbar.set, yscrollcommand=y_scrollbar.set)
+        x_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
+        y_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas.pack(fill=tk.BOTH, expand=True)
+
+        self.canvas_renderer = CanvasRenderer(self.canvas)
+        self.raster_renderer = None
+        self.renderer = self.canvas_renderer
+        self.renderer.set_zoom(zoom)
+        for name in HIGHLIGHT_STYLES:
+            self.renderer.set_highlight(name, map(id, frame.highlighted.get(name, ())))
+
+        self.canvas.bind("<Configure>", lambda event: self._viewport_changed())
+        # Renders are skipped while the canvas is not shown
+        self.canvas.bind("<Map>", lambda event: self.frame.scheduler.request(self))
+        self.canvas.bind("<MouseWheel>", self._on_mouse_wheel)
+        self.canvas.bind("<Button-4>", self._on_mouse_wheel)
+        self.canvas.bind("<Button-5>", self._on_mouse_wheel)
+        self.canvas.bind("<ButtonPress-1>", self._start_pan)
+        self.canvas.bind("<B1-Motion>", self._pan)
+        self.canvas.bind("<ButtonRelease-1>", self._on_release)
+
+    def close(self):
+        if self._draw_after_id is not None:
+            self.canvas.after_cancel(self._draw_after_id)
+            self._draw_after_id = None
+        self.frame.scheduler.cancel(self)
+        if self in self.frame.views:
+            self.frame.views.remove(self)
+        # A pane leaves the paned window when it is destroyed
+        self.container.destroy()
+
+    def toggle_detached(self):
+        """Move the view from its pane to a window of its own, or back."""
+        x1, y1, x2, y2 = self.visible_area(0)
+        self.close()
+        self.frame.add_view(not self.detached, self.zoom, ((x1 + x2) / 2, (y1 + y2) / 2))
+
+    def _xview(self, *args):
+        self.canvas.xview(*args)
+        self._viewport_changed()
+
+    def _yview(self, *args):
+        self.canvas.yview(*args)
+        self._viewport_changed()
+
+    def _on_mouse_wheel(self, event):
+        zoom_in = event.num == 4 or event.delta > 0
+        factor = WHEEL_ZOOM_STEP if zoom_in else 1 / WHEEL_ZOOM_STEP
+        self.set_zoom(self.zoom * factor, event.x, event.y)
+
+    def _start_pan(self, event):
+        self._press = (event.x, event.y)
+        self.canvas.scan_mark(event.x, event.y)
+
+    def _pan(self, event):
+        if self._press is not None:
+            if max(abs(event.x - self._press[0]), abs(event.y - self._press[1])) <= CLICK_SLOP:
+                return
+            self._press = None  # A drag from now on
+        self.canvas.scan_dragto(event.x, event.y, gain=1)
+        self._viewport_changed()
+
+    def _on_release(self, event):
+        if self._press is not None:
+            self._press = None
+            node = None
+            if self.scene is not None:
+                node = self.scene.node_at(self.canvas.canvasx(event.x) / self.zoom,
+                                          self.canvas.canvasy(event.y) / self.zoom)
+            self.frame.select(node)
+
+    def _viewport_changed(self):
+        """Draw the nodes scrolled into view, once per burst of scroll events."""
+        if self.frame.uses_viewport or self.renderer.view_dependent:
+            self.frame.scheduler.request(self)
+
+    def winfo_exists(self):
+        return self.canvas.winfo_exists()
+
+    def set_zoom(self, zoom, x=None, y=None):
+        """Zoom about the canvas window point (x, y), its middle by default.
+
+        Only this view is scaled, and laid out again when the zoom crosses
+        into another level-of-detail tier.
+        """
+        zoom = min(MAX_ZOOM, max(MIN_ZOOM, zoom))
+        if zoom == self.zoom:
+            return
+        if x is None:
+            x, y = self.canvas.winfo_width() / 2, self.canvas.winfo_height() / 2
+        point_x = self.canvas.canvasx(x) / self.zoom
+        point_y = self.canvas.canvasy(y) / self.zoom
+        old_tier = zoom_tier(self.zoom)
+
+        self.zoom = zoom
+        self.zoom_var.set(f"{zoom:.0%}")
+        self.renderer.set_zoom(zoom)
+        self._apply_scroll_region()
+        self._scroll_to(point_x * zoom - x, point_y * zoom - y)
+
+        if zoom_tier(zoom) != old_tier:
+            self.frame.scheduler.request(self)
+        else:
+            self._viewport_changed()
+
+    def _apply_scroll_region(self):
+        x1, y1, x2, y2 = (value * self.zoom for value in self.scroll_region)
+        self.canvas.configure(scrollregion=(x1, y1, x2, y2))
+
+    def _scroll_to(self, left, top):
+        """Scroll so the canvas point (left, top) is at the window's top left corner."""
+        x1, y1, x2, y2 = (value * self.zoom for value in self.scroll_region)
+        if x2 > x1:
+            self.canvas.xview_moveto((left - x1) / (x2 - x1))
+        if y2 > y1:
+            self.canvas.yview_moveto((top - y1) / (y2 - y1))
+
+    def visible_area(self, margin=VIEWPORT_MARGIN):
+        """Return the (x1, y1, x2, y2) layout area in view, widened by margin canvas pixels."""
+        x1 = self.canvas.canvasx(0) - margin
+        y1 = self.canvas.canvasy(0) - margin
+        x2 = self.canvas.canvasx(self.canvas.winfo_width()) + margin
+        y2 = self.canvas.canvasy(self.canvas.winfo_height()) + margin
+        return x1 / self.zoom, y1 / self.zoom, x2 / self.zoom, y2 / self.zoom
+
+    def render(self):
+        """Lay the structure out for the area and zoom of this view and draw it.
+
+        Runs with every render() of the frame and, through the render
+        scheduler, after scrolling or zooming this view. While the frame
+        animates a change, the view shows the same frame of the animation.
+        """
+        if not self.canvas.winfo_ismapped():
+            return  # Drawn on <Map> once it is shown
+        frame = self.frame
+        width, height = frame.layout_size()
+        viewport = self.visible_area() if frame.uses_viewport else None
+        scene = frame.layout_scene(width, height, viewport, zoom=self.zoom)
+        if frame.animation is not None:
+            scene, _ = frame.animation.frame(scene)
+        self.draw(scene)
+
+    def draw(self, scene):
+        """Bring the canvas up to date with a scene, in slices like the frame's."""
+        if self._draw_after_id is not None:
+            self.canvas.after_cancel(self._draw_after_id)
+            self._draw_after_id = None
+        renderer = self.frame._choose_renderer(self)
+        if renderer is not self.renderer:
+            self.renderer.clear()
+            renderer.set_zoom(self.zoom)
+            for name in HIGHLIGHT_STYLES:
+                renderer.set_highlight(name, map(id, self.frame.highlighted.get(name, ())))
+            self.renderer = renderer
+        self.scene = scene
+        self.scroll_region = scene_scroll_region(scene)
+        self._apply_scroll_region()
+        if self._center is not None and self.canvas.winfo_ismapped():
+            x, y = self._center
+            self._center = None
+            self._scroll_to(x * self.zoom - self.canvas.winfo_width() / 2,
+                            y * self.zoom - self.canvas.winfo_height() / 2)
+            self._viewport_changed()
+        x1, y1, x2, y2 = self.visible_area()
+        self.renderer.start(scene, ((x1 + x2) / 2, (y1 + y2) / 2))
+        self._draw_slice()
+
+    def _draw_slice(self):
+        self._draw_after_id = None
+        if not self.renderer.step(RENDER_SLICE_MS / 1000):
+            self._draw_after_id = self.canvas.after(0, self._draw_slice)
 
 
 class StackFrame(StructureFrame):
     """Frame for Stack operations and visualization."""
 
+    uses_viewport = True
+
     def __init__(self, parent):
         super().__init__(parent, "Stack")
         from structures import Stack
@@ -121,7 +830,7 @@ class StackFrame(StructureFrame):
 
         converted_value = self.convert_input_value(value)
         if converted_value is not None:
-            self.structure.push(converted_value)
+            self.perform("push", converted_value)
             self.update_info()
             self.update_visualization()
             self.value_entry.delete(0, tk.END)
@@ -131,7 +840,7 @@ class StackFrame(StructureFrame):
             messagebox.showinfo("Stack Empty", "The stack is empty")
             return
 
-        value = self.structure.pop()
+        value = self.perform("pop")
         messagebox.showinfo("Pop Result", f"Popped value: {value}")
         self.update_info()
         self.update_visualization()
@@ -141,7 +850,7 @@ class StackFrame(StructureFrame):
             messagebox.showinfo("Stack Empty", "The stack is empty")
             return
 
-        value = self.structure.peek()
+        value = self.perform("peek")
         messagebox.showinfo("Peek Result", f"Top value: {value}")
 
     def search(self):
@@ -152,7 +861,8 @@ class StackFrame(StructureFrame):
 
         converted_value = self.convert_input_value(value)
         if converted_value is not None:
-            position = self.structure.search(converted_value)
+            position = self.perform("search", converted_value)
+            self.highlight("search", [self.get_nodes()[position]] if position >= 0 else [])
             if position >= 0:
                 messagebox.showinfo("Search Result", f"Value found at position: {position}")
             else:
@@ -163,48 +873,16 @@ class StackFrame(StructureFrame):
         top_value = self.structure.peek() if not self.structure.is_empty() else "None"
         self.top_var.set(f"Top: {top_value}")
 
-    def update_visualization(self):
-        # Clear the canvas
-        self.canvas.delete("all")
-
-        nodes = self.structure.get_nodes()
-        if not nodes:
-            return
-
-        # Draw the stack from bottom to top
-        box_width = 100
-        box_height = 40
-        x_center = self.canvas.winfo_width() // 2
-        y_bottom = self.canvas.winfo_height() - 30
-
-        for i, node in enumerate(reversed(nodes)):
-            # Calculate position
-            x = x_center - box_width // 2
-            y = y_bottom - i * (box_height + 10)
-
-            # Draw node box
-            self.canvas.create_rectangle(x, y, x + box_width, y - box_height,
-                                         fill="lightblue", outline="black")
-
-            # Draw value
-            self.canvas.create_text(x + box_width // 2, y - box_height // 2,
-                                    text=str(node.data))
-
-            # Draw memory address
-            self.canvas.create_text(x + box_width // 2, y - box_height - 5,
-                                    text=f"Mem: {hex(node.memory_address)}",
-                                    font=("Arial", 8))
-
-            # Draw pointer (except for the top node)
-            if i < len(nodes) - 1:
-                self.canvas.create_line(x_center, y - box_height - 5,
-                                        x_center, y - box_height - 10,
-                                        arrow=tk.LAST, fill="black")
+    def layout_scene(self, width, height, viewport, overview=None, zoom=None):
+        return layout_stack(self.structure, width, height, viewport, self.get_nodes(),
+                            zoom or self.zoom, overview)
 
 
 class QueueFrame(StructureFrame):
     """Frame for Queue operations and visualization."""
 
+    uses_viewport = True
+
     def __init__(self, parent):
         super().__init__(parent, "Queue")
         from structures import Queue
@@ -246,7 +924,7 @@ class QueueFrame(StructureFrame):
 
         converted_value = self.convert_input_value(value)
         if converted_value is not None:
-            self.structure.enqueue(converted_value)
+            self.perform("enqueue", converted_value)
             self.update_info()
             self.update_visualization()
             self.value_entry.delete(0, tk.END)
@@ -256,7 +934,7 @@ class QueueFrame(StructureFrame):
             messagebox.showinfo("Queue Empty", "The queue is empty")
             return
 
-        value = self.structure.dequeue()
+        value = self.perform("dequeue")
         messagebox.showinfo("Dequeue Result", f"Dequeued value: {value}")
         self.update_info()
         self.update_visualization()
@@ -266,7 +944,7 @@ class QueueFrame(StructureFrame):
             messagebox.showinfo("Queue Empty", "The queue is empty")
             return
 
-        value = self.structure.peek()
+        value = self.perform("peek")
         messagebox.showinfo("Peek Result", f"Front value: {value}")
 
     def search(self):
@@ -277,7 +955,8 @@ class QueueFrame(StructureFrame):
 
         converted_value = self.convert_input_value(value)
         if converted_value is not None:
-            position = self.structure.search(converted_value)
+            position = self.perform("search", converted_value)
+            self.highlight("search", [self.get_nodes()[position]] if position >= 0 else [])
             if position >= 0:
                 messagebox.showinfo("Search Result", f"Value found at position: {position}")
             else:
@@ -294,52 +973,9 @@ class QueueFrame(StructureFrame):
         else:
             self.rear_var.set("Rear: None")
 
-    def update_visualization(self):
-        # Clear the canvas
-        self.canvas.delete("all")
-
-        nodes = self.structure.get_nodes()
-        if not nodes:
-            return
-
-        # Draw the queue from left to right
-        box_width = 80
-        box_height = 40
-        x_left = 30
-        y_center = self.canvas.winfo_height() // 2
-
-        for i, node in enumerate(nodes):
-            # Calculate position
-            x = x_left + i * (box_width + 20)
-            y = y_center - box_height // 2
-
-            # Draw node box
-            self.canvas.create_rectangle(x, y, x + box_width, y + box_height,
-                                         fill="lightgreen", outline="black")
-
-            # Draw value
-            self.canvas.create_text(x + box_width // 2, y + box_height // 2,
-                                    text=str(node.data))
-
-            # Draw memory address
-            self.canvas.create_text(x + box_width // 2, y - 15,
-                                    text=f"Mem: {hex(node.memory_address)}",
-                                    font=("Arial", 8))
-
-            # Draw pointer (except for the last node)
-            if i < len(nodes) - 1:
-                self.canvas.create_line(x + box_width, y + box_height // 2,
-                                        x + box_width + 20, y + box_height // 2,
-                                        arrow=tk.LAST, fill="black")
-
-        # Label front and rear
-        if nodes:
-            self.canvas.create_text(x_left + box_width // 2, y_center + box_height // 2 + 25,
-                                    text="Front", font=("Arial", 10, "bold"))
-
-            last_x = x_left + (len(nodes) - 1) * (box_width + 20)
-            self.canvas.create_text(last_x + box_width // 2, y_center + box_height // 2 + 25,
-                                    text="Rear", font=("Arial", 10, "bold"))
+    def layout_scene(self, width, height, viewport, overview=None, zoom=None):
+        return layout_queue(self.structure, width, height, viewport, self.get_nodes(),
+                            zoom or self.zoom, overview, self.zoom)
 
 # More UI components for other data structures will follow the same pattern
 # They will be implemented in subsequent code artifacts
\ No newline at end of file
@@ -1,11 +1,14 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
 from ui_components import StructureFrame
+from layouts import layout_doubly_linked_list
 
 
 class DoublyLinkedListFrame(StructureFrame):
     """Frame for Doubly Linked List operations and visualization."""
 
+    uses_viewport = True
+
     def __init__(self, parent):
         super().__init__(parent, "Doubly Linked List")
         from structures import DoublyLinkedList
@@ -40,6 +43,8 @@ class DoublyLinkedListFrame(StructureFrame):
                    command=self.insert_at_end).pack(side=tk.LEFT, padx=5)
         ttk.Button(insert_frame, text="Insert at Position",
                    command=self.insert_at_position).pack(side=tk.LEFT, padx=5)
+        ttk.Button(insert_frame, text="Insert After Selected",
+                   command=self.insert_after_selected).pack(side=tk.LEFT, padx=5)
 
         # Action buttons for deletion
         delete_frame = ttk.LabelFrame(parent_frame, text="Delete Operations")
@@ -51,6 +56,8 @@ class DoublyLinkedListFrame(StructureFrame):
                    command=self.delete_from_end).pack(side=tk.LEFT, padx=5)
         ttk.Button(delete_frame, text="Delete at Position",
                    command=self.delete_at_position).pack(side=tk.LEFT, padx=5)
+        ttk.Button(delete_frame, text="Delete Selected",
+                   command=self.delete_selected).pack(side=tk.LEFT, padx=5)
 
         # Search button
         search_frame = ttk.Frame(parent_frame)
@@ -67,7 +74,7 @@ class DoublyLinkedListFrame(StructureFrame):
 
         converted_value = self.convert_input_value(value)
         if converted_value is not None:
-            self.structure.insert_at_beginning(converted_value)
+            self.perform("insert_at_beginning", converted_value)
             self.update_info()
             self.update_visualization()
             self.value_entry.delete(0, tk.END)
@@ -80,7 +87,7 @@ class DoublyLinkedListFrame(StructureFrame):
 
         converted_value = self.convert_input_value(value)
         if converted_value is not None:
-            self.structure.insert_at_end(converted_value)
+            self.perform("insert_at_end", converted_value)
             self.update_info()
             self.update_visualization()
             self.value_entry.delete(0, tk.END)
@@ -99,7 +106,7 @@ class DoublyLinkedListFrame(StructureFrame):
 
         converted_value = self.convert_input_value(value)
         if converted_value is not None:
-            if self.structure.insert_at_position(position, converted_value):
+            if self.perform("insert_at_position", position, converted_value):
                 self.update_info()
                 self.update_visualization()
                 self.value_entry.delete(0, tk.END)
@@ -111,7 +118,7 @@ class DoublyLinkedListFrame(StructureFrame):
             messagebox.showinfo("List Empty", "The list is empty")
             return
 
-        value = self.structure.delete_from_beginning()
+        value = self.perform("delete_from_beginning")
         messagebox.showinfo("Delete Result", f"Deleted value: {value}")
         self.update_info()
         self.update_visualization()
@@ -121,7 +128,7 @@ class DoublyLinkedListFrame(StructureFrame):
             messagebox.showinfo("List Empty", "The list is empty")
             return
 
-        value = self.structure.delete_from_end()
+        value = self.perform("delete_from_end")
         messagebox.showinfo("Delete Result", f"Deleted value: {value}")
         self.update_info()
         self.update_visualization()
@@ -137,7 +144,7 @@ class DoublyLinkedListFrame(StructureFrame):
         if position is None:  # User cancelled
             return
 
-        value = self.structure.delete_at_position(position)
+        value = self.perform("delete_at_position", position)
         if value is not None:
             messagebox.showinfo("Delete Result", f"Deleted value: {value}")
             self.update_info()
@@ -145,6 +152,34 @@ class DoublyLinkedListFrame(StructureFrame):
         else:
             messagebox.showerror("Delete Error", "Failed to delete at position")
 
+    def insert_after_selected(self):
+        node = self.require_selection()
+        if node is None:
+            return
+
+        value = self.value_entry.get()
+        if not value:
+            messagebox.showerror("Input Error", "Please enter a value")
+            return
+
+        converted_value = self.convert_input_value(value)
+        if converted_value is not None:
+            self.perform("insert_after", node, converted_value)
+            self.update_info()
+            self.update_visualization()
+            self.value_entry.delete(0, tk.END)
+            messagebox.showinfo("Insert", f"Value {converted_value} inserted after {node.data}")
+
+    def delete_selected(self):
+        node = self.require_selection()
+        if node is None:
+            return
+
+        value = self.perform("delete_node", node)
+        messagebox.showinfo("Delete Result", f"Deleted value: {value}")
+        self.update_info()
+        self.update_visualization()
+
     def search(self):
         value = self.value_entry.get()
         if not value:
@@ -153,7 +188,8 @@ class DoublyLinkedListFrame(StructureFrame):
 
         converted_value = self.convert_input_value(value)
         if converted_value is not None:
-            position = self.structure.search(converted_value)
+            position = self.perform("search", converted_value)
+            self.highlight("search", [self.get_nodes()[position]] if position >= 0 else [])
             if position >= 0:
                 messagebox.showinfo("Search Result", f"Value found at position: {position}")
             else:
@@ -166,70 +202,6 @@ class DoublyLinkedListFrame(StructureFrame):
         tail_value = self.structure.tail.data if self.structure.tail else "None"
         self.tail_var.set(f"Tail: {tail_value}")
 
-    def update_visualization(self):
-        # Clear the canvas
-        self.canvas.delete("all")
-
-        nodes = self.structure.get_nodes()
-        if not nodes:
-            return
-
-        # Draw the doubly linked list from left to right
-        box_width = 80
-        box_height = 40
-        x_left = 30
-        y_center = self.canvas.winfo_height() // 2
-
-        for i, node in enumerate(nodes):
-            # Calculate position
-            x = x_left + i * (box_width + 80)
-            y = y_center - box_height // 2
-
-            # Draw node box
-            self.canvas.create_rectangle(x, y, x + box_width, y + box_height,
-                                         fill="lightblue", outline="black")
-
-            # Draw value
-            self.canvas.create_text(x + box_width // 2, y + box_height // 2,
-                                    text=str(node.data))
-
-            # Draw memory address
-            self.canvas.create_text(x + box_width // 2, y - 15,
-                                    text=f"Mem: {hex(node.memory_address)}",
-                                    font=("Arial", 8))
-
-            # Draw next pointer (except for the last node)
-            if i < len(nodes) - 1:
-                self.canvas.create_line(x + box_width, y + box_height // 3,
-                                        x + box_width + 80, y + box_height // 3,
-                                        arrow=tk.LAST, fill="black")
-
-                # Add next pointer text
-                next_text_x = x + box_width + 40
-                self.canvas.create_text(next_text_x, y + box_height // 3 - 10,
-                                        text="next", font=("Arial", 8))
-
-            # Draw prev pointer (except for the first node)
-            if i > 0:
-                self.canvas.create_line(x, y + 2 * box_height // 3,
-                                        x - 80, y + 2 * box_height // 3,
-                                        arrow=tk.LAST, fill="blue")
-
-                # Add prev pointer text
-                prev_text_x = x - 40
-                self.canvas.create_text(prev_text_x, y + 2 * box_height // 3 - 10,
-                                        text="prev", font=("Arial", 8))
-
-        # Mark the "head" pointer
-        if nodes:
-            self.canvas.create_text(x_left - 15, y_center - 10, text="head",
-                                    anchor=tk.E, font=("Arial", 10, "bold"))
-            self.canvas.create_line(x_left - 10, y_center - 10,
-                                    x_left, y_center - 10, arrow=tk.LAST)
-
-            # Mark the "tail" pointer
-            last_x = x_left + (len(nodes) - 1) * (box_width + 80)
-            self.canvas.create_text(last_x + box_width + 15, y_center - 10,
-                                    text="tail", anchor=tk.W, font=("Arial", 10, "bold"))
-            self.canvas.create_line(last_x + box_width + 10, y_center - 10,
-                                    last_x + box_width, y_center - 10, arrow=tk.LAST)
\ No newline at end of file
+    def layout_scene(self, width, height, viewport, overview=None, zoom=None):
+        return layout_doubly_linked_list(self.structure, width, height, viewport,
+                                         self.get_nodes(), zoom or self.zoom, overview, self.zoom)
\ No newline at end of file
@@ -1,25 +1,25 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
 from ui_components import StructureFrame
-import math
+from layouts import layout_binary_tree, layout_binary_search_tree
+from tree_layout import layout_for
 
 
 class BinaryTreeFrame(StructureFrame):
     """Frame for Binary Tree operations and visualization."""
 
+    uses_viewport = True
+
     def __init__(self, parent):
         super().__init__(parent, "Binary Tree")
         from structures import BinaryTree
         self.structure = BinaryTree()
+        self.tree_layout = None  # Updated in place after each change to the tree
         self.update_info()
 
         # Configurar el canvas con un fondo blanco
         self.canvas.configure(bg="white")
 
-        # Forzar un redibujado inicial después de configuración
-        self.canvas.update_idletasks()
-        self.after(100, self.update_visualization)
-
     def _create_info_widgets(self):
         self.size_var = tk.StringVar(value="Size: 0")
         self.height_var = tk.StringVar(value="Height: 0")
@@ -66,22 +66,24 @@ class BinaryTreeFrame(StructureFrame):
 
         converted_value = self.convert_input_value(value)
         if converted_value is not None:
-            self.structure.insert(None, converted_value)  # None parent means insert at root
+            self.perform("insert", None, converted_value)  # None parent means insert at root
             self.update_info()
 
-            # Esperar a que la interfaz se actualice
-            self.canvas.update_idletasks()
             self.update_visualization()
 
             self.value_entry.delete(0, tk.END)
             messagebox.showinfo("Insert", f"Value {converted_value} inserted as root")
 
     def insert_child(self, is_left):
-        """Insert a value as a left or right child of a parent node."""
+        """Insert a value as a left or right child of the selected node, or of a parent asked for."""
         if not self.structure.root:
             messagebox.showinfo("Insert Failed", "Tree is empty. Insert a root first.")
             return
 
+        if self.selected is not None:
+            self.insert_child_of_selected(is_left)
+            return
+
         # Get parent value
         parent_value = simpledialog.askstring("Parent Node", "Enter the value of the parent node:")
         if parent_value is None:  # User cancelled
@@ -106,12 +108,10 @@ class BinaryTreeFrame(StructureFrame):
 
         converted_value = self.convert_input_value(value)
         if converted_value is not None:
-            success = self.structure.insert(parent_value, converted_value, is_left)
+            success = self.perform("insert", parent_value, converted_value, is_left)
             if success:
                 self.update_info()
 
-                # Esperar a que la interfaz se actualice
-                self.canvas.update_idletasks()
                 self.update_visualization()
 
                 self.value_entry.delete(0, tk.END)
@@ -122,12 +122,42 @@ class BinaryTreeFrame(StructureFrame):
                 messagebox.showerror("Insert Error",
                                      f"Failed to insert as {side} child. Parent not found or child already exists.")
 
+    def insert_child_of_selected(self, is_left):
+        """Insert the entered value as a child of the node clicked on the canvas."""
+        parent = self.selected
+        value = self.value_entry.get()
+        if not value:
+            messagebox.showerror("Input Error", "Please enter a value for the new node")
+            return
+
+        converted_value = self.convert_input_value(value)
+        if converted_value is not None:
+            side = "left" if is_left else "right"
+            if self.perform("insert_child", parent, converted_value, is_left):
+                self.update_info()
+                self.update_visualization()
+                self.value_entry.delete(0, tk.END)
+                messagebox.showinfo("Insert", f"Value {converted_value} inserted as {side} child of {parent.data}")
+            else:
+                messagebox.showerror("Insert Error", f"Node {parent.data} already has a {side} child.")
+
     def delete_node(self):
-        """Delete a node by value."""
+        """Delete the selected node, or else a node by value."""
         if not self.structure.root:
             messagebox.showinfo("Delete Failed", "Tree is empty.")
             return
 
+        if self.selected is not None:
+            node = self.selected
+            if self.perform("delete_node", node):
+                messagebox.showinfo("Delete Result", f"Node with value {node.data} deleted")
+                self.update_info()
+                self.update_visualization()
+            else:
+                messagebox.showerror("Delete Error",
+                                     f"Failed to delete node with value {node.data}. Node has two children.")
+            return
+
         value = self.value_entry.get()
         if not value:
             messagebox.showerror("Input Error", "Please enter the value to delete")
@@ -135,7 +165,7 @@ class BinaryTreeFrame(StructureFrame):
 
         converted_value = self.convert_input_value(value)
         if converted_value is not None:
-            success = self.structure.delete(converted_value)
+            success = self.perform("delete", converted_value)
             if success:
                 messagebox.showinfo("Delete Result", f"Node with value {converted_value} deleted")
                 self.update_info()
@@ -158,8 +188,9 @@ class BinaryTreeFrame(StructureFrame):
 
         converted_value = self.convert_input_value(value)
         if converted_value is not None:
-            found = self.structure.search(converted_value)
-            if found:
+            node = self.perform("find", converted_value)
+            self.highlight("search", [node] if node else [])
+            if node:
                 messagebox.showinfo("Search Result", f"Value {converted_value} found in the tree")
             else:
                 messagebox.showinfo("Search Result", f"Value {converted_value} not found in the tree")
@@ -170,213 +201,28 @@ class BinaryTreeFrame(StructureFrame):
         root_value = self.structure.root.data if self.structure.root else "None"
         self.root_var.set(f"Root: {root_value}")
 
-    def update_visualization(self):
-        # Limpia el canvas
-        self.canvas.delete("all")
-
-        # Obtén los nodos por nivel
-        nodes_by_level = self.structure.get_nodes_by_level()
-        if not nodes_by_level:
-            return
-
-        # Asegúrate de que el canvas tiene un tamaño antes de calcular posiciones
-        canvas_width = self.canvas.winfo_width() or 800  # Valor por defecto si el ancho es 0
-        canvas_height = self.canvas.winfo_height() or 400  # Valor por defecto si la altura es 0
+    def layout_scene(self, width, height, viewport, overview=None, zoom=None):
+        self.tree_layout = layout_for(self.structure, self.tree_layout)
+        return layout_binary_tree(self.structure, width, height, viewport, zoom or self.zoom,
+                                  self.tree_layout, overview)
 
-        # Parámetros de visualización
-        max_levels = max(nodes_by_level.keys()) + 1
-        vertical_spacing = canvas_height / (max_levels + 1)
-
-        # Parámetros de nodo
-        node_radius = 25
-
-        # Diccionario para almacenar posiciones de nodos
-        node_positions = {}
-
-        # Imprime información de depuración
-        print(f"Canvas size: {canvas_width}x{canvas_height}")
-        print(f"Number of levels: {max_levels}")
-
-        # Primero calculamos todas las posiciones de los nodos
-        for level in range(max_levels):
-            if level not in nodes_by_level:
-                continue
-
-            nodes = nodes_by_level[level]
-            num_nodes = len(nodes)
-
-            # Calculamos el espacio horizontal total disponible
-            if level == 0:
-                # La raíz está centrada
-                horizontal_spacing = canvas_width
-                start_x = horizontal_spacing / 2
-            else:
-                # Los nodos se distribuyen según sus padres
-                horizontal_spacing = canvas_width / (2 ** level)
-                start_x = horizontal_spacing / 2
-
-            # Calculamos la posición Y para este nivel
-            y = (level + 1) * vertical_spacing
-
-            # Posicionamos cada nodo en este nivel
-            for i, node in enumerate(nodes):
-                if level == 0:
-                    # Para la raíz, siempre centramos
-                    x = canvas_width / 2
-                else:
-                    # Para otros niveles, calculamos basado en el índice virtual
-                    # dentro de un árbol completo de nivel 'level'
-                    virtual_index = self._find_virtual_index(node, nodes_by_level, level)
-                    x = start_x + virtual_index * horizontal_spacing
-
-                # Guardamos la posición del nodo
-                node_positions[id(node)] = (x, y)
-
-                # Imprime información del nodo
-                print(f"Node at level {level}, position {i}: data={node.data}, pos=({x}, {y})")
-
-        # Ahora dibujamos las conexiones primero (para que estén detrás de los nodos)
-        for level in range(1, max_levels):  # Comenzamos desde el nivel 1 (los hijos de la raíz)
-            if level not in nodes_by_level:
-                continue
-
-            nodes = nodes_by_level[level]
-
-            for node in nodes:
-                # Encontramos el padre
-                parent = self._find_parent(node, nodes_by_level, level)
-                if parent:
-                    child_x, child_y = node_positions[id(node)]
-                    parent_x, parent_y = node_positions[id(parent)]
-
-                    # Dibujamos la conexión diagonal
-                    self.canvas.create_line(
-                        parent_x, parent_y + node_radius,  # Desde la parte inferior del padre
-                        child_x, child_y - node_radius,  # Hasta la parte superior del hijo
-                        width=2, fill="black", arrow=tk.LAST
-                    )
-
-                    # Añadimos etiqueta "L" o "R"
-                    is_left = self._is_left_child(node, parent)
-                    child_label = "L" if is_left else "R"
-
-                    # Calculamos el punto medio de la línea para colocar la etiqueta
-                    mid_x = (parent_x + child_x) / 2
-                    mid_y = (parent_y + child_y) / 2
-
-                    # Añadimos un pequeño desplazamiento para la etiqueta
-                    offset_x = 10 if is_left else -10
-                    self.canvas.create_text(
-                        mid_x + offset_x, mid_y,
-                        text=child_label,
-                        fill="darkgreen",
-                        font=("Arial", 10, "bold")
-                    )
-
-        # Finalmente dibujamos los nodos
-        for level in range(max_levels):
-            if level not in nodes_by_level:
-                continue
-
-            nodes = nodes_by_level[level]
-
-            for node in nodes:
-                x, y = node_positions[id(node)]
-
-                # Dibujamos el círculo del nodo
-                self.canvas.create_oval(
-                    x - node_radius, y - node_radius,
-                    x + node_radius, y + node_radius,
-                    fill="lightgreen", outline="black", width=2
-                )
-
-                # Dibujamos el valor del nodo
-                try:
-                    node_text = str(node.data)
-                    self.canvas.create_text(
-                        x, y,
-                        text=node_text,
-                        fill="black",
-                        font=("Arial", 12, "bold")
-                    )
-                except Exception as e:
-                    print(f"Error creating text: {e}")
-                    self.canvas.create_text(
-                        x, y,
-                        text="[ERROR]",
-                        fill="red",
-                        font=("Arial", 10)
-                    )
-
-        # Forzar actualización del canvas
-        self.canvas.update_idletasks()
-
-    def _find_virtual_index(self, node, nodes_by_level, level):
-        """
-        Encuentra el índice virtual de un nodo en un nivel como si el árbol fuera completo.
-        Esto ayuda a posicionar correctamente los nodos en el canvas.
-        """
-        if level == 0:
-            return 0
-
-        # Encuentra el padre
-        parent = self._find_parent(node, nodes_by_level, level)
-        if not parent:
-            return 0
-
-        # Obtiene el índice virtual del padre
-        parent_level = level - 1
-        parent_virtual_index = self._find_virtual_index(parent, nodes_by_level, parent_level)
-
-        # Determina si este nodo es hijo izquierdo o derecho
-        is_left = self._is_left_child(node, parent)
-
-        # Calcula el índice virtual basado en el padre
-        if is_left:
-            return parent_virtual_index * 2
-        else:
-            return parent_virtual_index * 2 + 1
-
-    def _find_parent(self, node, nodes_by_level, level):
-        """Encuentra el nodo padre para un nodo dado."""
-        if level == 0:
-            return None
-
-        parent_level = level - 1
-        if parent_level not in nodes_by_level:
-            return None
-
-        # Busca entre los nodos del nivel del padre
-        for potential_parent in nodes_by_level[parent_level]:
-            if potential_parent.left is node or potential_parent.right is node:
-                return potential_parent
-
-        return None
-
-    def _is_left_child(self, node, parent):
-        """Determina si un nodo es hijo izquierdo o derecho de su padre."""
-        if not parent:
-            return False
-
-        return parent.left is node
 
 
 class BinarySearchTreeFrame(StructureFrame):
     """Frame for Binary Search Tree operations and visualization."""
 
+    uses_viewport = True
+
     def __init__(self, parent):
         super().__init__(parent, "Binary Search Tree")
         from structures import BinarySearchTree
         self.structure = BinarySearchTree()
+        self.tree_layout = None  # Updated in place after each change to the tree
         self.update_info()
 
         # Configurar el canvas con un fondo blanco
         self.canvas.configure(bg="white")
 
-        # Forzar un redibujado inicial después de configuración
-        self.canvas.update_idletasks()
-        self.after(100, self.update_visualization)
-
     def _create_info_widgets(self):
         self.size_var = tk.StringVar(value="Size: 0")
         self.height_var = tk.StringVar(value="Height: 0")
@@ -412,22 +258,31 @@ class BinarySearchTreeFrame(StructureFrame):
 
         converted_value = self.convert_input_value(value)
         if converted_value is not None:
-            self.structure.insert(converted_value)
+            self.perform("insert", converted_value)
             self.update_info()
 
-            # Esperar a que la interfaz se actualice
-            self.canvas.update_idletasks()
             self.update_visualization()
 
             self.value_entry.delete(0, tk.END)
             messagebox.showinfo("Insert", f"Value {converted_value} inserted in the BST")
 
     def delete_value(self):
-        """Delete a value from the BST."""
+        """Delete the selected node, or else a value, from the BST."""
         if not self.structure.root:
             messagebox.showinfo("Delete Failed", "Tree is empty.")
             return
 
+        if self.selected is not None:
+            value = self.selected.data
+            if self.perform("delete_node", self.selected):
+                messagebox.showinfo("Delete Result", f"Node with value {value} deleted")
+                self.update_info()
+                self.update_visualization()
+            else:
+                messagebox.showerror("Delete Error",
+                                     f"Failed to delete node with value {value}. Node not found.")
+            return
+
         value = self.value_entry.get()
         if not value:
             messagebox.showerror("Input Error", "Please enter the value to delete")
@@ -435,7 +290,7 @@ class BinarySearchTreeFrame(StructureFrame):
 
         converted_value = self.convert_input_value(value)
         if converted_value is not None:
-            success = self.structure.delete(converted_value)
+            success = self.perform("delete", converted_value)
             if success:
                 messagebox.showinfo("Delete Result", f"Node with value {converted_value} deleted")
                 self.update_info()
@@ -458,7 +313,12 @@ class BinarySearchTreeFrame(StructureFrame):
 
         converted_value = self.convert_input_value(value)
         if converted_value is not None:
-            found = self.structure.search(converted_value)
+            path = self.perform("search_path", converted_value)
+            found = path[-1].data == converted_value
+            # Walk the nodes compared on the way down, then mark the one holding the value
+            self.highlight("search", [])
+            self.animate_traversal(path[:-1] if found else path,
+                                   then=lambda: self.highlight("search", path[-1:] if found else []))
             if found:
                 messagebox.showinfo("Search Result", f"Value {converted_value} found in the tree")
             else:
@@ -470,170 +330,7 @@ class BinarySearchTreeFrame(StructureFrame):
         root_value = self.structure.root.data if self.structure.root else "None"
         self.root_var.set(f"Root: {root_value}")
 
-    def update_visualization(self):
-        # Limpia el canvas
-        self.canvas.delete("all")
-
-        # Obtén los nodos por nivel
-        nodes_by_level = self.structure.get_nodes_by_level()
-        if not nodes_by_level:
-            return
-
-        # Asegúrate de que el canvas tiene un tamaño antes de calcular posiciones
-        canvas_width = self.canvas.winfo_width() or 800  # Valor por defecto si el ancho es 0
-        canvas_height = self.canvas.winfo_height() or 400  # Valor por defecto si la altura es 0
-
-        # Parámetros de visualización
-        max_levels = max(nodes_by_level.keys()) + 1
-        vertical_spacing = canvas_height / (max_levels + 1)
-
-        # Parámetros de nodo
-        node_radius = 25
-
-        # Diccionario para almacenar posiciones de nodos
-        node_positions = {}
-
-        # Imprime información de depuración
-        print(f"Canvas size: {canvas_width}x{canvas_height}")
-        print(f"Number of levels: {max_levels}")
-
-        # Primero calculamos todas las posiciones de los nodos
-        for level in range(max_levels):
-            if level not in nodes_by_level:
-                continue
-
-            nodes = nodes_by_level[level]
-            num_nodes = len(nodes)
-
-            # Para el BST, usamos el mismo algoritmo que para el BinaryTree
-            if level == 0:
-                # La raíz está centrada
-                horizontal_spacing = canvas_width
-                start_x = horizontal_spacing / 2
-            else:
-                # Los nodos se distribuyen según sus padres
-                horizontal_spacing = canvas_width / (2 ** level)
-                start_x = horizontal_spacing / 2
-
-            # Calculamos la posición Y para este nivel
-            y = (level + 1) * vertical_spacing
-
-            # Posicionamos cada nodo en este nivel
-            for i, node in enumerate(nodes):
-                if level == 0:
-                    # Para la raíz, siempre centramos
-                    x = canvas_width / 2
-                else:
-                    # Para BST, calculamos basado en la regla de BST
-                    parent = self._find_parent_in_bst(node, nodes_by_level, level)
-                    if parent and parent in node_positions:
-                        parent_x, _ = node_positions[parent]
-                        # Hijo izquierdo o derecho basado en el valor
-                        is_left = node.data < parent.data
-                        offset = horizontal_spacing / 2
-                        x = parent_x - offset if is_left else parent_x + offset
-                    else:
-                        # Fallback por si no podemos encontrar el padre
-                        x = start_x + i * (canvas_width / (num_nodes + 1))
-
-                # Guardamos la posición del nodo
-                node_positions[node] = (x, y)
-
-                # Imprime información del nodo
-                print(f"Node at level {level}, position {i}: data={node.data}, pos=({x}, {y})")
-
-        # Ahora dibujamos las conexiones primero (para que estén detrás de los nodos)
-        for level in range(1, max_levels):  # Comenzamos desde el nivel 1 (los hijos de la raíz)
-            if level not in nodes_by_level:
-                continue
-
-            nodes = nodes_by_level[level]
-
-            for node in nodes:
-                # Encontramos el padre
-                parent = self._find_parent_in_bst(node, nodes_by_level, level)
-                if parent and parent in node_positions:
-                    child_x, child_y = node_positions[node]
-                    parent_x, parent_y = node_positions[parent]
-
-                    # Dibujamos la conexión diagonal
-                    self.canvas.create_line(
-                        parent_x, parent_y + node_radius,  # Desde la parte inferior del padre
-                        child_x, child_y - node_radius,  # Hasta la parte superior del hijo
-                        width=2, fill="black", arrow=tk.LAST
-                    )
-
-                    # Añadimos etiqueta "L" o "R" basado en el valor (regla del BST)
-                    is_left = node.data < parent.data
-                    child_label = "L" if is_left else "R"
-
-                    # Calculamos el punto medio de la línea para colocar la etiqueta
-                    mid_x = (parent_x + child_x) / 2
-                    mid_y = (parent_y + child_y) / 2
-
-                    # Añadimos un pequeño desplazamiento para la etiqueta
-                    offset_x = 10 if is_left else -10
-                    self.canvas.create_text(
-                        mid_x + offset_x, mid_y,
-                        text=child_label,
-                        fill="darkgreen",
-                        font=("Arial", 10, "bold")
-                    )
-
-        # Finalmente dibujamos los nodos
-        for level in range(max_levels):
-            if level not in nodes_by_level:
-                continue
-
-            nodes = nodes_by_level[level]
-
-            for node in nodes:
-                if node not in node_positions:
-                    continue
-
-                x, y = node_positions[node]
-
-                # Dibujamos el círculo del nodo
-                self.canvas.create_oval(
-                    x - node_radius, y - node_radius,
-                    x + node_radius, y + node_radius,
-                    fill="lightyellow", outline="black", width=2
-                )
-
-                # Dibujamos el valor del nodo
-                try:
-                    node_text = str(node.data)
-                    self.canvas.create_text(
-                        x, y,
-                        text=node_text,
-                        fill="black",
-                        font=("Arial", 12, "bold")
-                    )
-                except Exception as e:
-                    print(f"Error creating text: {e}")
-                    self.canvas.create_text(
-                        x, y,
-                        text="[ERROR]",
-                        fill="red",
-                        font=("Arial", 10)
-                    )
-
-        # Forzar actualización del canvas
-        self.canvas.update_idletasks()
-
-    def _find_parent_in_bst(self, node, nodes_by_level, level):
-        """Encuentra el nodo padre en un BST para un nodo dado."""
-        if level == 0:
-            return None
-
-        parent_level = level - 1
-        if parent_level not in nodes_by_level:
-            return None
-
-        # Para un BST, el padre es el nodo del nivel superior que tiene
-        # a este nodo como hijo izquierdo o derecho
-        for potential_parent in nodes_by_level[parent_level]:
-            if potential_parent.left is node or potential_parent.right is node:
-                return potential_parent
-
-        return None
\ No newline at end of file
+    def layout_scene(self, width, height, viewport, overview=None, zoom=None):
+        self.tree_layout = layout_for(self.structure, self.tree_layout)
+        return layout_binary_search_tree(self.structure, width, height, viewport,
+                                         zoom or self.zoom, self.tree_layout, overview)